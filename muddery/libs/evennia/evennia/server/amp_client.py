@@ -5,10 +5,15 @@ Portal. This module sets up the Client-side communication.
 """
 
 import os
+from django.conf import settings
 from evennia.server.portal import amp
-from twisted.internet import protocol
+from twisted.internet import protocol, reactor
 from evennia.utils import logger
 
+# send all messages of a reactor iteration in one AMP command
+_COALESCE = getattr(settings, "AMP_COALESCE_MESSAGES", False)
+_COALESCE_MAX = getattr(settings, "AMP_COALESCE_MAX_MESSAGES", 500)
+
 
 class AMPClientFactory(protocol.ReconnectingClientFactory):
     """
@@ -99,6 +104,12 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
 
     # sending AMP data
 
+    def __init__(self, *args, **kwargs):
+        super(AMPServerClientProtocol, self).__init__(*args, **kwargs)
+        # messages waiting to be sent at the end of this reactor iteration
+        self.msg_buffer = []
+        self.flush_task = None
+
     def connectionMade(self):
         """
         Called when a new connection is established.
@@ -133,6 +144,9 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
 
         """
         # print("server data_to_portal: {}, {}, {}".format(command, sessid, kwargs))
+        if self.msg_buffer:
+            # keep the order of messages and admin instructions
+            self.flush_messages()
         return self.callRemote(command, packed_data=amp.dumps((sessid, kwargs))).addErrback(
             self.errback, command.key
         )
@@ -147,8 +161,41 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
             kwargs (any, optiona): Extra data.
 
         """
+        if _COALESCE:
+            self.msg_buffer.append((session.sessid, kwargs))
+            if len(self.msg_buffer) >= _COALESCE_MAX:
+                return self.flush_messages()
+            if not self.flush_task:
+                self.flush_task = reactor.callLater(0, self.flush_messages)
+            return
         return self.data_to_portal(amp.MsgServer2Portal, session.sessid, **kwargs)
 
+    def flush_messages(self):
+        """
+        Send all buffered messages to the Portal in one AMP command.
+
+        Returns:
+            deferred (deferred or None): A deferred with an errback.
+
+        """
+        if self.flush_task:
+            if self.flush_task.active():
+                self.flush_task.cancel()
+            self.flush_task = None
+
+        messages, self.msg_buffer = self.msg_buffer, []
+        if not messages:
+            return None
+        if len(messages) == 1:
+            sessid, kwargs = messages[0]
+            return self.data_to_portal(amp.MsgServer2Portal, sessid, **kwargs)
+
+        amp.AMP_STATS.batches += 1
+        amp.AMP_STATS.messages += len(messages)
+        return self.callRemote(
+            amp.MsgBatchServer2Portal, packed_data=amp.dumps(messages)
+        ).addErrback(self.errback, amp.MsgBatchServer2Portal.key)
+
     def send_AdminServer2Portal(self, session, operation="", **kwargs):
         """
         Administrative access method called by the Server to send an
@@ -17,6 +17,11 @@ import pickle
 from twisted.internet.defer import DeferredList, Deferred
 from evennia.utils.utils import to_str, variable_from_module
 
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
 # delayed import
 _LOGGER = None
 
@@ -45,11 +50,21 @@ NUL = b"\x00"
 NULNUL = b"\x00\x00"
 
 AMP_MAXLEN = amp.MAX_VALUE_LENGTH  # max allowed data length in AMP protocol (cannot be changed)
+AMP_CHUNKLEN = AMP_MAXLEN - 1  # max length of Compressed chunks, leaving room for the codec mark
 
 # buffers
 _SENDBATCH = defaultdict(list)
 _MSGBUFFER = defaultdict(list)
 
+# codec marks, the first byte of Compressed data on the wire
+CODEC_NONE = b"\x00"
+CODEC_ZLIB = b"\x01"
+CODEC_LZ4 = b"\x02"
+ZLIB_HEADER = 0x78  # data compressed by older versions without codec marks
+
+# (codec, level, threshold), loaded from settings when first used
+_COMPRESSION = None
+
 # resources
 
 DUMMYSESSION = namedtuple("DummySession", ["sessid"])(0)
@@ -92,6 +107,72 @@ def _get_logger():
     return _LOGGER
 
 
+def _get_compression():
+    """
+    Get the compression settings of AMP data.
+
+    Returns:
+        compression (tuple): (codec, level, threshold) from settings
+            AMP_COMPRESSION_CODEC, AMP_COMPRESSION_LEVEL and
+            AMP_COMPRESSION_THRESHOLD.
+
+    """
+    global _COMPRESSION
+    if _COMPRESSION is None:
+        from django.conf import settings
+
+        codec = getattr(settings, "AMP_COMPRESSION_CODEC", "zlib")
+        if codec == "lz4" and not lz4_frame:
+            _get_logger().log_warn("AMP: lz4 is not installed, use zlib instead.")
+            codec = "zlib"
+        _COMPRESSION = (
+            codec,
+            getattr(settings, "AMP_COMPRESSION_LEVEL", 9),
+            getattr(settings, "AMP_COMPRESSION_THRESHOLD", 0),
+        )
+    return _COMPRESSION
+
+
+class AMPStats(object):
+    """
+    Counters of the data sent by this process across AMP.
+
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        "Reset all counters."
+        self.frames = 0  # Compressed values sent
+        self.compressed_frames = 0  # frames sent compressed
+        self.raw_bytes = 0  # size of frames before compression
+        self.wire_bytes = 0  # size of frames on the wire
+        self.batches = 0  # frames carrying coalesced messages
+        self.messages = 0  # messages in coalesced frames
+        self.start_time = time.time()
+
+    def ratio(self):
+        "Size on the wire / size before compression."
+        return self.wire_bytes / self.raw_bytes if self.raw_bytes else 1.0
+
+    def info(self):
+        "Get all counters as a dict."
+        return {
+            "frames": self.frames,
+            "compressed_frames": self.compressed_frames,
+            "raw_bytes": self.raw_bytes,
+            "wire_bytes": self.wire_bytes,
+            "ratio": self.ratio(),
+            "batches": self.batches,
+            "messages": self.messages,
+            "time": time.time() - self.start_time,
+        }
+
+
+AMP_STATS = AMPStats()
+
+
 @wraps
 def catch_traceback(func):
     "Helper decorator"
@@ -146,12 +227,12 @@ class Compressed(amp.String):
         # print("toBox: name={}, strings={}, objects={}, proto{}".format(name, strings, objects, proto))
 
         value = BytesIO(objects[str(name, "utf-8")])
-        strings[name] = self.toStringProto(value.read(AMP_MAXLEN), proto)
+        strings[name] = self.toStringProto(value.read(AMP_CHUNKLEN), proto)
 
         # print("toBox strings[name] = {}".format(strings[name]))
 
         for counter in count(2):
-            chunk = value.read(AMP_MAXLEN)
+            chunk = value.read(AMP_CHUNKLEN)
             if not chunk:
                 break
             strings[b"%s.%d" % (name, counter)] = self.toStringProto(chunk, proto)
@@ -159,18 +240,50 @@ class Compressed(amp.String):
     def toString(self, inObject):
         """
         Convert to send as a bytestring on the wire, with compression.
+        The first byte marks the codec. Data shorter than the threshold,
+        or which can not be compressed smaller, is sent as it is.
 
         Note: In Py3 this is really a byte stream.
 
         """
-        return zlib.compress(super(Compressed, self).toString(inObject), 9)
+        data = super(Compressed, self).toString(inObject)
+        codec, level, threshold = _get_compression()
+
+        out = None
+        if codec != "none" and len(data) >= threshold:
+            if codec == "lz4":
+                out = CODEC_LZ4 + lz4_frame.compress(data)
+            else:
+                out = CODEC_ZLIB + zlib.compress(data, level)
+            if len(out) > len(data):
+                out = None
+
+        AMP_STATS.frames += 1
+        AMP_STATS.raw_bytes += len(data)
+        if out is None:
+            out = CODEC_NONE + data
+        else:
+            AMP_STATS.compressed_frames += 1
+        AMP_STATS.wire_bytes += len(out)
+        return out
 
     def fromString(self, inString):
         """
         Convert (decompress) from the string-representation on the wire to Python.
 
         """
-        return super(Compressed, self).fromString(zlib.decompress(inString))
+        codec = inString[:1]
+        if codec == CODEC_NONE:
+            data = inString[1:]
+        elif codec == CODEC_ZLIB:
+            data = zlib.decompress(inString[1:])
+        elif codec == CODEC_LZ4:
+            data = lz4_frame.decompress(inString[1:])
+        elif inString[0] == ZLIB_HEADER:
+            data = zlib.decompress(inString)
+        else:
+            raise ValueError("Unknown AMP codec: %r" % codec)
+        return super(Compressed, self).fromString(data)
 
 
 class MsgLauncher2Portal(amp.Command):
@@ -209,6 +322,21 @@ class MsgServer2Portal(amp.Command):
     response = []
 
 
+class MsgBatchServer2Portal(amp.Command):
+    """
+    Messages Server -> Portal
+
+    Carries all messages the Server sent in one reactor iteration,
+    as a pickled list of (sessid, kwargs).
+
+    """
+
+    key = "MsgBatchServer2Portal"
+    arguments = [(b"packed_data", Compressed())]
+    errors = {Exception: b"EXCEPTION"}
+    response = []
+
+
 class AdminPortal2Server(amp.Command):
     """
     Administration Portal -> Server
@@ -380,6 +380,27 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
             logger.log_trace("packed_data len {}".format(len(packed_data)))
         return {}
 
+    @amp.MsgBatchServer2Portal.responder
+    @amp.catch_traceback
+    def portal_receive_batchserver2portal(self, packed_data):
+        """
+        Receives messages coalesced by the Server.
+        This method is executed on the Portal.
+
+        Args:
+            packed_data (str): Pickled list of (sessid, kwargs) coming over the wire.
+
+        """
+        sessions = self.factory.portal.sessions
+        for sessid, kwargs in self.data_in(packed_data):
+            try:
+                session = sessions.get(sessid, None)
+                if session:
+                    sessions.data_out(session, **kwargs)
+            except Exception:
+                logger.log_trace("batch message of session {}".format(sessid))
+        return {}
+
     @amp.AdminServer2Portal.responder
     @amp.catch_traceback
     def portal_receive_adminserver2portal(self, packed_data):
@@ -25,7 +25,7 @@ import evennia
 
 evennia._init()
 
-from evennia.utils.utils import get_evennia_version, mod_import, make_iter
+from evennia.utils.utils import get_evennia_version, mod_import, make_iter, class_from_module
 from evennia.server.portal.portalsessionhandler import PORTAL_SESSIONS
 from evennia.utils import logger
 from evennia.server.webserver import EvenniaReverseProxyResource
@@ -370,7 +370,11 @@ if WEBSERVER_ENABLED:
 
                     factory = Websocket()
                     factory.noisy = False
-                    factory.protocol = webclient.WebSocketClient
+                    factory.protocol = class_from_module(settings.WEBSOCKET_PROTOCOL_CLASS)
+                    if settings.WEBSOCKET_DEFLATE_ENABLED:
+                        factory.setProtocolOptions(
+                            perMessageCompressionAccept=webclient.accept_permessage_deflate
+                        )
                     factory.sessionhandler = PORTAL_SESSIONS
                     websocket_service = internet.TCPServer(port, factory, interface=w_interface)
                     websocket_service.setName("EvenniaWebSocket%s:%s" % (w_ifacestr, port))
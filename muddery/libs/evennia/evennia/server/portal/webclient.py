@@ -24,6 +24,7 @@ from evennia.utils.utils import to_str, mod_import
 from evennia.utils.ansi import parse_ansi
 from evennia.utils.text2html import parse_html
 from autobahn.twisted.websocket import WebSocketServerProtocol
+from autobahn.websocket.compress import PerMessageDeflateOffer, PerMessageDeflateOfferAccept
 
 _RE_SCREENREADER_REGEX = re.compile(
     r"%s" % settings.SCREENREADER_REGEX_STRIP, re.DOTALL + re.MULTILINE
@@ -40,6 +41,32 @@ CLOSE_NORMAL = WebSocketServerProtocol.CLOSE_STATUS_CODE_NORMAL
 GOING_AWAY = WebSocketServerProtocol.CLOSE_STATUS_CODE_GOING_AWAY
 
 
+def accept_permessage_deflate(offers):
+    """
+    Accept the client's permessage-deflate offer, with the window bits and
+    memory level of settings.WEBSOCKET_DEFLATE_*.
+
+    Args:
+        offers (list): Compression offers of the client.
+
+    Returns:
+        accept (PerMessageDeflateOfferAccept or None): The accepted offer.
+
+    """
+    for offer in offers:
+        if isinstance(offer, PerMessageDeflateOffer):
+            window_bits = settings.WEBSOCKET_DEFLATE_WINDOW_BITS
+            if offer.request_max_window_bits:
+                # the client limits the window of the server
+                window_bits = min(window_bits, offer.request_max_window_bits)
+            return PerMessageDeflateOfferAccept(
+                offer,
+                window_bits=window_bits,
+                mem_level=settings.WEBSOCKET_DEFLATE_MEM_LEVEL,
+            )
+    return None
+
+
 class WebSocketClient(WebSocketServerProtocol, Session):
     """
     Implements the server-side of the Websocket connection.
@@ -124,3 +124,26 @@ class TestAMPClientRecv(_TestAMP):
         self.server.sessions.portal_disconnect_all = MagicMock()
         self.amp_client.dataReceived(wire_data)
         self.server.sessions.portal_disconnect_all.assert_called()
+
+
+class TestCompressed(TestCase):
+    """Test the Compressed argument"""
+
+    def _round_trip(self, data):
+        argument = amp.Compressed()
+        strings = {}
+        argument.toBox(b"data", strings, {"data": data}, None)
+        for chunk in strings.values():
+            self.assertLessEqual(len(chunk), amp.AMP_MAXLEN)
+
+        objects = {}
+        argument.fromBox(b"data", strings, objects, None)
+        self.assertEqual(objects["data"], data)
+
+    @patch("evennia.server.portal.amp._get_compression", MagicMock(return_value=("none", 0, 0)))
+    def test_uncompressed_chunks(self):
+        self._round_trip(b"x" * (amp.AMP_MAXLEN * 2 + 10))
+
+    @patch("evennia.server.portal.amp._get_compression", MagicMock(return_value=("zlib", 1, 0)))
+    def test_incompressible_chunks(self):
+        self._round_trip(bytes(range(256)) * 600)
@@ -102,6 +102,14 @@ WEBSOCKET_CLIENT_INTERFACE = "0.0.0.0"
 # the client will itself figure out this url based on the server's hostname.
 # e.g. ws://external.example.com or wss://external.example.com:443
 WEBSOCKET_CLIENT_URL = None
+# The protocol class of websocket connections.
+WEBSOCKET_PROTOCOL_CLASS = "evennia.server.portal.webclient.WebSocketClient"
+# Accept permessage-deflate compression offered by websocket clients. The
+# window bits (9-15) and memory level (1-9) of zlib set the memory used by
+# each connection, smaller values use less memory and compress less.
+WEBSOCKET_DEFLATE_ENABLED = False
+WEBSOCKET_DEFLATE_WINDOW_BITS = 15
+WEBSOCKET_DEFLATE_MEM_LEVEL = 8
 # This determine's whether Evennia's custom admin page is used, or if the
 # standard Django admin is used.
 EVENNIA_ADMIN = True
@@ -113,6 +121,17 @@ EVENNIA_ADMIN = True
 AMP_HOST = "localhost"
 AMP_PORT = 4006
 AMP_INTERFACE = "127.0.0.1"
+# Compression of data between the Server and the Portal. The codec can be
+# "zlib", "lz4" (needs the lz4 package) or "none". The level is zlib's
+# compression level (1-9). Data shorter than the threshold (in bytes) is
+# sent uncompressed.
+AMP_COMPRESSION_CODEC = "zlib"
+AMP_COMPRESSION_LEVEL = 9
+AMP_COMPRESSION_THRESHOLD = 0
+# If True, the Server sends all messages produced in one reactor iteration
+# to the Portal in one AMP command, up to AMP_COALESCE_MAX_MESSAGES messages.
+AMP_COALESCE_MESSAGES = False
+AMP_COALESCE_MAX_MESSAGES = 500
 
 
 # Path to the lib directory containing the bulk of the codebase's code.
@@ -34,13 +34,26 @@ def import_local_data():
     # load custom data
     # data file's path
     data_path = os.path.join(settings.GAME_DIR, settings.WORLD_DATA_FOLDER)
-    importer.import_data_path(data_path)
+    importer.import_data_path(data_path, workers=settings.WORLD_DATA_WORKERS)
 
     # localized string file's path
     localized_string_path = os.path.join(data_path, settings.LOCALIZED_STRINGS_FOLDER, settings.LANGUAGE_CODE)
     importer.import_table_path(localized_string_path, settings.LOCALIZED_STRINGS_MODEL)
 
 
+def rebuild_world():
+    """
+    Rebuild objects whose world data have changed.
+    """
+    from muddery.server.dao.worlddata import WorldData
+    from muddery.server.utils.game_settings import GAME_SETTINGS
+    from muddery.server.utils import builder
+
+    WorldData.reload()
+    GAME_SETTINGS.reset()
+    builder.build_changed()
+
+
 def create_superuser(username, password):
     """
     Create the superuser's account.
@@ -168,6 +181,10 @@ def main():
         '--dummyrunner', nargs=1, action='store', dest='dummyrunner',
         metavar="<N>",
         help="test a server by connecting <N> dummy accounts to it")
+    parser.add_argument(
+        '--loadrunner', nargs=1, action='store', dest='loadrunner',
+        metavar="<N>",
+        help="test a server by connecting <N> bots to its webclient's websocket")
     parser.add_argument(
         '-v', '--version', action='store_true',
         dest='show_version', default=False,
@@ -178,6 +195,9 @@ def main():
     parser.add_argument(
         '--loaddata', action='store_true', dest='loaddata', default=False,
         help="Load local data from the worlddata folder.")
+    parser.add_argument(
+        '--rebuild', action='store_true', dest='rebuild', default=False,
+        help="Rebuild objects whose world data have changed. Stop the server before rebuilding.")
     parser.add_argument(
         '--port', '-p', nargs=1, action='store', dest='port',
         metavar="<N>",
@@ -287,6 +307,36 @@ def main():
             print("Import local data error: %s" % e)
 
         sys.exit()
+    elif args.rebuild:
+        print("Rebuilding the world.")
+
+        gamedir = os.path.abspath(configs.CURRENT_DIR)
+        os.chdir(gamedir)
+        evennia_launcher.init_game_directory(gamedir, check_db=True)
+
+        try:
+            rebuild_world()
+            print("Rebuild the world success.")
+        except Exception as e:
+            traceback.print_exc()
+            print("Rebuild the world error: %s" % e)
+
+        sys.exit()
+    elif args.loadrunner:
+        try:
+            number = int(args.loadrunner[0])
+        except ValueError:
+            print("The number of bots must be a number.")
+            sys.exit(-1)
+
+        gamedir = os.path.abspath(configs.CURRENT_DIR)
+        os.chdir(gamedir)
+        evennia_launcher.init_game_directory(gamedir, check_db=False)
+
+        from muddery.server.profiling import loadrunner
+        loadrunner.run(number)
+
+        sys.exit()
 
     if args.show_version:
         # show the version info
@@ -22,7 +22,7 @@ class ChooseSkill(object):
         if not combat:
             return
         
-        skills = [caller.db.skills[skill] for skill in caller.db.skills if caller.db.skills[skill].is_available(passive=False)]
+        skills = [skill for skill in caller.skills.values() if skill.is_available(passive=False)]
         if not skills:
             return
 
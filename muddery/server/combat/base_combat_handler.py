@@ -2,7 +2,7 @@
 Combat handler.
 
 The life of a combat:
-1. create: create a combat.
+1. create: COMBAT_MANAGER creates a combat.
 2. set_combat: set teams in the combat and the end time if available, then calls the start_combat.
 3. start_combat: start the combat. Characters in the combat are allowed to use skills.
 4. prepare_skill: characters call the prepare_skill to use skills in the combat. It casts a skill and check if the
@@ -11,14 +11,16 @@ The life of a combat:
    the combat is timeout. If a combat can finish calls the finish method.
 6. finish: send combat results to all characters.
 7. leave_combat: characters notify the combat that it has left.
-8. stop: if all characters left, remove the combat.
+8. stop: if all characters left, remove the combat from COMBAT_MANAGER.
+
+Combats are plain objects kept in memory, they are not saved in the db.
 """
 
 from enum import Enum
 from twisted.internet import reactor
 from django.conf import settings
-from evennia import DefaultScript
 from muddery.server.utils import defines
+from muddery.server.combat.combat_manager import COMBAT_MANAGER
 
 
 class CStatus(Enum):
@@ -32,16 +34,17 @@ class CStatus(Enum):
     LEFT = 5
 
 
-class BaseCombatHandler(DefaultScript):
+class BaseCombatHandler(object):
     """
     This implements the combat handler.
     """
-    # standard Script hooks
-    def at_script_creation(self):
-        "Called when script is first created"
+    def __init__(self, combat_id):
+        """
+        Args:
+            combat_id: (int) the combat's id in COMBAT_MANAGER.
+        """
+        self.id = combat_id
         self.desc = "handles combat"
-        self.interval = 0  # keep running until the battle ends
-        self.persistent = False
 
         """
         store all combatants
@@ -67,11 +70,45 @@ class BaseCombatHandler(DefaultScript):
         """
         self.stop()
 
+    def stop(self):
+        """
+        Stop the combat and remove it.
+        """
+        self.at_stop()
+        COMBAT_MANAGER.remove_combat(self.id)
+
     def at_stop(self):
-        "Called just before the script is stopped/destroyed."
+        "Called just before the combat is stopped."
         if self.timer and self.timer.active():
             self.timer.cancel()
 
+    def get_persistent_data(self):
+        """
+        Get the data to resume the combat after the server reloads.
+
+        Returns:
+            (dict) combat's data.
+        """
+        teams = {}
+        temps = []
+        for char in self.characters.values():
+            if char["status"] == CStatus.LEFT:
+                continue
+
+            character = char["char"]
+            teams.setdefault(character.get_team(), []).append(character.dbref)
+            if character.is_temp:
+                temps.append(character.dbref)
+
+        timeout = 0
+        if self.timer and self.timer.active():
+            timeout = max(self.timer.getTime() - reactor.seconds(), 1)
+
+        return {"teams": teams,
+                "temps": temps,
+                "desc": self.desc,
+                "timeout": timeout}
+
     def at_timeout(self):
         """
         Combat timeout.
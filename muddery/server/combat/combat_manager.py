@@ -0,0 +1,122 @@
+"""
+Combat manager.
+
+Combats are plain Python objects kept in the combat manager, they are not
+saved in the db. If settings.COMBAT_RESUMABLE is True, unfinished combats are
+saved when the server reloads and resumed when it starts again.
+"""
+
+from django.conf import settings
+from evennia.server.models import ServerConfig
+from evennia.utils import logger, search
+from evennia.utils.utils import class_from_module
+
+
+class CombatManager(object):
+    """
+    Create and keep all combats.
+    """
+    # The key of saved combats in ServerConfig.
+    config_key = "resumable_combats"
+
+    def __init__(self):
+        # {combat's id: combat}
+        self.combats = {}
+        self.last_id = 0
+
+    def create_combat(self, teams, desc, timeout):
+        """
+        Create a new combat.
+
+        Args:
+            teams: (dict) {<team id>: [<characters>]}
+            desc: (string) combat's description
+            timeout: (int) Total combat time in seconds. Zero means no limit.
+
+        Returns:
+            (BaseCombatHandler) the combat.
+        """
+        self.last_id += 1
+        combat_class = class_from_module(settings.NORMAL_COMBAT_HANDLER)
+        combat = combat_class(self.last_id)
+        self.combats[combat.id] = combat
+
+        combat.set_combat(teams, desc, timeout)
+        return combat
+
+    def remove_combat(self, combat_id):
+        """
+        Remove a stopped combat.
+
+        Args:
+            combat_id: (int) combat's id.
+        """
+        self.combats.pop(combat_id, None)
+
+    def get_combat(self, combat_id):
+        """
+        Get a combat by its id.
+        """
+        return self.combats.get(combat_id)
+
+    def all(self):
+        """
+        Get all combats.
+        """
+        return list(self.combats.values())
+
+    def stop_all(self):
+        """
+        Stop all combats when the server shuts down.
+        """
+        for combat in self.all():
+            combat.at_server_shutdown()
+
+    def save(self):
+        """
+        Save unfinished combats to resume them after the server reloads.
+        """
+        data = [combat.get_persistent_data() for combat in self.all() if not combat.is_finished()]
+        ServerConfig.objects.conf(self.config_key, data)
+
+    def restore(self):
+        """
+        Resume saved combats.
+
+        Returns:
+            (list) temporary characters in resumed combats.
+        """
+        data = ServerConfig.objects.conf(self.config_key)
+        if not data:
+            return []
+
+        ServerConfig.objects.conf(self.config_key, delete=True)
+
+        temps = []
+        for combat_data in data:
+            try:
+                teams = {}
+                for team, dbrefs in combat_data["teams"].items():
+                    characters = []
+                    for dbref in dbrefs:
+                        found = search.search_object(dbref)
+                        if not found:
+                            raise KeyError("Can not find %s." % dbref)
+                        characters.append(found[0])
+                    teams[team] = characters
+
+                combat_temps = [char for members in teams.values() for char in members
+                                if char.dbref in combat_data["temps"]]
+                for character in combat_temps:
+                    character.is_temp = True
+
+                self.create_combat(teams, combat_data["desc"], combat_data["timeout"])
+                temps.extend(combat_temps)
+            except Exception as e:
+                logger.log_errmsg("Can not resume the combat: %s" % e)
+
+        return temps
+
+
+# combat manager
+COMBAT_MANAGER = CombatManager()
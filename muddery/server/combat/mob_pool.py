@@ -0,0 +1,106 @@
+"""
+Pool of temporary mobs.
+
+Temporary mobs are clones of NPCs created for combats (see
+MudderyCharacter.attack_temp_target). They are put back in the pool after
+combats and reused in later combats with the same data key, instead of being
+created and deleted for every combat. Pooled mobs have no location and are
+tagged, so they can be found again after the server restarts.
+"""
+
+from django.conf import settings
+from evennia.utils import logger, search
+from muddery.server.utils.builder import build_object
+
+
+class MobPool(object):
+    """
+    Keep idle temporary mobs by their data keys.
+    """
+    # Tag of temporary mobs.
+    tag_key = "temp_mob"
+    tag_category = "muddery"
+
+    def __init__(self):
+        # {data key: [idle mobs]}
+        self.mobs = {}
+
+    def get(self, key, level):
+        """
+        Get an idle mob or create a new one.
+
+        Args:
+            key: (string) mob's data key.
+            level: (int) mob's level.
+
+        Returns:
+            (object) the mob, or None if it can not be created.
+        """
+        idle = self.mobs.get(key)
+        while idle:
+            mob = idle.pop()
+            if mob.pk:
+                # The mob has not been deleted.
+                mob.reset_temp(level)
+                return mob
+
+        mob = build_object(key, level, reset_location=False)
+        if not mob:
+            return None
+
+        mob.is_temp = True
+        mob.tags.add(self.tag_key, category=self.tag_category)
+        return mob
+
+    def put(self, mob):
+        """
+        Put a mob back in the pool after its combat, or delete it if the pool
+        is full.
+
+        Args:
+            mob: (object) the temporary mob.
+        """
+        key = mob.get_data_key()
+        idle = self.mobs.setdefault(key, [])
+        if len(idle) >= settings.TEMP_MOB_POOL_SIZE:
+            mob.delete()
+            return
+
+        mob.stop_auto_combat_skill()
+        if mob.location:
+            mob.move_to(None, quiet=True, to_none=True)
+        idle.append(mob)
+
+    def restore(self, excludes=None):
+        """
+        Pool mobs left by the last run of the server.
+
+        Args:
+            excludes: (list) mobs which are in use.
+        """
+        self.mobs = {}
+        excludes = set(excludes or [])
+
+        for mob in search.search_tag(self.tag_key, category=self.tag_category):
+            if mob in excludes:
+                continue
+
+            try:
+                mob.is_temp = True
+                self.put(mob)
+            except Exception as e:
+                logger.log_errmsg("Can not pool the temporary mob %s: %s" % (mob.dbref, e))
+
+    def clear(self):
+        """
+        Delete all idle mobs.
+        """
+        for idle in self.mobs.values():
+            for mob in idle:
+                if mob.pk:
+                    mob.delete()
+        self.mobs = {}
+
+
+# temporary mob pool
+MOB_POOL = MobPool()
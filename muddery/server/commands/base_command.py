@@ -3,7 +3,10 @@ The base of all muddery commands.
 """
 
 import json
+import time
 from evennia.commands.command import Command
+from muddery.server.profiling.timing_handler import TIMING_HANDLER
+from muddery.server.profiling.query_tracker import QUERY_TRACKER
 
 
 class BaseCommand(Command):
@@ -11,6 +14,27 @@ class BaseCommand(Command):
         super(BaseCommand, self).__init__(*warg, **kwargs)
 
         self.context = None
+        self.start_time = None
+        self.query_scope = None
+
+    def at_pre_cmd(self):
+        """
+        Start timing the command and tracking its queries if they are on.
+        """
+        self.start_time = time.perf_counter() if TIMING_HANDLER.enabled else None
+        self.query_scope = QUERY_TRACKER.begin_command("command." + self.key) if QUERY_TRACKER.enabled else None
+
+    def at_post_cmd(self):
+        """
+        Add the command's time and queries.
+        """
+        if self.start_time is not None:
+            TIMING_HANDLER.add("command." + self.key, time.perf_counter() - self.start_time)
+            self.start_time = None
+
+        if self.query_scope is not None:
+            QUERY_TRACKER.end(self.query_scope)
+            self.query_scope = None
 
     def parse(self):
         """
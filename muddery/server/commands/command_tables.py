@@ -0,0 +1,139 @@
+"""
+Command tables of callers' states.
+
+Muddery's clients send JSON commands, which are always found in the cmdsets of
+sessions, accounts and characters. A caller's state is the classes of the
+cmdsets in these cmdset stacks, such as logged-out, in-game or in-combat (with
+CMDSET_COMBAT). The cmdsets of a state are merged once into a table of
+commands, so JSON commands can be run without Evennia's cmdset merging, which
+also gathers cmdsets of the location's contents, exits and channels.
+"""
+
+from evennia.commands.cmdhandler import CMD_NOINPUT, CMD_NOMATCH
+from evennia.utils import logger
+
+
+class CommandTables(object):
+    """
+    Merged command tables of callers' states.
+    """
+    def __init__(self):
+        # {state: {key: command}}
+        self.tables = {}
+
+    def clear(self):
+        """
+        Clear all tables, they will be built again when they are used.
+        """
+        self.tables = {}
+
+    def get_state(self, session):
+        """
+        Get the session's state, it is the classes of cmdsets of the session,
+        its account and its puppet.
+
+        Args:
+            session: (ServerSession) the caller's session.
+
+        Returns:
+            (tuple) cmdsets' classes, or None if the cmdsets can not be
+            merged in a table.
+        """
+        state = []
+        for handler in (session, session.account, session.puppet):
+            if not handler:
+                continue
+
+            try:
+                stack = handler.cmdset.cmdset_stack
+            except AttributeError:
+                continue
+
+            for cmdset in stack:
+                if cmdset.key == "_CMDSET_ERROR":
+                    # Let Evennia report the error.
+                    return None
+                if cmdset.key != "_EMPTY_CMDSET":
+                    state.append(type(cmdset))
+
+        return tuple(state)
+
+    def get_table(self, state):
+        """
+        Get the command table of a state.
+
+        Args:
+            state: (tuple) cmdsets' classes.
+
+        Returns:
+            (dict) {key: command}
+        """
+        try:
+            return self.tables[state]
+        except KeyError:
+            pass
+
+        try:
+            table = self.build_table(state)
+        except Exception as e:
+            logger.log_tracemsg("Can not build the command table of %s: %s" % (state, e))
+            table = {}
+
+        self.tables[state] = table
+        return table
+
+    def build_table(self, state):
+        """
+        Merge cmdsets in the same way as Evennia's cmdhandler, and put their
+        commands in a dict.
+
+        Args:
+            state: (tuple) cmdsets' classes.
+        """
+        if not state:
+            return {}
+
+        # Merge same-prio cmdsets together first.
+        mergers = {}
+        for cmdset_class in state:
+            cmdset = cmdset_class()
+            if cmdset.priority in mergers:
+                mergers[cmdset.priority] = mergers[cmdset.priority] + cmdset
+            else:
+                mergers[cmdset.priority] = cmdset
+
+        # Merge from the lowest priority.
+        cmdsets = sorted(mergers.values(), key=lambda x: x.priority)
+        merged = cmdsets[0]
+        for cmdset in cmdsets[1:]:
+            merged = merged + cmdset
+
+        # The first command of a key is matched.
+        table = {}
+        for cmdobj in reversed(merged.commands):
+            table[cmdobj.key] = cmdobj
+
+        # System commands need the full cmdset.
+        table.pop(CMD_NOINPUT, None)
+        table.pop(CMD_NOMATCH, None)
+        return table
+
+    def get_command(self, session, cmd):
+        """
+        Get a command available to the session.
+
+        Args:
+            session: (ServerSession) the caller's session.
+            cmd: (string) command's key.
+
+        Returns:
+            (Command) the command, or None if it is not in the session's
+            command table.
+        """
+        state = self.get_state(session)
+        if state is None:
+            return None
+        return self.get_table(state).get(cmd)
+
+
+COMMAND_TABLES = CommandTables()
@@ -15,6 +15,7 @@ from evennia import default_cmds
 from muddery.server.commands import combat
 from muddery.server.commands import general
 from muddery.server.commands import player
+from muddery.server.commands import session
 from muddery.server.commands import unloggedin
 
 
@@ -85,6 +86,7 @@ class AccountCmdSet(default_cmds.AccountCmdSet):
         self.add(player.CmdCharCreate())
         self.add(player.CmdCharDelete())
         self.add(player.CmdCharAll())
+        self.add(player.CmdTiming())
 
 
 class UnloggedinCmdSet(default_cmds.UnloggedinCmdSet):
@@ -104,6 +106,7 @@ class UnloggedinCmdSet(default_cmds.UnloggedinCmdSet):
         self.add(unloggedin.CmdUnconnectedQuit())
         self.add(unloggedin.CmdQuickLogin())
         self.add(unloggedin.CmdUnconnectedConnectT())
+        self.add(session.CmdLanguage())
 
 
 class SessionCmdSet(default_cmds.SessionCmdSet):
@@ -125,6 +128,7 @@ class SessionCmdSet(default_cmds.SessionCmdSet):
         #
         # any commands you add below will overload the default ones.
         #
+        self.add(session.CmdLanguage())
 
 
 class CombatCmdSet(CmdSet):
@@ -8,13 +8,13 @@ The licence of Evennia can be found in evennia/LICENSE.txt.
 import math
 from django.conf import settings
 from evennia.utils import logger
-from evennia import create_script
 from evennia.comms.models import ChannelDB
 from muddery.server.commands.base_command import BaseCommand
 from muddery.server.utils.localized_strings_handler import _
 from muddery.server.utils.exception import MudderyError
 from muddery.server.utils.utils import search_obj_data_key
 from muddery.server.utils.defines import ConversationType
+from muddery.server.combat.combat_manager import COMBAT_MANAGER
 
 
 class CmdLook(BaseCommand):
@@ -46,6 +46,13 @@ class CmdLook(BaseCommand):
             # Use search to handle duplicate/nonexistant results.
             looking_at_obj = caller.search_dbref(args)
             if not looking_at_obj:
+                # Skills and quests are data objects.
+                data_obj = caller.search_data_object(args)
+                if data_obj:
+                    appearance = data_obj.get_appearance(caller)
+                    caller.msg({"look_obj": appearance}, context=self.context)
+                    return
+
                 caller.msg({"alert": _("Can not find it.")})
                 return
         else:
@@ -789,11 +796,8 @@ class CmdAttack(BaseCommand):
             caller.msg(message)
             return
 
-        # create a new combat handler
-        chandler = create_script(settings.NORMAL_COMBAT_HANDLER)
-        
-        # set combat team and desc
-        chandler.set_combat({1: [target], 2:[caller]}, "", 0)
+        # create a new combat
+        COMBAT_MANAGER.create_combat({1: [target], 2:[caller]}, "", 0)
         
         caller.msg(_("You are attacking {R%s{n! You are in combat.") % target.get_name())
         target.msg(_("{R%s{n is attacking you! You are in combat.") % caller.get_name())
@@ -950,7 +954,7 @@ class CmdBuy(BaseCommand):
             caller.msg({"alert":_("You should buy something.")})
             return
 
-        goods = caller.search_dbref(self.args)
+        goods = caller.search_data_object(self.args)
         if not goods:
             caller.msg({"alert":_("Can not find this goods.")})
             return
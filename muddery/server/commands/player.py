@@ -12,6 +12,8 @@ from muddery.server.commands.base_command import BaseCommand
 from muddery.server.utils import utils
 from muddery.server.utils.localized_strings_handler import _
 from muddery.server.utils.builder import create_character
+from muddery.server.profiling.timing_handler import TIMING_HANDLER
+from muddery.server.profiling.query_tracker import QUERY_TRACKER
 
 MAX_NR_CHARACTERS = settings.MAX_NR_CHARACTERS
 MULTISESSION_MODE = settings.MULTISESSION_MODE
@@ -400,3 +402,55 @@ class CmdCharAll(BaseCommand):
         session = self.session
         
         session.msg({"char_all": player.get_all_characters()})
+
+
+class CmdTiming(BaseCommand):
+    """
+    Show or control the timing and query tracking of commands and hooks.
+
+    Usage:
+        {"cmd":"timing",
+         "args":<operation>
+        }
+
+    operation:
+        "" - show the slowest records.
+        "on" or "off" - turn timing on or off.
+        "queries" - show scopes with the most queries and repeated queries.
+        "queries on" or "queries off" - turn query tracking on or off.
+        "reset" - clear all records.
+        "dump [file's name]" - dump all records to a file in the logs folder.
+    """
+    key = "timing"
+    locks = "cmd:perm(Developer)"
+
+    def func(self):
+        "Show or control the timing."
+        session = self.session
+        args = self.args.split() if isinstance(self.args, str) else []
+        operation = args[0].lower() if args else ""
+
+        if operation == "on":
+            TIMING_HANDLER.enable(True)
+        elif operation == "off":
+            TIMING_HANDLER.enable(False)
+        elif operation == "queries":
+            if len(args) > 1:
+                QUERY_TRACKER.enable(args[1].lower() == "on")
+            session.msg({"msg": QUERY_TRACKER.format_stats(settings.TIMING_SHOW_LIMIT)})
+            return
+        elif operation == "reset":
+            TIMING_HANDLER.reset()
+            QUERY_TRACKER.reset()
+        elif operation == "dump":
+            try:
+                path = TIMING_HANDLER.dump(args[1] if len(args) > 1 else None)
+                session.msg({"msg": "Timing records are dumped to %s." % path})
+            except Exception as e:
+                session.msg({"alert": "Can not dump timing records: %s" % e})
+            return
+        elif operation:
+            session.msg({"alert": "Unknown operation: %s" % operation})
+            return
+
+        session.msg({"msg": TIMING_HANDLER.format_stats(settings.TIMING_SHOW_LIMIT)})
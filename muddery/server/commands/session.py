@@ -0,0 +1,42 @@
+"""
+Session commands. They can be used before and after logging in.
+"""
+
+from django.conf import settings
+from muddery.server.commands.base_command import BaseCommand
+from muddery.server.utils.localized_strings_handler import _, LOCALIZED_STRINGS_HANDLER
+
+
+class CmdLanguage(BaseCommand):
+    """
+    Set the session's language.
+
+    Usage:
+        {"cmd":"language",
+         "args":<language's code>
+        }
+
+    Messages sent to many players are translated to every player's language.
+    If the language's code is empty, returns all available languages.
+    """
+    key = "language"
+    locks = "cmd:all()"
+
+    def func(self):
+        "Set the session's language."
+        session = self.session
+        locale = self.args
+        locales = LOCALIZED_STRINGS_HANDLER.get_locales()
+
+        if not locale:
+            session.msg({"languages": locales})
+            return
+
+        if locale not in locales:
+            session.msg({"alert": _("This language is not available.")})
+            return
+
+        # Use None for the server's language, so it shares translations with
+        # sessions which do not set their languages.
+        session.set_locale(None if locale == settings.LANGUAGE_CODE else locale)
+        session.msg({"language": locale})
@@ -440,7 +440,7 @@ class CmdQuickLogin(BaseCommand):
         try:
             playername = args["playername"]
             md5 = hashlib.md5()
-            md5.update(playername)
+            md5.update(playername.encode())
             name_md5 = md5.hexdigest()
         except Exception:
             string = 'Syntax error!'
@@ -34,6 +34,10 @@ def at_server_start():
     from muddery.server.utils.localized_strings_handler import LOCALIZED_STRINGS_HANDLER
     LOCALIZED_STRINGS_HANDLER.reload()
 
+    # migrate quest, skill and goods objects of old saves
+    from muddery.server.utils.data_object_migration import migrate_data_objects
+    migrate_data_objects()
+
     # reset default locations
     from muddery.server.utils import builder
     builder.reset_default_locations()
@@ -54,6 +58,13 @@ def at_server_start():
     from muddery.server.utils.desc_handler import DESC_HANDLER
     DESC_HANDLER.reload()
 
+    # resume combats and pool temporary mobs
+    from django.conf import settings
+    from muddery.server.combat.combat_manager import COMBAT_MANAGER
+    from muddery.server.combat.mob_pool import MOB_POOL
+    temps = COMBAT_MANAGER.restore() if settings.COMBAT_RESUMABLE else []
+    MOB_POOL.restore(temps)
+
 
 def at_server_stop():
     """
@@ -74,7 +85,11 @@ def at_server_reload_stop():
     """
     This is called only time the server stops before a reload.
     """
-    pass
+    # save combats
+    from django.conf import settings
+    from muddery.server.combat.combat_manager import COMBAT_MANAGER
+    if settings.COMBAT_RESUMABLE:
+        COMBAT_MANAGER.save()
 
 
 def at_server_cold_start():
@@ -90,4 +105,6 @@ def at_server_cold_stop():
     This is called only when the server goes down due to a shutdown or
     reset.
     """
-    pass
+    # stop combats
+    from muddery.server.combat.combat_manager import COMBAT_MANAGER
+    COMBAT_MANAGER.stop_all()
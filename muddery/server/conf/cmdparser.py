@@ -23,6 +23,8 @@ your settings file:
 """
 
 import json
+import random
+from django.conf import settings
 from evennia.utils import logger
 import evennia.commands.cmdparser as evennia_cmdparser
 
@@ -30,6 +32,44 @@ import evennia.commands.cmdparser as evennia_cmdparser
 CMD_LOGINSTART = "__unloggedin_look_command"
 
 
+def get_command_table(cmdset):
+    """
+    Get a dict of the cmdset's commands by their keys. Evennia caches merged
+    cmdsets, so the dict is kept in the cmdset. CmdSet's add(), remove() and
+    make_unique() replace the cmdset's command list, so the dict is built
+    again if the list is not the one it was built from.
+
+    Args:
+        cmdset: the merged cmdset.
+
+    Returns:
+        (dict) {key: command}
+    """
+    commands = cmdset.commands
+    try:
+        built_from, table = cmdset._command_table
+        if built_from is commands:
+            return table
+    except AttributeError:
+        pass
+
+    # The first command of a key is matched.
+    table = {}
+    for cmdobj in reversed(commands):
+        table[cmdobj.key] = cmdobj
+
+    cmdset._command_table = (commands, table)
+    return table
+
+
+def log_command(caller, cmd, args):
+    """
+    Write a command to the commands log file in another thread.
+    """
+    logger.log_file(json.dumps({"caller": str(caller), "cmd": cmd, "args": args}, ensure_ascii=False),
+                    filename=settings.COMMAND_LOG_FILE)
+
+
 def cmdparser(raw_string, cmdset, caller, match_index=None):
     """
     This function is called by the cmdhandler once it has
@@ -51,22 +91,30 @@ def cmdparser(raw_string, cmdset, caller, match_index=None):
 
     """
     # Parse JSON formated command.
-    logger.log_infomsg("Receive command, %s: %s" % (caller, raw_string))
-
-    try:
-        data = json.loads(raw_string)
-    except Exception:
+    data = None
+    if raw_string[:1] == "{":
+        try:
+            data = json.loads(raw_string)
+        except ValueError:
+            pass
+
+    if not isinstance(data, dict):
         # Command is not in JSON, call evennia's cmdparser.
         return evennia_cmdparser.cmdparser(raw_string, cmdset, caller, match_index)
 
-    cmd = data["cmd"]
-    args = data["args"]
+    cmd = data.get("cmd")
+    args = data.get("args", "")
 
-    # Find the matching command in cmdset.
-    for cmdobj in cmdset:
-        if cmdobj.key == cmd:
-            return [(cmd, args, cmdobj, len(cmd), 1, raw_string)]
+    if settings.DEBUG or random.random() < settings.COMMAND_LOG_RATE:
+        log_command(caller, cmd, args)
 
-    # can not find
-    return []
+    if not isinstance(cmd, str):
+        return []
+
+    # Find the matching command in cmdset.
+    cmdobj = get_command_table(cmdset).get(cmd)
+    if cmdobj is None:
+        # can not find
+        return []
 
+    return [(cmd, args, cmdobj, len(cmd), 1, raw_string)]
@@ -0,0 +1,81 @@
+"""
+Input functions
+
+Input functions are always called from the client (they handle server
+input, hence the name).
+
+All global functions in this module whose name does not start with "_"
+is considered an inputfunc. They overload Evennia's inputfuncs of the
+same names.
+
+If settings.COMMAND_TABLE_DISPATCH is True, JSON commands are found in the
+command table of the caller's state and run directly, see
+muddery.server.commands.command_tables. Text commands, and JSON commands
+which are not in the table, go through Evennia's cmdhandler with full cmdset
+merging.
+"""
+
+import json
+import random
+from copy import copy
+from django.conf import settings
+from evennia.commands.cmdhandler import cmdhandler
+from evennia.server import inputfuncs as evennia_inputfuncs
+from muddery.server.commands.command_tables import COMMAND_TABLES
+from muddery.server.conf import cmdparser
+
+
+def text(session, *args, **kwargs):
+    """
+    Main text input from the client. This will execute a command
+    string on the server.
+
+    Args:
+        session (Session): The active Session to receive the input.
+        text (str): First arg is used as text-command input. Other
+            arguments are ignored.
+    """
+    if settings.COMMAND_TABLE_DISPATCH and args and _run_json_command(session, args[0], kwargs):
+        return
+
+    evennia_inputfuncs.text(session, *args, **kwargs)
+
+
+def _run_json_command(session, raw_string, kwargs):
+    """
+    Run a JSON command found in the session's command table.
+
+    Returns:
+        (boolean) the command has been run.
+    """
+    if not isinstance(raw_string, str) or raw_string[:1] != "{":
+        return False
+
+    try:
+        data = json.loads(raw_string)
+    except ValueError:
+        return False
+
+    if not isinstance(data, dict):
+        return False
+
+    cmd = data.get("cmd")
+    if not isinstance(cmd, str):
+        return False
+
+    cmdobj = COMMAND_TABLES.get_command(session, cmd)
+    if cmdobj is None:
+        return False
+
+    args = data.get("args", "")
+    if settings.DEBUG or random.random() < settings.COMMAND_LOG_RATE:
+        cmdparser.log_command(session, cmd, args)
+
+    # The command's obj is the object whose cmdset has the command.
+    kwargs.pop("options", None)
+    kwargs["obj"] = session.puppet or session.account or session
+    kwargs["context"] = data.get("context")
+    cmdhandler(session, args, callertype="session", session=session,
+               cmdobj=copy(cmdobj), cmdobj_key=cmd, **kwargs)
+    session.update_session_counters()
+    return True
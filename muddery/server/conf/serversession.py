@@ -24,6 +24,24 @@ settings file:
 import json
 from evennia.server.serversession import ServerSession as BaseServerSession
 from evennia.utils import logger
+from muddery.server.utils.localized_strings_handler import LazyTranslation
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Protocols which receive pre-encoded frames, see muddery.server.conf.webclient.
+FRAME_PROTOCOLS = {"websocket"}
+
+# Messages with only these arguments can be sent as frames.
+FRAME_KWARGS = {"options", "context"}
 
 
 class ServerSession(BaseServerSession):
@@ -51,6 +69,17 @@ class ServerSession(BaseServerSession):
         raw = options.get("raw", False)
         context = kwargs.get("context", "")
 
+        if self.protocol_key in FRAME_PROTOCOLS and text is not None and not options \
+                and kwargs.keys() <= FRAME_KWARGS:
+            # Encode the whole websocket frame once and send it to the portal
+            # directly, it needs no more cleaning or parsing.
+            if msgpack and self.protocol_flags.get("FRAME_FORMAT") == "msgpack":
+                frame = [[self.pack_frame(text, context)], {"binary": True}]
+            else:
+                frame = [[self.encode_frame(text, context)], {}]
+            self.sessionhandler.server.amp_protocol.send_MsgServer2Portal(self, frame=frame)
+            return
+
         if self.protocol_key == 'telnet':
             out_text = str(text)
         else:
@@ -58,7 +87,8 @@ class ServerSession(BaseServerSession):
                 out_text = text
             else:
                 try:
-                    out_text = json.dumps({"data": text, "context": context}, ensure_ascii=False)
+                    out_text = json.dumps({"data": text, "context": context}, ensure_ascii=False,
+                                          default=self.translate_lazy)
                 except Exception as e:
                     out_text = json.dumps({"data": {"err": "There is an error occurred while outputing messages."}})
                     logger.log_tracemsg("json.dumps failed: %s" % e)
@@ -67,3 +97,59 @@ class ServerSession(BaseServerSession):
             kwargs["options"].update({"raw": True, "client_raw": True})
 
         return super(ServerSession, self).data_out(text=out_text, **kwargs)
+
+    def encode_frame(self, text, context):
+        """
+        Encode a message to a websocket frame of the webclient.
+
+        Returns:
+            (bytes or string) ["text", [{"data": text, "context": context}], {}]
+        """
+        frame = ["text", [{"data": text, "context": context}], {}]
+        try:
+            if orjson:
+                return orjson.dumps(frame, default=self.translate_lazy, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                return json.dumps(frame, ensure_ascii=False, default=self.translate_lazy)
+        except Exception as e:
+            logger.log_tracemsg("Encode frame failed: %s" % e)
+            return json.dumps(["text", [{"data": {"err": "There is an error occurred while outputing messages."},
+                                         "context": ""}], {}])
+
+    def pack_frame(self, text, context):
+        """
+        Pack a message to a binary websocket frame of the webclient.
+
+        Returns:
+            (bytes) ["text", [{"data": text, "context": context}], {}] in MessagePack.
+        """
+        frame = ["text", [{"data": text, "context": context}], {}]
+        try:
+            return msgpack.packb(frame, default=self.translate_lazy, use_bin_type=True)
+        except Exception as e:
+            logger.log_tracemsg("Pack frame failed: %s" % e)
+            return msgpack.packb(["text", [{"data": {"err": "There is an error occurred while outputing messages."},
+                                            "context": ""}], {}])
+
+    def get_locale(self):
+        """
+        Get the session's language, None means the server's language.
+        """
+        return self.protocol_flags.get("LOCALE")
+
+    def set_locale(self, locale):
+        """
+        Set the session's language.
+
+        Args:
+            locale: (string) language's code.
+        """
+        self.update_flags(LOCALE=locale)
+
+    def translate_lazy(self, value):
+        """
+        Translate strings to the session's language when encoding messages.
+        """
+        if isinstance(value, LazyTranslation):
+            return value.translate(self.get_locale())
+        raise TypeError("Object of type %s is not JSON serializable" % type(value).__name__)
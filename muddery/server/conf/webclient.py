@@ -0,0 +1,70 @@
+"""
+Websocket protocol of Muddery's webclient.
+
+Muddery's server encodes messages to whole websocket frames, see
+ServerSession.encode_frame, this protocol writes these frames to clients
+verbatim.
+
+Frames are JSON text by default. If the client offers the "msgpack"
+subprotocol when connecting and the msgpack package is installed, frames are
+sent as binary MessagePack frames of the same structures.
+
+To use this protocol, add to the settings file:
+
+    WEBSOCKET_PROTOCOL_CLASS = "muddery.server.conf.webclient.WebSocketClient"
+"""
+
+from django.conf import settings
+from evennia.server.portal.webclient import WebSocketClient as BaseWebSocketClient
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Websocket subprotocols of frame formats.
+JSON_FORMAT = "json"
+MSGPACK_FORMAT = "msgpack"
+
+
+class WebSocketClient(BaseWebSocketClient):
+    """
+    Implements the server-side of the Websocket connection.
+    """
+    frame_format = JSON_FORMAT
+
+    def onConnect(self, request):
+        """
+        Choose the frame format from the subprotocols offered by the client.
+
+        Returns:
+            (string) the accepted subprotocol, or None.
+        """
+        if MSGPACK_FORMAT in request.protocols and msgpack and settings.WEBSOCKET_BINARY_FRAMES:
+            self.frame_format = MSGPACK_FORMAT
+            return MSGPACK_FORMAT
+
+        if JSON_FORMAT in request.protocols:
+            return JSON_FORMAT
+
+        return None
+
+    def init_session(self, protocol_key, address, sessionhandler):
+        """
+        Tell the server session the frame format.
+        """
+        super(WebSocketClient, self).init_session(protocol_key, address, sessionhandler)
+        self.protocol_flags["FRAME_FORMAT"] = self.frame_format
+
+    def send_frame(self, frame, binary=False, **kwargs):
+        """
+        Send a pre-encoded frame to the client.
+
+        Args:
+            frame (bytes or str): an encoded [cmdname, args, kwargs] list.
+            binary (bool): send a binary frame.
+        """
+        if isinstance(frame, str):
+            frame = frame.encode()
+        return self.sendMessage(frame, isBinary=binary)
@@ -37,14 +37,23 @@ class TableData(object):
     Load and cache a table's data.
     """
 
-    def __init__(self, table_name):
+    def __init__(self, table_name, snapshot=None):
+        """
+        Args:
+            table_name: (string) table's name.
+            snapshot: (tuple) a table's field names and records, such as data
+                      read from a data file. Load data from the db if it is None.
+        """
         self.table_name = table_name
 
         self.data = []
         self.fields = {}
         self.index = {}
         # index: {field's value: recode's index}
-        self.reload()
+        if snapshot is None:
+            self.reload()
+        else:
+            self.load(*snapshot)
 
     def clear(self):
         self.data = []
@@ -52,18 +61,28 @@ class TableData(object):
         self.index = {}
 
     def reload(self):
+        model_obj = apps.get_model(settings.WORLD_DATA_APP, self.table_name)
+        fields = [field.name for field in model_obj._meta.fields]
+        records = model_obj.objects.all().values_list(*fields)
+        self.load(fields, records)
+
+    def load(self, fields, records):
+        """
+        Load records and build indexes.
+
+        Args:
+            fields: (list) field names.
+            records: (iterator) records, values are in the order of field names.
+        """
         self.clear()
 
         model_obj = apps.get_model(settings.WORLD_DATA_APP, self.table_name)
-        fields = [field.name for field in model_obj._meta.fields]
         for i, field_name in enumerate(fields):
             self.fields[field_name] = i
 
         # load records
-        records = model_obj.objects.all()
         for record in records:
-            row_data = [record.serializable_value(field_name) for field_name in fields]
-            self.data.append(RecordData(self.fields, row_data))
+            self.data.append(RecordData(self.fields, record))
 
         # set unique index
         for field in model_obj._meta.fields:
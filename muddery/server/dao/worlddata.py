@@ -2,10 +2,13 @@
 Load and cache all worlddata.
 """
 
+from types import MappingProxyType
 from django.conf import settings
 from django.apps import apps
+from evennia.utils import logger
 from muddery.server.dao.tabledata import TableData
 from muddery.server.utils.exception import MudderyError
+from muddery.server.profiling.timing_handler import timed
 
 
 class WorldData(object):
@@ -14,12 +17,17 @@ class WorldData(object):
     """
     tables = {}
 
+    # Objects' data merged from their tables.
+    # {(tables, key): read-only values}
+    objects_data = {}
+
     @classmethod
     def clear(cls):
         """
         Clear data.
         """
         cls.tables = {}
+        cls.objects_data = {}
 
     @classmethod
     def reload(cls):
@@ -35,14 +43,20 @@ class WorldData(object):
             cls.tables[name] = TableData(name)
 
     @classmethod
-    def load_table(cls, table_name):
+    def load_table(cls, table_name, snapshot=None):
         """
         Load a table to the local storage.
+
+        Args:
+            table_name: (string) table's name.
+            snapshot: (tuple) field names and records to load instead of
+                      querying the db.
         """
         try:
             model_obj = apps.get_model(settings.WORLD_DATA_APP, table_name)
             name = model_obj.__name__
-            cls.tables[name] = TableData(name)
+            cls.tables[name] = TableData(name, snapshot)
+            cls.objects_data = {}
         except Exception as e:
             raise MudderyError("Can not load table %s: %s" % (table_name, e))
 
@@ -61,6 +75,7 @@ class WorldData(object):
         return cls.tables[table_name].all_data()
 
     @classmethod
+    @timed("worlddata.get_table_data")
     def get_table_data(cls, table_name, **kwargs):
         """
         Get records from a table whose key field is the value.
@@ -106,3 +121,43 @@ class WorldData(object):
                 data[field_name] = getattr(record, field_name)
 
         return data
+
+    @classmethod
+    def get_object_data(cls, tables, key):
+        """
+        Get an object's records from tables and merge them into a read-only dict.
+        The result is cached and shared by all objects with the same key, so it
+        must not be modified.
+
+        Args:
+            tables: (tuple) tables' name
+            key: (string) object's key
+
+        Return:
+            (MappingProxyType) values
+        """
+        cache_key = (tables, key)
+        try:
+            return cls.objects_data[cache_key]
+        except KeyError:
+            pass
+
+        data = {}
+        for table_name in tables:
+            if table_name not in cls.tables:
+                cls.load_table(table_name)
+
+            fields = cls.tables[table_name].get_fields()
+            records = cls.tables[table_name].filter_data(key=key)
+
+            if not records:
+                logger.log_errmsg("Can not find key %s in %s" % (key, table_name))
+                continue
+
+            record = records[0]
+            for field_name in fields:
+                data[field_name] = getattr(record, field_name)
+
+        data = MappingProxyType(data)
+        cls.objects_data[cache_key] = data
+        return data
@@ -10,6 +10,7 @@ from muddery.server.dao.event_data import EventData
 from muddery.server.mappings.event_action_set import EVENT_ACTION_SET
 from muddery.server.typeclasses.script_room_interval import ScriptRoomInterval
 from muddery.server.utils.localized_strings_handler import _
+from muddery.server.profiling.timing_handler import timed
 
 
 PERMISSION_BYPASS_EVENTS = {perm.lower() for perm in settings.PERMISSION_BYPASS_EVENTS}
@@ -95,6 +96,7 @@ class EventTrigger(object):
         """
         return self.events
 
+    @timed("event.can_bypass")
     def can_bypass(self, character):
         """
         If the character can bypass the event, returns True.
@@ -111,6 +113,7 @@ class EventTrigger(object):
                     # has permission to bypass events
                     return True
 
+    @timed("event.trigger")
     def trigger(self, event_type, character, obj):
         """
         Trigger an event.
@@ -159,6 +162,7 @@ class EventTrigger(object):
         """
         self.trigger(defines.EVENT_TRIGGER_ARRIVE, character, self.owner)
 
+    @timed("event.at_character_move_out")
     def at_character_move_out(self, character):
         """
         Called when a character moves out of a room.
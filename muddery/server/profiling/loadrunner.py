@@ -0,0 +1,459 @@
+"""
+Load runner
+
+This module stress-tests a Muddery game with bots. Unlike Evennia's
+dummyrunner, which sends text commands through telnet, bots connect to the
+webclient's websocket and send the same JSON commands as the webclient. They
+log in, walk, talk to NPCs, loot, equip, fight and cast skills in the way of
+their personas, see loadrunner_settings.
+
+The runner reports latencies of commands, messages per second, the server's
+CPU usage and db queries. A command's latency is the time from sending it to
+receiving the first frame after it. Bots send a command only after the last
+one has been replied, so the server's own messages (like combat rounds) are
+rarely taken as replies.
+
+Please note that you shouldn't run this on a production server! Use a testing
+database and add this to the end of the game's settings file:
+
+    from muddery.server.profiling.settings_mixin import *
+
+Start the server, then run the bots in the game's directory:
+
+    muddery --loadrunner <N>
+"""
+
+import json
+import random
+import time
+from autobahn.twisted.websocket import WebSocketClientFactory, WebSocketClientProtocol, connectWS
+from autobahn.websocket.compress import PerMessageDeflateOffer, PerMessageDeflateResponse, PerMessageDeflateResponseAccept
+from django.conf import settings
+from twisted.internet import reactor
+from twisted.internet.task import LoopingCall
+from evennia.utils import mod_import
+from muddery.server.profiling import server_stats
+
+
+# Bots' states.
+STATE_CONNECTING = 0
+STATE_LOGIN = 1
+STATE_PLAYING = 2
+
+
+def percentile(values, percent):
+    """
+    Get the nearest-rank percentile of sorted values.
+    """
+    if not values:
+        return 0
+    index = int(len(values) * percent / 100.0 + 0.5) - 1
+    return values[max(0, min(index, len(values) - 1))]
+
+
+class LoadStats(object):
+    """
+    Statistics of a load test.
+    """
+    def __init__(self):
+        self.start_time = time.time()
+        self.start_cpu = time.process_time()
+
+        # {cmd: [latency in seconds]}
+        self.latencies = {}
+
+        # {cmd: number of commands without replies}
+        self.timeouts = {}
+
+        self.commands = 0
+        self.frames = 0
+        self.messages = 0
+        self.bytes = 0
+        self.alerts = 0
+        self.combats = 0
+        self.connected = 0
+        self.playing = 0
+        self.disconnected = 0
+
+        self.server_start = server_stats.load_stats()
+
+    def add_latency(self, cmd, latency):
+        self.latencies.setdefault(cmd, []).append(latency)
+
+    def add_timeout(self, cmd):
+        self.timeouts[cmd] = self.timeouts.get(cmd, 0) + 1
+
+    def report(self):
+        """
+        Get the report of the test until now.
+
+        Returns:
+            (string) the report's text.
+        """
+        elapsed = max(time.time() - self.start_time, 0.001)
+
+        lines = []
+        lines.append("-" * 78)
+        lines.append("Load runner: %ds, %d bots connected, %d playing, %d disconnected." %
+                     (elapsed, self.connected, self.playing, self.disconnected))
+        lines.append("%-16s %8s %8s %8s %8s %8s %8s" %
+                     ("command", "count", "p50 ms", "p90 ms", "p99 ms", "max ms", "timeout"))
+
+        total = 0
+        for cmd in sorted(set(self.latencies) | set(self.timeouts)):
+            values = sorted(self.latencies.get(cmd, []))
+            total += len(values)
+            lines.append("%-16s %8d %8.1f %8.1f %8.1f %8.1f %8d" %
+                         (cmd[:16],
+                          len(values),
+                          percentile(values, 50) * 1000,
+                          percentile(values, 90) * 1000,
+                          percentile(values, 99) * 1000,
+                          (values[-1] if values else 0) * 1000,
+                          self.timeouts.get(cmd, 0)))
+
+        lines.append("Sent %.1f commands/s, received %.1f frames/s, %.1f messages/s, %.1f KB/s, %d alerts." %
+                     (self.commands / elapsed,
+                      self.frames / elapsed,
+                      self.messages / elapsed,
+                      self.bytes / elapsed / 1024,
+                      self.alerts))
+        lines.append("Finished %d combats, %.2f combats/s." % (self.combats, self.combats / elapsed))
+
+        server_now = server_stats.load_stats()
+        if self.server_start and server_now and server_now["time"] > self.server_start["time"]:
+            server_time = server_now["time"] - self.server_start["time"]
+            cpu = server_now["cpu"] - self.server_start["cpu"]
+            queries = server_now["queries"] - self.server_start["queries"]
+            query_time = server_now["query_time"] - self.server_start["query_time"]
+            lines.append("Server: CPU %.1f%%, %.1f queries/s, %.1f queries/command, %.1f ms of queries/s." %
+                         (cpu / server_time * 100,
+                          queries / server_time,
+                          queries / max(total, 1),
+                          query_time / server_time * 1000))
+
+            amp_start = self.server_start.get("amp")
+            amp_now = server_now.get("amp")
+            if amp_start and amp_now:
+                frames = amp_now["frames"] - amp_start["frames"]
+                raw_bytes = amp_now["raw_bytes"] - amp_start["raw_bytes"]
+                wire_bytes = amp_now["wire_bytes"] - amp_start["wire_bytes"]
+                batches = amp_now["batches"] - amp_start["batches"]
+                messages = amp_now["messages"] - amp_start["messages"]
+                lines.append("Server AMP: %.1f frames/s, %.1f KB/s sent, %.1f%% of raw size, "
+                             "%.1f messages/batch." %
+                             (frames / server_time,
+                              wire_bytes / server_time / 1024,
+                              (wire_bytes / raw_bytes if raw_bytes else 1) * 100,
+                              messages / batches if batches else 0))
+        else:
+            lines.append("Server: no statistics, add muddery.server.profiling.server_stats to "
+                         "SERVER_SERVICES_PLUGIN_MODULES.")
+
+        lines.append("Runner: CPU %.1f%%." % ((time.process_time() - self.start_cpu) / elapsed * 100))
+        return "\n".join(lines)
+
+
+class LoadBot(WebSocketClientProtocol):
+    """
+    A bot which plays the game through the webclient's protocol.
+    """
+    def onOpen(self):
+        """
+        Log in after a random time.
+        """
+        self.runner = self.factory.runner
+        self.config = self.runner.config
+        self.key = self.config.NAME_FORMAT % self.factory.cid
+        self.persona = self.factory.persona
+
+        self.state = STATE_LOGIN
+        self.last_cmd = None
+        self.waiting = None
+        self.timeout_call = None
+        self.next_call = None
+
+        self.dbref = None
+        self.exits = []
+        self.npcs = []
+        self.things = []
+        self.players = []
+        self.inventory = []
+        self.dialogue = []
+        self.in_combat = False
+        self.leave_combat = False
+        self.skills = []
+        self.opponents = []
+
+        self.runner.stats.connected += 1
+        self.next_call = reactor.callLater(random.uniform(0, self.config.LOGIN_SPREAD), self.login)
+
+    def onClose(self, wasClean, code, reason):
+        """
+        Stop acting.
+        """
+        if not hasattr(self, "runner"):
+            return
+
+        for call in (self.timeout_call, self.next_call):
+            if call and call.active():
+                call.cancel()
+
+        self.runner.stats.connected -= 1
+        self.runner.stats.disconnected += 1
+        if self.state == STATE_PLAYING:
+            self.runner.stats.playing -= 1
+        self.state = STATE_CONNECTING
+
+    def login(self):
+        """
+        Log in with the account of the bot.
+        """
+        if self.config.LOGIN == "quick_login":
+            self.send("quick_login", {"playername": self.key})
+        else:
+            self.send("create", {"playername": self.key,
+                                 "password": self.config.PASSWORD,
+                                 "connect": True})
+
+    def send(self, cmd, args):
+        """
+        Send a JSON command like the webclient.
+        """
+        text = json.dumps({"cmd": cmd, "args": args})
+        self.sendMessage(json.dumps(["text", [text], {}]).encode())
+
+        self.last_cmd = cmd
+        self.waiting = (cmd, time.perf_counter())
+        self.timeout_call = reactor.callLater(self.config.REPLY_TIMEOUT, self.reply_timeout)
+        self.runner.stats.commands += 1
+
+    def reply_timeout(self):
+        """
+        The last command has not been replied.
+        """
+        self.timeout_call = None
+        if self.waiting:
+            self.runner.stats.add_timeout(self.waiting[0])
+            self.waiting = None
+        self.think()
+
+    def think(self):
+        """
+        Do the next action after a random time.
+        """
+        if self.state != STATE_PLAYING or self.waiting:
+            return
+
+        if self.next_call and self.next_call.active():
+            return
+
+        self.next_call = reactor.callLater(random.uniform(*self.config.THINK_TIME), self.act)
+
+    def act(self):
+        """
+        Do an action of the persona.
+        """
+        self.next_call = None
+        if self.state != STATE_PLAYING:
+            return
+
+        if self.leave_combat:
+            self.leave_combat = False
+            self.send("leave_combat", "")
+            return
+
+        actions = self.persona["combat_actions"] if self.in_combat else self.persona["actions"]
+        weights = [action[0] for action in actions]
+        func = random.choices(actions, weights)[0][1]
+
+        command = func(self)
+        if not command:
+            command = ("look", "")
+        self.send(*command)
+
+    def onMessage(self, payload, isBinary):
+        """
+        Handle a frame from the server.
+        """
+        stats = self.runner.stats
+        stats.frames += 1
+        stats.bytes += len(payload)
+
+        replied = False
+        if self.waiting:
+            cmd, sent_time = self.waiting
+            stats.add_latency(cmd, time.perf_counter() - sent_time)
+            self.waiting = None
+            replied = True
+            if self.timeout_call and self.timeout_call.active():
+                self.timeout_call.cancel()
+            self.timeout_call = None
+
+        try:
+            cmdname, args, kwargs = json.loads(payload.decode())
+        except (ValueError, TypeError):
+            return
+
+        if cmdname == "text":
+            for arg in args:
+                if isinstance(arg, str):
+                    try:
+                        arg = json.loads(arg)
+                    except ValueError:
+                        continue
+                if isinstance(arg, dict):
+                    self.handle_data(arg.get("data", arg))
+
+        if replied:
+            self.think()
+
+    def handle_data(self, data):
+        """
+        Handle messages in the data.
+        """
+        if not isinstance(data, dict):
+            return
+
+        for key, value in data.items():
+            self.runner.stats.messages += 1
+            handler = getattr(self, "msg_" + key, None)
+            if handler:
+                handler(value)
+
+    def msg_alert(self, value):
+        self.runner.stats.alerts += 1
+        if self.state == STATE_LOGIN and self.last_cmd == "create":
+            # The account already exists.
+            self.send("connect", {"playername": self.key,
+                                  "password": self.config.PASSWORD})
+
+    def msg_char_all(self, value):
+        if self.state != STATE_LOGIN or self.waiting:
+            return
+
+        if value:
+            self.send("puppet", value[0]["dbref"])
+        else:
+            self.send("char_create", {"name": self.key})
+
+    def msg_puppet(self, value):
+        self.dbref = value["dbref"]
+        if self.state != STATE_PLAYING:
+            self.state = STATE_PLAYING
+            self.runner.stats.playing += 1
+        self.think()
+
+    def msg_look_around(self, value):
+        self.exits = value.get("exits", [])
+        self.npcs = value.get("npcs", [])
+        self.things = value.get("things", [])
+        self.players = value.get("players", [])
+
+    def msg_inventory(self, value):
+        self.inventory = value
+
+    def msg_dialogue(self, value):
+        self.dialogue = value or []
+
+    def msg_joined_combat(self, value):
+        self.in_combat = True
+
+    def msg_combat_info(self, value):
+        characters = value.get("characters", [])
+        team = None
+        for character in characters:
+            if character.get("dbref") == self.dbref:
+                team = character.get("team")
+                break
+
+        self.opponents = [character["dbref"] for character in characters
+                          if character.get("dbref") != self.dbref and character.get("team") != team]
+
+    def msg_combat_commands(self, value):
+        self.skills = [command["key"] for command in value]
+
+    def msg_combat_finish(self, value):
+        self.runner.stats.combats += 1
+        self.in_combat = False
+        self.opponents = []
+        self.leave_combat = True
+
+
+class LoadBotFactory(WebSocketClientFactory):
+    """
+    Create a bot.
+    """
+    protocol = LoadBot
+
+    def __init__(self, url, runner, cid, persona):
+        super(LoadBotFactory, self).__init__(url, protocols=["json"])
+        self.runner = runner
+        self.cid = cid
+        self.persona = persona
+
+        if runner.config.DEFLATE:
+            self.setProtocolOptions(perMessageCompressionOffers=[PerMessageDeflateOffer()],
+                                    perMessageCompressionAccept=self.accept_compression)
+
+    def accept_compression(self, response):
+        if isinstance(response, PerMessageDeflateResponse):
+            return PerMessageDeflateResponseAccept(response)
+
+
+class LoadRunner(object):
+    """
+    Run bots and report the statistics.
+    """
+    def __init__(self, config):
+        self.config = config
+        self.stats = None
+
+    def get_url(self):
+        """
+        Get the websocket's url.
+        """
+        if self.config.WEBSOCKET_URL:
+            return self.config.WEBSOCKET_URL
+        return "ws://localhost:%s" % settings.WEBSOCKET_CLIENT_PORT
+
+    def run(self, number):
+        """
+        Start bots and run until the test's duration ends.
+
+        Args:
+            number: (int) number of bots.
+        """
+        url = self.get_url()
+        personas = list(self.config.PERSONAS.values())
+        weights = [persona["weight"] for persona in personas]
+
+        print("Load runner: connecting %d bots to %s." % (number, url))
+        self.stats = LoadStats()
+
+        for cid in range(1, number + 1):
+            persona = random.choices(personas, weights)[0]
+            connectWS(LoadBotFactory(url, self, cid, persona))
+
+        LoopingCall(self.print_report).start(self.config.REPORT_INTERVAL, now=False)
+        if self.config.DURATION:
+            reactor.callLater(self.config.DURATION, reactor.stop)
+        reactor.addSystemEventTrigger("before", "shutdown", self.print_report)
+        reactor.run()
+
+    def print_report(self):
+        print(self.stats.report())
+
+
+def run(number):
+    """
+    Run the load test.
+
+    Args:
+        number: (int) number of bots.
+    """
+    config = mod_import(settings.LOADRUNNER_SETTINGS_MODULE)
+    if not config:
+        raise IOError("Can not find load runner's settings %s." % settings.LOADRUNNER_SETTINGS_MODULE)
+
+    LoadRunner(config).run(number)
@@ -0,0 +1,186 @@
+"""
+Settings and actions of the load runner
+
+This module defines the load runner's settings and the personas of bots. Set
+LOADRUNNER_SETTINGS_MODULE in the game's settings file to use another module
+with the same variables.
+
+A bot sends a command, waits for the server's reply (or REPLY_TIMEOUT), thinks
+for a random time in THINK_TIME, then does its next action. An action is a
+function which is called with the bot and returns (cmd, args) of a JSON
+command, or None if it can not be done now (such as looting where there is
+nothing to loot). Then a LOOK action is done instead.
+
+The bot has the state received from the server:
+    key - the bot's account name, it is also its character's name.
+    dbref - the character's dbref.
+    exits, npcs, things, players - surroundings of the location, lists of
+        {"dbref", "name", "key"}.
+    inventory - a list of the character's objects {"dbref", "name", "equipped" ...}
+    dialogue - sentences of the current dialogue.
+    in_combat - the character is in combat.
+    skills - keys of the character's combat skills.
+    opponents - dbrefs of the opponents in the combat.
+"""
+
+import random
+
+
+# Seconds between the reply to a command and the next command, randomly in
+# this range. The webclient's players think for a few seconds.
+THINK_TIME = (1.0, 3.0)
+
+# Bots log in at random times in this number of seconds, so they do not all
+# log in at the same time.
+LOGIN_SPREAD = 10
+
+# Stop the test after this number of seconds. Run until interrupted if it is 0.
+DURATION = 300
+
+# Print a report every this number of seconds.
+REPORT_INTERVAL = 30
+
+# Seconds to wait for the reply to a command. Commands without replies are
+# reported as timeouts.
+REPLY_TIMEOUT = 10
+
+# The websocket url, use settings.WEBSOCKET_CLIENT_PORT on localhost if it is
+# empty.
+WEBSOCKET_URL = ""
+
+# Offer permessage-deflate compression to the server like browsers do.
+DEFLATE = True
+
+# How bots log in:
+#   "quick_login" - log in with only a name, the server creates the account
+#                   and the character and puppets it.
+#   "create" - create an account, or connect to it if it already exists,
+#              then create a character and puppet it.
+LOGIN = "create"
+
+# Names of bots' accounts and characters, with the bot's number.
+NAME_FORMAT = "bot%d"
+
+# Password of bots' accounts.
+PASSWORD = "loadrunner"
+
+
+# Actions
+
+def c_look(bot):
+    "Look around the location."
+    return "look", ""
+
+
+def c_look_obj(bot):
+    "Look at an object in the location."
+    objects = bot.exits + bot.npcs + bot.things
+    if not objects:
+        return None
+    return "look", random.choice(objects)["dbref"]
+
+
+def c_goto(bot):
+    "Go through an exit."
+    if not bot.exits:
+        return None
+    return "goto", random.choice(bot.exits)["dbref"]
+
+
+def c_talk(bot):
+    "Talk to an NPC, or continue the current dialogue."
+    if bot.dialogue:
+        sentence = random.choice(bot.dialogue)
+        return "dialogue", {"npc": sentence.get("npc", ""),
+                            "dialogue": sentence["dialogue"],
+                            "sentence": sentence["sentence"]}
+    if not bot.npcs:
+        return None
+    return "talk", random.choice(bot.npcs)["dbref"]
+
+
+def c_loot(bot):
+    "Loot an object in the location."
+    if not bot.things:
+        return None
+    return "loot", random.choice(bot.things)["dbref"]
+
+
+def c_inventory(bot):
+    "Show the inventory."
+    return "inventory", ""
+
+
+def c_equip(bot):
+    "Equip an object in the inventory."
+    objects = [obj for obj in bot.inventory if not obj.get("equipped")]
+    if not objects:
+        return None
+    return "equip", random.choice(objects)["dbref"]
+
+
+def c_attack(bot):
+    "Attack an NPC in the location."
+    if not bot.npcs:
+        return None
+    return "attack", random.choice(bot.npcs)["dbref"]
+
+
+def c_castskill(bot):
+    "Cast a skill in combat."
+    if not bot.skills:
+        return None
+    target = random.choice(bot.opponents) if bot.opponents else None
+    return "castskill", {"skill": random.choice(bot.skills),
+                         "target": target,
+                         "combat": True}
+
+
+def c_combat_info(bot):
+    "Get the combat's information."
+    return "combat_info", ""
+
+
+# Personas
+#
+# Each persona has a weight of bots which play it, actions out of combat and
+# actions in combat. Actions are (weight, function) tuples, weights need not
+# add up to 1.
+
+PERSONAS = {
+    "explorer": {
+        "weight": 0.4,
+        "actions": ((0.5, c_goto),
+                    (0.2, c_look),
+                    (0.2, c_look_obj),
+                    (0.1, c_talk)),
+        "combat_actions": ((0.9, c_castskill),
+                           (0.1, c_combat_info)),
+    },
+    "quester": {
+        "weight": 0.3,
+        "actions": ((0.4, c_talk),
+                    (0.2, c_goto),
+                    (0.2, c_loot),
+                    (0.1, c_inventory),
+                    (0.1, c_equip)),
+        "combat_actions": ((0.9, c_castskill),
+                           (0.1, c_combat_info)),
+    },
+    "fighter": {
+        "weight": 0.3,
+        "actions": ((0.5, c_attack),
+                    (0.2, c_goto),
+                    (0.1, c_loot),
+                    (0.1, c_inventory),
+                    (0.1, c_equip)),
+        "combat_actions": ((1.0, c_castskill),),
+    },
+    # Grinds NPCs, to benchmark combats per second. Give it a weight to use it.
+    "grinder": {
+        "weight": 0,
+        "actions": ((0.9, c_attack),
+                    (0.1, c_goto)),
+        "combat_actions": ((1.0, c_castskill),),
+    },
+}
@@ -0,0 +1,357 @@
+"""
+Track db queries of commands and hooks.
+
+When query tracking is on (QUERY_TRACKING, or the "timing queries on"
+command), every command and timed hook (see timing_handler.timed) is a scope.
+Queries are counted in all open scopes of the thread, so a command's count
+includes queries of its hooks. When a scope ends, it is an offender if it has
+more than QUERY_BUDGET queries, or runs the same SQL QUERY_REPEAT_LIMIT times
+or more (N+1 queries, or the same query repeated). Offenders are logged in
+QUERY_LOG_FILE with summaries of the stacks which ran the queries, when they
+are found or get worse.
+
+Tests can count queries of any code:
+
+    with QUERY_TRACKER.scope() as scope:
+        ...
+    assert scope.count <= 3
+    assert not scope.repeated(2)
+
+The world editor counts queries of requests and finds tables read by forms
+with scopes, and server stats count all queries with count_all().
+"""
+
+import os
+import json
+import time
+import threading
+import traceback
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connections, router
+from django.db.backends.signals import connection_created
+from evennia.utils import logger
+
+
+# Frames of these files are not in stack summaries.
+SKIPPED_FRAMES = (os.sep + "django" + os.sep, os.sep + "twisted" + os.sep, os.sep + "threading.py")
+
+
+def get_stack_summary():
+    """
+    Get the innermost frames of the current stack which are not in Django,
+    Twisted or this module.
+
+    Returns:
+        (list) "file:line in function" strings, the innermost first.
+    """
+    summary = []
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if filename == __file__ or any(skipped in filename for skipped in SKIPPED_FRAMES):
+            continue
+
+        summary.append("%s:%s in %s" % (filename.rsplit(os.sep + "muddery" + os.sep, 1)[-1],
+                                        frame.lineno,
+                                        frame.name))
+        if len(summary) >= settings.QUERY_STACK_DEPTH:
+            break
+
+    return summary
+
+
+class QueryScope(object):
+    """
+    Queries of a command or a hook.
+    """
+    __slots__ = ("name", "count", "queries")
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+
+        # {sql: [number of queries, set of params, stack summary]}
+        self.queries = {}
+
+    def repeated(self, limit):
+        """
+        Get SQL run for the limit times or more.
+
+        Args:
+            limit: (int) number of runs.
+
+        Returns:
+            (list) (sql, number of queries, number of different params, stack
+            summary) tuples, the most repeated first.
+        """
+        results = [(sql, record[0], len(record[1]), record[2])
+                   for sql, record in self.queries.items() if record[0] >= limit]
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results
+
+    def get_tables(self, models):
+        """
+        Get models whose tables appear in the scope's queries.
+
+        Args:
+            models: (list) models to check.
+
+        Returns:
+            (set) names of models.
+        """
+        tables = set()
+        for model in models:
+            table = connections[router.db_for_read(model)].ops.quote_name(model._meta.db_table)
+            if any(table in sql for sql in self.queries):
+                tables.add(model.__name__)
+        return tables
+
+
+class QueryTracker(object):
+    """
+    Count queries of scopes and find offenders. It is an execute wrapper of
+    db connections.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.installed = False
+
+        # Count all queries and their time.
+        self.counting = False
+        self.queries = 0
+        self.query_time = 0
+
+        # Open scopes of each thread.
+        self.local = threading.local()
+
+        self.reset()
+        if settings.QUERY_TRACKING:
+            self.enable(True)
+
+    def reset(self):
+        """
+        Clear all records.
+        """
+        # {scope's name: [calls, queries, max queries]}
+        self.scopes = {}
+
+        # {(scope's name, sql): [times, max repeats, stack summary]}
+        self.offenders = {}
+
+        self.start_time = time.time()
+
+    def enable(self, enabled):
+        """
+        Turn query tracking on or off.
+        """
+        if enabled:
+            self.install()
+        self.enabled = enabled
+
+    def install(self):
+        """
+        Add the tracker to existing and new connections.
+        """
+        if self.installed:
+            return
+
+        for connection in connections.all():
+            self.add_to(connection)
+        connection_created.connect(self.at_connection_created, weak=False)
+        self.installed = True
+
+    def count_all(self):
+        """
+        Count all queries and their time, whether they are in scopes or not.
+        """
+        self.install()
+        self.counting = True
+
+    def add_to(self, connection):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def at_connection_created(self, sender, connection, **kwargs):
+        # Connections of other threads.
+        self.add_to(connection)
+
+    def __call__(self, execute, sql, params, many, context):
+        stack = getattr(self.local, "stack", None)
+        if stack:
+            summary = None
+            params_key = repr(params)
+            for scope in stack:
+                scope.count += 1
+                record = scope.queries.get(sql)
+                if record is None:
+                    if summary is None:
+                        summary = get_stack_summary()
+                    record = [0, set(), summary]
+                    scope.queries[sql] = record
+                record[0] += 1
+                record[1].add(params_key)
+
+        if not self.counting:
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_time += time.perf_counter() - start
+            self.queries += 1
+
+    def get_stack(self):
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = []
+            self.local.stack = stack
+        return stack
+
+    def begin(self, name):
+        """
+        Begin a scope.
+
+        Args:
+            name: (string) the scope's name.
+
+        Returns:
+            (QueryScope) the scope, end it with end().
+        """
+        scope = QueryScope(name)
+        self.get_stack().append(scope)
+        return scope
+
+    def begin_command(self, name):
+        """
+        Begin a command's scope. Commands run at the top of stacks, so open
+        scopes are of commands which raised errors, they are discarded.
+        """
+        self.local.stack = []
+        return self.begin(name)
+
+    def end(self, scope):
+        """
+        End a scope and check its queries.
+        """
+        stack = self.get_stack()
+        if scope not in stack:
+            return
+
+        del stack[stack.index(scope):]
+        self.check(scope)
+
+    @contextmanager
+    def scope(self, name=""):
+        """
+        Count queries in a with block, even if query tracking is off. The
+        scope is not checked.
+        """
+        self.install()
+        scope = QueryScope(name)
+        stack = self.get_stack()
+        stack.append(scope)
+        try:
+            yield scope
+        finally:
+            if scope in stack:
+                del stack[stack.index(scope):]
+
+    def check(self, scope):
+        """
+        Add a scope's queries to records and log offenders.
+        """
+        name = scope.name
+        record = self.scopes.get(name)
+        if record is None:
+            record = [0, 0, 0]
+            self.scopes[name] = record
+        record[0] += 1
+        record[1] += scope.count
+
+        messages = []
+        if scope.count > record[2]:
+            record[2] = scope.count
+            if scope.count > settings.QUERY_BUDGET:
+                messages.append("%s: %d queries, over the budget of %d." % (name, scope.count, settings.QUERY_BUDGET))
+
+        for sql, count, distinct, summary in scope.repeated(settings.QUERY_REPEAT_LIMIT):
+            key = (name, sql)
+            offender = self.offenders.get(key)
+            if offender is None:
+                offender = [0, 0, summary]
+                self.offenders[key] = offender
+            offender[0] += 1
+
+            if count > offender[1]:
+                offender[1] = count
+                lines = ["%s: %d repeated queries with %d different params: %s" % (name, count, distinct, sql)]
+                lines.extend("    at " + frame for frame in summary)
+                messages.append("\n".join(lines))
+
+        if messages:
+            logger.log_file("\n".join(messages), filename=settings.QUERY_LOG_FILE)
+
+    def get_stats(self):
+        """
+        Get all records.
+
+        Returns:
+            (dict) scopes and offenders.
+        """
+        scopes = {name: {"calls": record[0],
+                         "queries": record[1],
+                         "mean": record[1] / record[0] if record[0] else 0,
+                         "max": record[2]}
+                  for name, record in list(self.scopes.items())}
+
+        offenders = [{"name": name,
+                      "sql": sql,
+                      "times": offender[0],
+                      "max_repeats": offender[1],
+                      "stack": offender[2]}
+                     for (name, sql), offender in list(self.offenders.items())]
+        offenders.sort(key=lambda item: item["times"] * item["max_repeats"], reverse=True)
+
+        return {"enabled": self.enabled,
+                "start_time": self.start_time,
+                "time": time.time(),
+                "budget": settings.QUERY_BUDGET,
+                "repeat_limit": settings.QUERY_REPEAT_LIMIT,
+                "scopes": scopes,
+                "offenders": offenders}
+
+    def format_stats(self, limit=None):
+        """
+        Format scopes with the most queries and the top offenders to text.
+
+        Args:
+            limit: (int) number of records to show, show all if it is None.
+        """
+        stats = self.get_stats()
+        scopes = sorted(stats["scopes"].items(), key=lambda item: item[1]["queries"], reverse=True)
+        offenders = stats["offenders"]
+        if limit:
+            scopes = scopes[:limit]
+            offenders = offenders[:limit]
+
+        lines = ["Query tracking is %s, since %ds ago." % ("on" if self.enabled else "off",
+                                                          time.time() - self.start_time),
+                 "%-40s %8s %10s %8s %8s" % ("name", "calls", "queries", "mean", "max")]
+        for name, record in scopes:
+            lines.append("%-40s %8d %10d %8.1f %8d" %
+                         (name[:40], record["calls"], record["queries"], record["mean"], record["max"]))
+
+        if offenders:
+            lines.append("Repeated queries:")
+        for offender in offenders:
+            lines.append("%s: %d times, up to %d repeats: %s" %
+                         (offender["name"], offender["times"], offender["max_repeats"], offender["sql"][:200]))
+            if offender["stack"]:
+                lines.append("    at " + offender["stack"][0])
+
+        return "\n".join(lines)
+
+
+# query tracker
+QUERY_TRACKER = QueryTracker()
@@ -0,0 +1,90 @@
+"""
+Server statistics of load tests.
+
+If this module is in SERVER_SERVICES_PLUGIN_MODULES, the server counts its db
+queries and writes its CPU time, queries and AMP counters (AMP_STATS) to
+SERVER_STATS_FILE in the logs directory every SERVER_STATS_INTERVAL seconds.
+The load runner reads this file and reports the server's CPU usage, queries
+and AMP compression and batching during the test.
+"""
+
+import os
+import json
+import time
+from django.conf import settings
+from twisted.internet.task import LoopingCall
+from evennia.utils import logger
+from evennia.server.portal.amp import AMP_STATS
+from muddery.server.profiling.query_tracker import QUERY_TRACKER
+
+
+class ServerStats(object):
+    """
+    Write the server's statistics to a file.
+    """
+    def __init__(self):
+        self.task = None
+
+    def start(self):
+        """
+        Start counting.
+        """
+        if self.task:
+            return
+
+        QUERY_TRACKER.count_all()
+        self.task = LoopingCall(self.write)
+        self.task.start(settings.SERVER_STATS_INTERVAL, now=True)
+
+    def get_stats(self):
+        """
+        Get current statistics.
+        """
+        return {"time": time.time(),
+                "cpu": time.process_time(),
+                "queries": QUERY_TRACKER.queries,
+                "query_time": QUERY_TRACKER.query_time,
+                "amp": AMP_STATS.info()}
+
+    def write(self):
+        """
+        Write statistics to the file.
+        """
+        filename = get_stats_file()
+        try:
+            with open(filename + ".tmp", "w") as fp:
+                json.dump(self.get_stats(), fp)
+            os.replace(filename + ".tmp", filename)
+        except Exception as e:
+            logger.log_errmsg("Can not write server stats: %s" % e)
+
+
+def get_stats_file():
+    """
+    Get the full path of the stats file.
+    """
+    return os.path.join(settings.LOG_DIR, settings.SERVER_STATS_FILE)
+
+
+def load_stats():
+    """
+    Load the server's last statistics.
+
+    Returns:
+        (dict) statistics, or None if there are no statistics.
+    """
+    try:
+        with open(get_stats_file()) as fp:
+            return json.load(fp)
+    except (IOError, ValueError):
+        return None
+
+
+SERVER_STATS = ServerStats()
+
+
+def start_plugin_services(server):
+    """
+    Called when the server starts.
+    """
+    SERVER_STATS.start()
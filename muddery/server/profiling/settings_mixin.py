@@ -0,0 +1,16 @@
+"""
+Load runner mixin. Add this at the end of the settings file before running
+the load runner, like this:
+
+    from muddery.server.profiling.settings_mixin import *
+
+Note that these mixin-settings are not suitable for production servers!
+"""
+
+# Bots log in quickly with a weak password hasher.
+PASSWORD_HASHERS = ("django.contrib.auth.hashers.MD5PasswordHasher",)
+
+# Count the server's db queries and CPU time.
+SERVER_SERVICES_PLUGIN_MODULES = ["muddery.server.profiling.server_stats"]
+
+LOADRUNNER_MIXIN = True
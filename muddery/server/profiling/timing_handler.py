@@ -0,0 +1,190 @@
+"""
+Timing of commands and hooks.
+
+Timed functions count their calls, total and max time and a histogram of
+their times in TIMING_BUCKETS. Timing is off by default, timed functions only
+check a flag then. Turn it on in settings (TIMING_ENABLED) or at runtime with
+the "timing" command or the world editor's "set_timing" API, see the stats
+with the "timing" command or the "query_timing" API, and dump them to a file
+in the logs directory for offline analysis.
+
+Timed functions are also scopes of the query tracker, see query_tracker.
+
+Usage:
+    @timed("dialogue.get_npc_sentences")
+    def get_npc_sentences(self, caller, npc):
+        ...
+
+    TIMING_HANDLER.add(name, seconds)
+"""
+
+import os
+import json
+import time
+from bisect import bisect_left
+from functools import wraps
+from django.conf import settings
+from muddery.server.profiling.query_tracker import QUERY_TRACKER
+
+
+class TimingRecord(object):
+    """
+    Timing of a function.
+    """
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self, size):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+        # Number of calls in each bucket, the last bucket is of slower calls.
+        self.buckets = [0] * size
+
+
+class TimingHandler(object):
+    """
+    Keep timing records.
+    """
+    def __init__(self):
+        self.enabled = settings.TIMING_ENABLED
+
+        # Upper bounds of buckets in seconds.
+        self.buckets = tuple(bound / 1000.0 for bound in settings.TIMING_BUCKETS)
+
+        # {name: TimingRecord}
+        self.records = {}
+        self.start_time = time.time()
+
+    def enable(self, enabled):
+        """
+        Turn timing on or off.
+        """
+        self.enabled = enabled
+
+    def reset(self):
+        """
+        Clear all records.
+        """
+        self.records = {}
+        self.start_time = time.time()
+
+    def add(self, name, seconds):
+        """
+        Add a call's time.
+
+        Args:
+            name: (string) timed function's name.
+            seconds: (float) time of the call.
+        """
+        record = self.records.get(name)
+        if record is None:
+            record = TimingRecord(len(self.buckets) + 1)
+            self.records[name] = record
+
+        record.count += 1
+        record.total += seconds
+        if seconds > record.max:
+            record.max = seconds
+        record.buckets[bisect_left(self.buckets, seconds)] += 1
+
+    def call(self, name, func, args, kwargs):
+        """
+        Call a function, time it and track its queries if they are on.
+
+        Args:
+            name: (string) the function's name in records.
+            func: (function) the function to call.
+            args: (tuple) the function's args.
+            kwargs: (dict) the function's kwargs.
+        """
+        scope = QUERY_TRACKER.begin(name) if QUERY_TRACKER.enabled else None
+        timing = self.enabled
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if timing:
+                self.add(name, time.perf_counter() - start)
+            if scope:
+                QUERY_TRACKER.end(scope)
+
+    def get_stats(self):
+        """
+        Get all records.
+
+        Returns:
+            (dict) records and their buckets, times are in milliseconds.
+        """
+        records = {}
+        for name, record in list(self.records.items()):
+            records[name] = {"count": record.count,
+                             "total": record.total * 1000,
+                             "mean": record.total * 1000 / record.count if record.count else 0,
+                             "max": record.max * 1000,
+                             "buckets": list(record.buckets)}
+
+        return {"enabled": self.enabled,
+                "start_time": self.start_time,
+                "time": time.time(),
+                "buckets": list(settings.TIMING_BUCKETS),
+                "records": records}
+
+    def format_stats(self, limit=None):
+        """
+        Format records to a text table, the slowest in total first.
+
+        Args:
+            limit: (int) number of records to show, show all if it is None.
+        """
+        records = sorted(self.get_stats()["records"].items(), key=lambda item: item[1]["total"], reverse=True)
+        if limit:
+            records = records[:limit]
+
+        lines = ["Timing is %s, since %ds ago." % ("on" if self.enabled else "off",
+                                                    time.time() - self.start_time),
+                 "%-40s %8s %10s %8s %8s" % ("name", "count", "total ms", "mean ms", "max ms")]
+        for name, record in records:
+            lines.append("%-40s %8d %10.1f %8.2f %8.1f" %
+                         (name[:40], record["count"], record["total"], record["mean"], record["max"]))
+
+        return "\n".join(lines)
+
+    def dump(self, filename=None):
+        """
+        Dump records and tracked queries to a JSON file in the logs directory.
+
+        Args:
+            filename: (string) file's name, use TIMING_DUMP_FILE if it is empty.
+
+        Returns:
+            (string) the file's path.
+        """
+        path = os.path.join(settings.LOG_DIR, os.path.basename(filename or settings.TIMING_DUMP_FILE))
+        with open(path, "w") as fp:
+            stats = self.get_stats()
+            stats["queries"] = QUERY_TRACKER.get_stats()
+            json.dump(stats, fp, indent=1)
+        return path
+
+
+# timing handler
+TIMING_HANDLER = TimingHandler()
+
+
+def timed(name):
+    """
+    A decorator which times calls of the function and tracks their queries
+    if timing or query tracking is on.
+
+    Args:
+        name: (string) the name of the function's records.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not (TIMING_HANDLER.enabled or QUERY_TRACKER.enabled):
+                return func(*args, **kwargs)
+            return TIMING_HANDLER.call(name, func, args, kwargs)
+        return wrapper
+    return decorator
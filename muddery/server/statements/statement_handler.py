@@ -6,6 +6,8 @@ import re, ast, traceback
 from django.conf import settings
 from evennia.utils import logger
 from evennia.utils.utils import class_from_module
+from muddery.server.profiling.timing_handler import TIMING_HANDLER, timed
+from muddery.server.profiling.query_tracker import QUERY_TRACKER
 
 
 #re_words = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)|("(.*)")')
@@ -97,7 +99,9 @@ def exec_function(func_set, func_word, caller, obj, **kwargs):
 
     func_obj = func_class()
     func_obj.set(caller, obj, func_args, **kwargs)
-    return func_obj.func()
+    if not (TIMING_HANDLER.enabled or QUERY_TRACKER.enabled):
+        return func_obj.func()
+    return TIMING_HANDLER.call("statement." + func_key, func_obj.func, (), {})
 
 
 class StatementHandler(object):
@@ -118,6 +122,7 @@ class StatementHandler(object):
         skill_func_set_class = class_from_module(settings.SKILL_FUNC_SET)
         self.skill_func_set = skill_func_set_class()
 
+    @timed("statement.do_action")
     def do_action(self, action, caller, obj, **kwargs):
         """
         Do a function.
@@ -144,6 +149,7 @@ class StatementHandler(object):
 
         return
 
+    @timed("statement.do_skill")
     def do_skill(self, action, caller, obj, **kwargs):
         """
         Do a function.
@@ -173,6 +179,7 @@ class StatementHandler(object):
 
         return results
 
+    @timed("statement.match_condition")
     def match_condition(self, condition, caller, obj, **kwargs):
         """
         Check a condition.
@@ -0,0 +1,241 @@
+import json
+import unittest
+from unittest import mock
+from django.test import TestCase, override_settings
+from evennia.objects.models import ObjectDB
+from evennia.accounts.models import AccountDB
+from evennia.commands.cmdset import CmdSet
+from evennia.commands.command import Command
+from muddery.server.dao.localized_strings import LocalizedStrings
+from muddery.server.profiling.query_tracker import QUERY_TRACKER
+from muddery.server.conf.cmdparser import get_command_table
+from muddery.server.conf import serversession
+from muddery.server.conf.serversession import ServerSession
+from muddery.server.conf.webclient import WebSocketClient
+from muddery.server.dao.object_properties import ObjectProperties
+from muddery.server.utils.localized_strings_handler import LocalizedStringsHandler
+from muddery.server.utils import properties_handler
+from muddery.server.utils import builder
+from muddery.server.dao.worlddata import WorldData
+from muddery.server.utils import data_object_migration
+from muddery.server.typeclasses.data_object import DataPropertiesHandler
+
+
+class TestLocalizedStrings(TestCase):
+
+    def test_load_failed(self):
+        handler = LocalizedStringsHandler()
+        with mock.patch.object(LocalizedStrings, "all", side_effect=Exception("no such table")) as load:
+            # Use origin strings, do not try to load again.
+            self.assertEqual(handler.translate("Object", "typeclasses"), "Object")
+            self.assertEqual(handler.translate("Object", "typeclasses"), "Object")
+            self.assertTrue(handler.load_failed)
+            self.assertEqual(load.call_count, 1)
+
+
+class TestCustomProperties(TestCase):
+
+    def test_load_custom_properties(self):
+        obj = mock.Mock(state={})
+        obj.get_properties_info.return_value = {
+            "max_hp": {"mutable": False, "default": "10"},
+            "hp": {"mutable": True, "default": "max_hp"},
+            "mp": {"mutable": True, "default": "5"},
+        }
+        handler = DataPropertiesHandler(obj)
+
+        records = [mock.Mock(property="max_hp", value="20")]
+        with mock.patch.object(ObjectProperties, "get_properties", return_value=records):
+            properties_handler.load_custom_properties(handler, "obj_key", 1)
+
+        # A mutable default which is another property's key uses its value.
+        self.assertEqual(handler.get("max_hp"), 20)
+        self.assertEqual(handler.get("hp"), 20)
+        self.assertEqual(handler.get("mp"), 5)
+        self.assertEqual(obj.state["prop"], {"hp": 20, "mp": 5})
+
+
+class TestDataObjectMigration(TestCase):
+
+    def old_object(self, **attributes):
+        obj = mock.Mock(spec=ObjectDB)
+        obj.attributes.get.side_effect = attributes.get
+        return obj
+
+    def test_migrate_quests(self):
+        attr = mock.Mock(db_key="current_quests")
+        attr.value = {
+            "quest_1": self.old_object(accomplished={"objective_1": 2}),
+            "quest_2": self.old_object(),
+            "quest_3": None,
+        }
+        data_object_migration.migrate_attribute(attr)
+        self.assertEqual(attr.value, {
+            "quest_1": {"accomplished": {"objective_1": 2}},
+            "quest_2": {"accomplished": {}},
+        })
+
+    def test_migrate_skills(self):
+        attr = mock.Mock(db_key="skills")
+        attr.value = {
+            "skill_1": self.old_object(is_default=1),
+            "skill_2": self.old_object(),
+            "skill_3": {"is_default": False},
+        }
+        data_object_migration.migrate_attribute(attr)
+        self.assertEqual(attr.value, {
+            "skill_1": {"is_default": True},
+            "skill_2": {"is_default": False},
+            "skill_3": {"is_default": False},
+        })
+
+    def test_migrate_goods(self):
+        attr = mock.Mock(db_key="goods")
+        attr.value = {"goods_1": self.old_object()}
+        data_object_migration.migrate_attribute(attr)
+        attr.delete.assert_called_once_with()
+
+    def test_migrated_attribute(self):
+        # Attributes of new versions are not changed.
+        states = {"skill_1": {"is_default": True}}
+        attr = mock.Mock(db_key="skills", value=states)
+        data_object_migration.migrate_attribute(attr)
+        self.assertIs(attr.value, states)
+        attr.delete.assert_not_called()
+
+
+class TestQueryTracker(TestCase):
+
+    def test_scope(self):
+        with QUERY_TRACKER.scope() as outer:
+            ObjectDB.objects.filter(db_key="test").exists()
+            with QUERY_TRACKER.scope() as inner:
+                ObjectDB.objects.filter(db_key="test").exists()
+
+        self.assertEqual(outer.count, 2)
+        self.assertEqual(inner.count, 1)
+        self.assertEqual(len(outer.repeated(2)), 1)
+        self.assertFalse(inner.repeated(2))
+        self.assertEqual(outer.get_tables([ObjectDB, AccountDB]), {"ObjectDB"})
+
+    def test_count_all(self):
+        QUERY_TRACKER.count_all()
+        queries = QUERY_TRACKER.queries
+        ObjectDB.objects.filter(db_key="test").exists()
+        self.assertEqual(QUERY_TRACKER.queries, queries + 1)
+
+
+class CmdLook(Command):
+    key = "look"
+    aliases = ["l"]
+
+
+class CmdGoto(Command):
+    key = "goto"
+
+
+class TestCommandTable(TestCase):
+
+    def test_command_table(self):
+        cmdset = CmdSet()
+        cmdset.add(CmdLook())
+
+        table = get_command_table(cmdset)
+        self.assertIsInstance(table["look"], CmdLook)
+        self.assertNotIn("l", table)
+        self.assertIs(get_command_table(cmdset), table)
+
+        # Changes of the cmdset rebuild the table.
+        cmdset.add(CmdGoto())
+        self.assertIsInstance(get_command_table(cmdset)["goto"], CmdGoto)
+
+        cmdset.remove(CmdGoto)
+        self.assertNotIn("goto", get_command_table(cmdset))
+
+
+class TestServerSession(TestCase):
+
+    def setUp(self):
+        # Webclient sessions are initialized with the "websocket" key.
+        self.session = ServerSession()
+        self.session.init_session("websocket", "127.0.0.1", mock.Mock())
+        self.send = self.session.sessionhandler.server.amp_protocol.send_MsgServer2Portal
+
+    def test_frame(self):
+        self.session.data_out(text={"msg": "hello"}, context="look")
+
+        self.send.assert_called_once()
+        args, frame_kwargs = self.send.call_args[1]["frame"]
+        self.assertEqual(json.loads(args[0]), ["text", [{"data": {"msg": "hello"}, "context": "look"}], {}])
+        self.assertEqual(frame_kwargs, {})
+
+    @unittest.skipUnless(serversession.msgpack, "msgpack is not installed")
+    def test_msgpack_frame(self):
+        self.session.protocol_flags["FRAME_FORMAT"] = "msgpack"
+        self.session.data_out(text={"msg": "hello"})
+
+        args, frame_kwargs = self.send.call_args[1]["frame"]
+        self.assertEqual(serversession.msgpack.unpackb(args[0], raw=False),
+                         ["text", [{"data": {"msg": "hello"}, "context": ""}], {}])
+        self.assertEqual(frame_kwargs, {"binary": True})
+
+
+class TestWebSocketClient(TestCase):
+
+    @override_settings(WEBSOCKET_BINARY_FRAMES=True)
+    @mock.patch("muddery.server.conf.webclient.msgpack", mock.Mock())
+    def test_msgpack_format(self):
+        client = WebSocketClient()
+        self.assertEqual(client.onConnect(mock.Mock(protocols=["msgpack", "json"])), "msgpack")
+        self.assertEqual(client.frame_format, "msgpack")
+
+    @override_settings(WEBSOCKET_BINARY_FRAMES=False)
+    def test_json_format(self):
+        client = WebSocketClient()
+        self.assertEqual(client.onConnect(mock.Mock(protocols=["msgpack", "json"])), "json")
+        self.assertEqual(client.frame_format, "json")
+
+    def test_send_frame(self):
+        client = WebSocketClient()
+        client.sendMessage = mock.Mock()
+
+        client.send_frame('["text", [], {}]')
+        client.sendMessage.assert_called_with(b'["text", [], {}]', isBinary=False)
+
+        client.send_frame(b"\x93", binary=True)
+        client.sendMessage.assert_called_with(b"\x93", isBinary=True)
+
+
+class TestDataChecksum(TestCase):
+
+    def setUp(self):
+        self.tables = {
+            "npc_shops": ["npc", "shop"],
+            "shop_goods": ["shop", "goods", "price"],
+        }
+        self.records = {
+            "npc_shops": [mock.Mock(npc="npc_1", shop="shop_1")],
+            "shop_goods": [mock.Mock(shop="shop_1", goods="goods_1", price=10)],
+        }
+
+    def get_related_data(self):
+        def get_fields(table_name):
+            if table_name not in self.tables:
+                raise Exception("no such table")
+            return self.tables[table_name]
+
+        with mock.patch.object(WorldData, "get_fields", side_effect=get_fields), \
+                mock.patch.object(WorldData, "get_table_all", side_effect=lambda name: self.records[name]):
+            return builder.get_related_data()
+
+    def test_related_data(self):
+        related_data = self.get_related_data()
+
+        # NPCs have their shops' goods.
+        self.assertIn(("shop_goods", ("shop_1", "goods_1", 10)), related_data["npc_1"])
+
+        # Changes of goods change NPCs' checksums.
+        with mock.patch.object(builder, "get_unique_object_data", return_value=("NPC", {"key": "npc_1"})):
+            checksum = builder.get_data_checksum("npc_1", related_data)
+            self.records["shop_goods"][0].price = 20
+            self.assertNotEqual(builder.get_data_checksum("npc_1", self.get_related_data()), checksum)
@@ -13,7 +13,6 @@ from twisted.internet import reactor, task
 from twisted.internet.task import deferLater
 from django.conf import settings
 from evennia.objects.objects import DefaultCharacter
-from evennia import create_script
 from evennia.typeclasses.models import DbHolder
 from evennia.utils import logger, search
 from evennia.utils.utils import lazy_property, class_from_module
@@ -22,14 +21,15 @@ from muddery.server.dao.equipment_positions import EquipmentPositions
 from muddery.server.dao.loot_list import CharacterLootList
 from muddery.server.dao.object_properties import ObjectProperties
 from muddery.server.dao.default_skills import DefaultSkills
-from muddery.server.utils.builder import build_object
+from muddery.server.utils.builder import build_data_object
 from muddery.server.utils.loot_handler import LootHandler
 from muddery.server.utils import defines, utils
 from muddery.server.utils.game_settings import GAME_SETTINGS
 from muddery.server.utils.utils import search_obj_data_key
 from muddery.server.utils.data_field_handler import DataFieldHandler
 from muddery.server.utils.localized_strings_handler import _
-from muddery.server.utils.builder import delete_object
+from muddery.server.combat.combat_manager import COMBAT_MANAGER
+from muddery.server.combat.mob_pool import MOB_POOL
 
 
 class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
@@ -143,7 +143,7 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         delete()d from the database. If this method returns False,
         deletion is aborted.
 
-        All skills, contents will be removed too.
+        All contents will be removed too.
         """
         result = super(MudderyCharacter, self).at_object_delete()
         if not result:
@@ -155,10 +155,6 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         
         # stop auto casting
         self.stop_auto_combat_skill()
-        
-        # delete all skills
-        for skill in self.db.skills.values():
-            skill.delete()
 
         # delete all contents
         for content in self.contents:
@@ -240,7 +236,8 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         # update equipment positions
         self.reset_equip_positions()
 
-        # load default skills
+        # load skills
+        self.load_skills()
         self.load_default_skills()
 
         # load default objects
@@ -461,6 +458,21 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
             if content.dbref in equipped:
                 content.equip_to(self)
 
+    def load_skills(self):
+        """
+        Load character's skills. Skills are data objects, their states are
+        stored in the character's skills attribute.
+        """
+        if not self.attributes.has("skills"):
+            self.db.skills = {}
+        self.skills_state = self.db.skills
+
+        self.skills = {}
+        for key, state in self.skills_state.items():
+            skill = build_data_object(key, self, state)
+            if skill:
+                self.skills[key] = skill
+
     def load_default_skills(self):
         """
         Load character's default skills.
@@ -470,19 +482,26 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         default_skill_ids = set([record.skill for record in skill_records])
 
         # remove old default skills
-        for key, skill in self.db.skills.items():
+        for key in list(self.skills_state.keys()):
+            skill = self.skills.get(key)
             if not skill:
-                del self.db.skills[key]
+                del self.skills_state[key]
             elif skill.is_default() and key not in default_skill_ids:
                 # remove this skill
-                skill.delete()
-                del self.db.skills[key]
+                del self.skills_state[key]
+                del self.skills[key]
 
         # add new default skills
         for skill_record in skill_records:
-            if skill_record.skill not in self.db.skills:
+            if skill_record.skill not in self.skills:
                 self.learn_skill(skill_record.skill, True, True)
 
+    def get_data_object(self, key):
+        """
+        Get a skill by its key.
+        """
+        return self.skills.get(key)
+
     def load_default_objects(self):
         """
         Load character's default objects.
@@ -519,13 +538,15 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         Returns:
             (boolean) learned skill
         """
-        if skill_key in self.db.skills:
+        if skill_key in self.skills:
             self.msg({"msg": _("You have already learned this skill.")})
             return False
 
         # Create skill object.
-        skill_obj = build_object(skill_key)
+        self.skills_state[skill_key] = {}
+        skill_obj = build_data_object(skill_key, self, self.skills_state[skill_key])
         if not skill_obj:
+            del self.skills_state[skill_key]
             self.msg({"msg": _("Can not learn this skill.")})
             return False
 
@@ -535,7 +556,7 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
 
         # Store new skill.
         skill_obj.set_owner(self)
-        self.db.skills[skill_key] = skill_obj
+        self.skills[skill_key] = skill_obj
 
         # If it is a passive skill, player's status may change.
         if skill_obj.passive:
@@ -563,11 +584,11 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
             self.msg({"skill_cast": {"cast": _("Global cooling down!")}})
             return
 
-        if skill_key not in self.db.skills:
+        if skill_key not in self.skills:
             self.msg({"skill_cast": {"cast": _("You do not have this skill.")}})
             return
 
-        skill = self.db.skills[skill_key]
+        skill = self.skills[skill_key]
         cast_result = skill.cast_skill(target)
         if not cast_result:
             return
@@ -624,7 +645,7 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         """
         Cast all passive skills.
         """
-        for skill in self.db.skills.values():
+        for skill in self.skills.values():
             if skill.passive:
                 skill.cast_skill(self)
                 
@@ -704,11 +725,8 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
             logger.log_errmsg("%s is already in battle." % target.dbref)
             return False
 
-        # create a new combat handler
-        chandler = create_script(settings.NORMAL_COMBAT_HANDLER)
-                        
-        # set combat team and desc
-        chandler.set_combat({1: [target], 2: [self]}, desc, 0)
+        # create a new combat
+        COMBAT_MANAGER.create_combat({1: [target], 2: [self]}, desc, 0)
 
         return True
 
@@ -752,7 +770,7 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
 
     def attack_temp_target(self, target_key, target_level=0, desc=""):
         """
-        Attack a temporary clone of a target. This creates a new character object for attack.
+        Attack a temporary clone of a target. The clone is got from the temporary mob pool.
         The origin target will not be affected.
 
         Args:
@@ -770,14 +788,17 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
                 obj = obj[0]
                 target_level = obj.db.level
 
-        # Create a target.
-        target = build_object(target_key, target_level, reset_location=False)
+        # Get a target.
+        target = MOB_POOL.get(target_key, target_level)
         if not target:
             logger.log_errmsg("Can not create the target %s." % target_key)
             return False
 
-        target.is_temp = True
-        return self.attack_target(target, desc)
+        if not self.attack_target(target, desc):
+            MOB_POOL.put(target)
+            return False
+
+        return True
 
     def is_in_combat(self):
         """
@@ -809,10 +830,10 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
             del self.ndb.combat_handler
 
         if self.is_temp:
-            # delete template character and notify its location
+            # put the temporary character back to the pool and notify its location
             location = self.location
 
-            delete_object(self.dbref)
+            MOB_POOL.put(self)
             if location:
                 for content in location.contents:
                     if content.has_account:
@@ -891,6 +912,23 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         Recover properties.
         """
         pass
+
+    def reset_temp(self, level):
+        """
+        Reset a pooled temporary character before it joins a new combat.
+
+        Args:
+            level: (int) the character's new level.
+        """
+        self.set_level(level)
+        self.set_mutable_custom_properties(reset=True)
+
+        for skill in self.skills.values():
+            skill.cd_finish_time = 0
+
+        self.gcd_finish_time = 0
+        self.target = None
+        self.is_temp = True
         
     def get_combat_commands(self):
         """
@@ -900,7 +938,7 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
             (list) available commands for combat
         """
         commands = []
-        for key, skill in self.db.skills.items():
+        for key, skill in self.skills.items():
             if skill.passive:
                 # exclude passive skills
                 continue
@@ -0,0 +1,258 @@
+"""
+Data objects
+
+Data objects are light objects which are not saved in the db, such as quests,
+skills and shop goods. They load their world data from WorldData, which is
+shared by all data objects with the same key, and keep their state in a dict
+stored in their owner's attribute, so they do not add objects to the db and
+the idmapper's cache.
+
+A data object's id is "<owner's dbref>:<data key>", it is used as the dbref of
+the object in messages to the client. Find a data object by its id with
+MudderyBaseObject.search_data_object().
+
+"""
+
+import weakref
+from evennia.utils.utils import lazy_property
+from evennia.typeclasses.models import DbHolder
+from muddery.server.statements.statement_handler import STATEMENT_HANDLER
+from muddery.server.utils.data_field_handler import DataFieldHandler
+from muddery.server.utils import properties_handler
+from muddery.server.utils.desc_handler import DESC_HANDLER
+from muddery.server.typeclasses.base_typeclass import BaseTypeclass
+from muddery.server.mappings.typeclass_set import TYPECLASS
+from muddery.server.dao.worlddata import WorldData
+
+
+class DataPropertiesHandler(object):
+    """
+    This handler manages custom properties of a data object. Mutable
+    properties are stored in the data object's state.
+    """
+    def __init__(self, obj):
+        """
+        Initialized on the data object
+        """
+        self._store = {}
+        self.obj = weakref.proxy(obj)
+        self.info = obj.get_properties_info()
+
+        # Load mutable properties from the state.
+        self._store.update(obj.state.get("prop", {}))
+
+    def has(self, key):
+        """
+        Check if object has this property or not.
+        """
+        return key in self._store
+
+    def get(self, key):
+        """
+        Get the named property's value.
+        """
+        if key not in self._store:
+            raise AttributeError('"%s" does not exist. Please add it to the PROPERTIES_DICT。' % key)
+        return self._store.get(key)
+
+    def add(self, key, value):
+        """
+        Add new key and value.
+        """
+        self._store[key] = value
+        if self.info[key]["mutable"]:
+            if "prop" not in self.obj.state:
+                self.obj.state["prop"] = {}
+            self.obj.state["prop"][key] = value
+
+    def clear(self):
+        """
+        Remove all properties from handler.
+        """
+        self._store = {}
+
+    def all(self, return_tuples=False):
+        """
+        List the contents of the handler.
+        """
+        if return_tuples:
+            return [(key, value) for (key, value) in self._store.items()]
+        return [key for key in self._store]
+
+
+class MudderyDataObject(BaseTypeclass):
+    """
+    The base class of data objects. Its subclasses are typeclasses of world
+    data like other objects, but they are created by build_data_object()
+    instead of build_object().
+    """
+    def __init__(self, key, owner, state=None):
+        """
+        Load the object's data.
+
+        Args:
+            key: (string) the object's data key.
+            owner: (object) the object which keeps this object.
+            state: (dict) the object's state, it must be stored in the owner's
+                attribute to be saved.
+        """
+        self.key = key
+        self.owner = owner
+        self.state = {} if state is None else state
+        self.dbref = "%s:%s" % (owner.dbref, key)
+
+        # Data objects are not in any location.
+        self.location = None
+
+        self.name = ""
+        self.desc = ""
+        self.icon = None
+        self.condition = ""
+        self.action = ""
+
+        self.load_data()
+
+    # initialize all handlers in a lazy fashion
+    @lazy_property
+    def system_data_handler(self):
+        return DataFieldHandler(self)
+
+    @lazy_property
+    def custom_properties_handler(self):
+        return DataPropertiesHandler(self)
+
+    # @property system stores object's system data.
+    def __system_get(self):
+        try:
+            return self._system_holder
+        except AttributeError:
+            self._system_holder = DbHolder(self, "system_data", manager_name='system_data_handler')
+            return self._system_holder
+    system = property(__system_get)
+
+    # @property prop stores object's custom properties.
+    def __prop_get(self):
+        try:
+            return self._custom_holder
+        except AttributeError:
+            self._custom_holder = DbHolder(self, "custom_properties", manager_name='custom_properties_handler')
+            return self._custom_holder
+    prop = property(__prop_get)
+
+    @classmethod
+    def get_models(cls):
+        """
+        Get this typeclass's models. Data objects have the base data of
+        objects as other objects.
+        """
+        if not cls.typeclass_key:
+            return TYPECLASS("OBJECT").get_models()
+        return super(MudderyDataObject, cls).get_models()
+
+    @classmethod
+    def get_properties_info(cls):
+        """
+        Get this typeclass's properties.
+        """
+        if not cls.typeclass_key:
+            return TYPECLASS("OBJECT").get_properties_info()
+        return super(MudderyDataObject, cls).get_properties_info()
+
+    @classmethod
+    def get_event_trigger_types(cls):
+        """
+        Get an object's available event triggers.
+        """
+        return []
+
+    def load_data(self):
+        """
+        Load the object's data from world data.
+        """
+        base_model = TYPECLASS("OBJECT").model_name
+        models = tuple(self.get_models())
+        if base_model not in models:
+            models = (base_model,) + models
+
+        # The merged data is shared by all objects of this key.
+        self.system_data_handler.set_shared(WorldData.get_object_data(models, self.key))
+
+        self.load_custom_properties(getattr(self.system, "level", 0))
+
+        self.after_data_loaded()
+
+    def load_custom_properties(self, level):
+        """
+        Load custom properties.
+        """
+        properties_handler.load_custom_properties(self.custom_properties_handler, self.key, level)
+
+    def after_data_loaded(self):
+        """
+        Called after load_data().
+        """
+        self.name = getattr(self.system, "name", "")
+        self.desc = getattr(self.system, "desc", "")
+        self.icon = getattr(self.system, "icon", None)
+        self.condition = getattr(self.system, "condition", "")
+        self.action = getattr(self.system, "action", "")
+
+    def set_owner(self, owner):
+        """
+        Set the owner of the object.
+        """
+        self.owner = owner
+        self.dbref = "%s:%s" % (owner.dbref, self.key)
+
+    def get_data_key(self, default=""):
+        """
+        Get data's key.
+
+        Args:
+            default: (string) default value if can not find the data key.
+        """
+        return self.key or default
+
+    def get_name(self):
+        """
+        Get the object's name.
+        """
+        return self.name
+
+    def get_desc(self, caller):
+        """
+        This returns object's descriptions on different conditions.
+        """
+        desc_conditions = DESC_HANDLER.get(self.key)
+        if desc_conditions:
+            for item in desc_conditions:
+                if STATEMENT_HANDLER.match_condition(item["condition"], caller, self):
+                    return item["desc"]
+        return self.desc
+
+    def is_visible(self, caller):
+        """
+        If this object is visible to the caller.
+        """
+        if not self.condition:
+            return True
+
+        return STATEMENT_HANDLER.match_condition(self.condition, caller, self)
+
+    def get_available_commands(self, caller):
+        """
+        This returns a list of available commands.
+        """
+        return []
+
+    def get_appearance(self, caller):
+        """
+        This is a convenient hook for a 'look'
+        command to call.
+        """
+        info = {"dbref": self.dbref,
+                "name": self.get_name(),
+                "desc": self.get_desc(caller),
+                "cmds": self.get_available_commands(caller),
+                "icon": self.icon}
+        return info
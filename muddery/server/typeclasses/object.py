@@ -6,7 +6,7 @@ BaseObject is an object which can load it's data automatically.
 
 """
 
-import ast, traceback
+import traceback
 from django.conf import settings
 from evennia.objects.models import ObjectDB
 from evennia.objects.objects import DefaultObject
@@ -16,16 +16,16 @@ from evennia.typeclasses.models import DbHolder
 from muddery.server.statements.statement_handler import STATEMENT_HANDLER
 from muddery.server.events.event_trigger import EventTrigger
 from muddery.server.utils.data_field_handler import DataFieldHandler
+from muddery.server.utils import properties_handler
 from muddery.server.utils.properties_handler import PropertiesHandler
 from muddery.server.utils import utils
 from muddery.server.utils.exception import MudderyError
-from muddery.server.utils.localized_strings_handler import _
+from muddery.server.utils.localized_strings_handler import _, _lazy
 from muddery.server.utils.game_settings import GAME_SETTINGS
 from muddery.server.utils.desc_handler import DESC_HANDLER
 from muddery.server.typeclasses.base_typeclass import BaseTypeclass
 from muddery.server.mappings.typeclass_set import TYPECLASS
 from muddery.server.dao.worlddata import WorldData
-from muddery.server.dao.object_properties import ObjectProperties
 
 
 class MudderyBaseObject(BaseTypeclass, DefaultObject):
@@ -222,17 +222,12 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
             None
         """
         # Get data record.
-        try:
-            fields = WorldData.get_fields(base_model)
-            record = WorldData.get_table_data(base_model, key=key)
-            record = record[0]
-        except Exception as e:
-            logger.log_errmsg("Can not find key %s in %s" % (key, base_model))
+        data = WorldData.get_object_data((base_model,), key)
+        if not data:
             return
 
         # Set data.
-        for field_name in fields:
-            setattr(self.system, field_name, getattr(record, field_name))
+        self.system_data_handler.set_shared(data)
 
     def load_system_data(self, base_model, key):
         """
@@ -245,23 +240,13 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
         Returns:
             None
         """
-        # Get models.
-        for data_model in self.get_models():
-            if data_model == base_model:
-                continue
-
-            # Get data record.
-            try:
-                fields = WorldData.get_fields(data_model)
-                record = WorldData.get_table_data(data_model, key=key)
-                record = record[0]
-            except Exception as e:
-                logger.log_errmsg("Can not find key %s in %s" % (key, data_model))
-                continue
+        # Get records of all models. The merged data is shared by all objects of this key.
+        models = tuple(self.get_models())
+        if base_model not in models:
+            models = (base_model,) + models
 
-            # Set data.
-            for field_name in fields:
-                setattr(self.system, field_name, getattr(record, field_name))
+        # Set data.
+        self.system_data_handler.set_shared(WorldData.get_object_data(models, key))
 
     def load_data(self, level=None, reset_location=True):
         """
@@ -311,49 +296,16 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
         if level is None:
             level = self.db.level
 
-        # Load values from db.
-        values = {}
-        for record in ObjectProperties.get_properties(self.get_data_key(), level):
-            key = record.property
-            serializable_value = record.value
-            if serializable_value == "":
-                value = None
-            else:
-                try:
-                    value = ast.literal_eval(serializable_value)
-                except (SyntaxError, ValueError) as e:
-                    # treat as a raw string
-                    value = serializable_value
-            values[key] = value
-
-        # Set values.
-        for key, info in self.get_properties_info().items():
-            if not info["mutable"]:
-                self.custom_properties_handler.add(key, values.get(key, ast.literal_eval(info["default"])))
+        properties_handler.load_custom_properties(self.custom_properties_handler, self.get_data_key(), level)
 
-        # Set default mutable custom properties.
-        self.set_mutable_custom_properties()
-
-    def set_mutable_custom_properties(self):
+    def set_mutable_custom_properties(self, reset=False):
         """
         Set default mutable custom properties.
+
+        Args:
+            reset: (boolean) reset properties which have values too.
         """
-        for key, info in self.get_properties_info().items():
-            if info["mutable"]:
-                # Set default mutable properties to prop.
-                if not self.custom_properties_handler.has(key):
-                    default = info["default"]
-                    value = ""
-                    if self.custom_properties_handler.has(default):
-                        # User another property'a value
-                        value = self.custom_properties_handler.get(default)
-                    else:
-                        try:
-                            value = ast.literal_eval(default)
-                        except (SyntaxError, ValueError) as e:
-                            # treat as a raw string
-                            value = default
-                    self.custom_properties_handler.add(key, value)
+        properties_handler.set_mutable_custom_properties(self.custom_properties_handler, reset)
 
     def after_data_key_changed(self):
         """
@@ -699,6 +651,41 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
 
         return match
 
+    def search_data_object(self, data_id):
+        """
+        Search a data object, such as a quest or a skill, by its id.
+
+        Args:
+            data_id: (string) the data object's id, "<owner's dbref>:<data key>".
+
+        Returns:
+            The data object or None.
+        """
+        if not isinstance(data_id, str):
+            return None
+
+        owner_dbref, sep, key = data_id.partition(":")
+        if not sep:
+            return None
+
+        owner = ObjectDB.objects.dbref_search(owner_dbref)
+        if not owner or not hasattr(owner, "get_data_object"):
+            return None
+
+        return owner.get_data_object(key)
+
+    def get_data_object(self, key):
+        """
+        Get a data object kept by this object.
+
+        Args:
+            key: (string) the data object's key.
+
+        Returns:
+            The data object or None.
+        """
+        return None
+
     def announce_move_from(self, destination, msg=None, mapping=None, **kwargs):
         """
         Called if the move is to be announced. This is
@@ -726,7 +713,7 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
         if msg:
             string = msg
         else:
-            string = _("{object} is leaving {origin}, heading for {destination}.")
+            string = _lazy("{object} is leaving {origin}, heading for {destination}.")
 
         location = self.location
         exits = [o for o in location.contents if o.location is location and o.destination is destination]
@@ -776,9 +763,9 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
             if msg:
                 string = msg
             else:
-                string = _("{object} arrives to {destination} from {origin}.")
+                string = _lazy("{object} arrives to {destination} from {origin}.")
         else:
-            string = _("{object} arrives to {destination}.")
+            string = _lazy("{object} arrives to {destination}.")
 
         origin = source_location
         destination = self.location
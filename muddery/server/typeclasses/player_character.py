@@ -26,6 +26,7 @@ from muddery.server.dao.worlddata import WorldData
 from muddery.server.dao.default_objects import DefaultObjects
 from muddery.server.mappings.typeclass_set import TYPECLASS
 from muddery.server.utils import defines
+from muddery.server.profiling.timing_handler import timed
 
 
 class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
@@ -164,6 +165,7 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         if self.has_account:
             self.location.event.at_character_move_in(self)
 
+    @timed("character.at_post_puppet")
     def at_post_puppet(self):
         """
         Called just after puppeting has been completed and all
@@ -370,6 +372,7 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
                     
         return {"rooms": rooms, "exits": exits}
 
+    @timed("character.show_location")
     def show_location(self):
         """
         show character's location
@@ -980,11 +983,20 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         """
         skills = []
 
-        for key, skill in self.db.skills.items():
+        for key, skill in self.skills.items():
             skills.append(skill.get_appearance(self))
 
         return skills
 
+    def get_data_object(self, key):
+        """
+        Get a skill or a quest by its key.
+        """
+        obj = super(MudderyPlayerCharacter, self).get_data_object(key)
+        if not obj:
+            obj = self.quest_handler.current_quests.get(key)
+        return obj
+
     def resume_combat(self):
         """
         Resume unfinished combat.
@@ -1,8 +1,9 @@
 """
 Quests
 
-The quest class represents the character's quest. Each quest is a quest object stored
-in the character. It controls quest's objectives.
+The quest class represents the character's quest. Each quest is a data object kept
+by the character, its accomplished objectives are stored in the character's
+current_quests. It controls quest's objectives.
 
 """
 
@@ -18,9 +19,10 @@ from muddery.server.dao.worlddata import WorldData
 from muddery.server.dao.loot_list import QuestLootList
 from muddery.server.dao.quest_objectives import QuestObjectives
 from muddery.server.mappings.typeclass_set import TYPECLASS
+from muddery.server.typeclasses.data_object import MudderyDataObject
 
 
-class MudderyQuest(TYPECLASS("OBJECT")):
+class MudderyQuest(MudderyDataObject):
     """
     This class controls quest's objectives. Hooks are called when a character doing some things.
     """
@@ -33,29 +35,15 @@ class MudderyQuest(TYPECLASS("OBJECT")):
     def loot_handler(self):
         return LootHandler(self, QuestLootList.get(self.get_data_key()))
 
-    def at_object_creation(self):
-        """
-        Set accomplished objectives to empty.
-        """
-        super(MudderyQuest, self).at_object_creation()
-
-        if not self.attributes.has("owner"):
-            self.db.owner = None
-        if not self.attributes.has("accomplished"):
-            self.db.accomplished = {}
-
-    def set_owner(self, owner):
-        """
-        Set the owner of the skill.
-        """
-        self.db.owner = owner
-
     def after_data_loaded(self):
         """
         Load quest's data from db.
         """
         super(MudderyQuest, self).after_data_loaded()
 
+        if "accomplished" not in self.state:
+            self.state["accomplished"] = {}
+
         self.objectives = {}
         self.not_accomplished = {}
         
@@ -75,7 +63,7 @@ class MudderyQuest(TYPECLASS("OBJECT")):
                          "desc": obj_record.desc}
             self.objectives[obj_record.ordinal] = objective
 
-            accomplished = self.db.accomplished.get(key, 0)
+            accomplished = self.state["accomplished"].get(obj_record.ordinal, 0)
             if accomplished < obj_record.number:
                 if not objective_type in self.not_accomplished:
                     self.not_accomplished[objective_type] = [obj_record.ordinal]
@@ -120,7 +108,7 @@ class MudderyQuest(TYPECLASS("OBJECT")):
             else:
                 # Or make a desc by other data.
                 obj_num = objective["number"]
-                accomplished = self.db.accomplished.get(ordinal, 0)
+                accomplished = self.state["accomplished"].get(ordinal, 0)
                 
                 if objective["type"] == defines.OBJECTIVE_TALK:
                     # talking
@@ -193,7 +181,7 @@ class MudderyQuest(TYPECLASS("OBJECT")):
         """
         for ordinal in self.objectives:
             obj_num = self.objectives[ordinal]["number"]
-            accomplished = self.db.accomplished.get(ordinal, 0)
+            accomplished = self.state["accomplished"].get(ordinal, 0)
     
             if accomplished < obj_num:
                 return False
@@ -204,7 +192,7 @@ class MudderyQuest(TYPECLASS("OBJECT")):
         """
         Turn in a quest, do its action.
         """
-        owner = self.db.owner
+        owner = self.owner
 
         # get rewards
         obj_list = self.loot_handler.get_obj_list(owner)
@@ -254,11 +242,11 @@ class MudderyQuest(TYPECLASS("OBJECT")):
                 status_changed = True
 
                 # add accomplished number
-                accomplished = self.db.accomplished.get(ordinal, 0)
+                accomplished = self.state["accomplished"].get(ordinal, 0)
                 accomplished += number
-                self.db.accomplished[ordinal] = accomplished
+                self.state["accomplished"][ordinal] = accomplished
 
-                if self.db.accomplished[ordinal] >= self.objectives[ordinal]["number"]:
+                if accomplished >= self.objectives[ordinal]["number"]:
                     # if this objectives is accomplished, remove it
                     index -= 1
                     del(self.not_accomplished[type][index])
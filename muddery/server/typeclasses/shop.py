@@ -6,7 +6,7 @@ The DialogueHandler maintains a pool of dialogues.
 """
 
 from evennia.utils import logger
-from muddery.server.utils.builder import build_object
+from muddery.server.utils.builder import build_data_object
 from muddery.server.mappings.typeclass_set import TYPECLASS
 from muddery.server.utils.localized_strings_handler import _
 from muddery.server.dao.shop_goods import ShopGoods
@@ -33,27 +33,6 @@ class MudderyShop(TYPECLASS("OBJECT")):
         # set default values
         self.db.owner = None
 
-        if not self.attributes.has("goods"):
-            self.db.goods = {}
-
-    def at_object_delete(self):
-        """
-        Called just before the database object is permanently
-        delete()d from the database. If this method returns False,
-        deletion is aborted.
-
-        All goods will be removed too.
-        """
-        result = super(MudderyShop, self).at_object_delete()
-        if not result:
-            return result
-
-        # delete all goods
-        for goods in self.db.goods.values():
-            goods.delete()
-
-        return True
-
     def after_data_loaded(self):
         """
         Set data_info to the object.
@@ -70,35 +49,29 @@ class MudderyShop(TYPECLASS("OBJECT")):
 
     def load_goods(self):
         """
-        Load shop goods.
+        Load shop goods. Goods are data objects, they are built from world
+        data every time.
         """
         # shops records
         goods_records = ShopGoods.get(self.get_data_key())
 
-        goods_keys = set([record.key for record in goods_records])
-
-        # search current goods
-        current_goods = {}
-        for key, obj in self.db.goods.items():
-            if key in goods_keys:
-                current_goods[key] = obj
-            else:
-                # remove goods that is not in goods_keys
-                obj.delete()
-
-        # add new goods
+        self.goods = {}
         for goods_record in goods_records:
             goods_key = goods_record.key
-            if goods_key not in current_goods:
-                # Create shop_goods object.
-                goods_obj = build_object(goods_key)
-                if not goods_obj:
-                    logger.log_errmsg("Can't create goods: %s" % goods_key)
-                    continue
 
-                current_goods[goods_key] = goods_obj
+            # Create shop_goods object.
+            goods_obj = build_data_object(goods_key, self)
+            if not goods_obj:
+                logger.log_errmsg("Can't create goods: %s" % goods_key)
+                continue
+
+            self.goods[goods_key] = goods_obj
 
-        self.db.goods = current_goods
+    def get_data_object(self, key):
+        """
+        Get a goods by its key.
+        """
+        return self.goods.get(key)
 
     def set_owner(self, owner):
         """
@@ -146,7 +119,7 @@ class MudderyShop(TYPECLASS("OBJECT")):
         goods_list = []
 
         # Get shop goods
-        for obj in self.db.goods.values():
+        for obj in self.goods.values():
             if not obj.available:
                 continue
 
@@ -1,5 +1,6 @@
 """
 Shop goods is the object in shops. They have some special attributes to record goods information.
+Goods are data objects kept by shops, they have no states.
 
 """
 
@@ -7,9 +8,10 @@ from evennia.utils import logger
 from muddery.server.dao.worlddata import WorldData
 from muddery.server.utils.localized_strings_handler import _
 from muddery.server.mappings.typeclass_set import TYPECLASS, TYPECLASS_SET
+from muddery.server.typeclasses.data_object import MudderyDataObject
 
 
-class MudderyShopGoods(TYPECLASS("OBJECT")):
+class MudderyShopGoods(MudderyDataObject):
     """
     This is a shop goods. Shops show these objects to players. It contains a common object
     to sell and additional shop information.
@@ -18,16 +20,6 @@ class MudderyShopGoods(TYPECLASS("OBJECT")):
     typeclass_name = _("Goods", "typeclasses")
     model_name = "shop_goods"
 
-    def at_object_creation(self):
-        """
-        Called once, when this object is first created. This is the
-        normal hook to overload for most object types.
-
-        """
-        super(MudderyShopGoods, self).at_object_creation()
-
-        self.available = False
-
     def after_data_loaded(self):
         """
         Load goods data.
@@ -1,8 +1,8 @@
 """
 Skills
 
-Each skill is a skill object stored in the character. The skill object stores all data and
-actions of a skill.
+Each skill is a data object kept by the character, its state is stored in the character's
+skills. The skill object stores all data and actions of a skill.
 
 """
 
@@ -10,10 +10,11 @@ import time, re
 from muddery.server.utils.localized_strings_handler import _
 from muddery.server.utils.game_settings import GAME_SETTINGS
 from muddery.server.statements.statement_handler import STATEMENT_HANDLER
-from muddery.server.mappings.typeclass_set import TYPECLASS
+from muddery.server.typeclasses.data_object import MudderyDataObject
+from muddery.server.profiling.timing_handler import timed
 
 
-class MudderySkill(TYPECLASS("OBJECT")):
+class MudderySkill(MudderyDataObject):
     """
     A skill of the character.
     """
@@ -35,36 +36,15 @@ class MudderySkill(TYPECLASS("OBJECT")):
         else:
             return "%(" + char + ")s"
 
-    def at_object_creation(self):
+    def __init__(self, key, owner, state=None):
         """
         Set default values.
-
-        Returns:
-            None
-        """
-        super(MudderySkill, self).at_object_creation()
-
-        self.owner = None
-        self.owner_dbref = None
-
-        # set status
-        if not self.attributes.has("owner"):
-            self.db.owner_dbref = None
-        if not self.attributes.has("cd_finish_time"):
-            self.db.cd_finish_time = 0
-        if not self.attributes.has("is_default"):
-            self.db.is_default = False
-
-    def at_init(self):
-        """
-        Load the skill's data.
         """
-        super(MudderySkill, self).at_init()
+        # The cd is not saved, it is reset when the server restarts.
+        self.cd_finish_time = 0
+        self.owner_dbref = owner.dbref
 
-        self.owner = None
-        self.owner_dbref = self.db.owner_dbref
-        if self.owner_dbref:
-            self.owner = self.search_dbref(self.owner_dbref)
+        super(MudderySkill, self).__init__(key, owner, state)
 
     def set_default(self, is_default):
         """
@@ -75,7 +55,7 @@ class MudderySkill(TYPECLASS("OBJECT")):
         Args:
             is_default: (boolean) if the is default or not.
         """
-        self.db.is_default = is_default
+        self.state["is_default"] = is_default
 
     def is_default(self):
         """
@@ -84,7 +64,7 @@ class MudderySkill(TYPECLASS("OBJECT")):
         Returns:
             (boolean) is default or not
         """
-        return self.db.is_default
+        return self.state.get("is_default", False)
 
     def after_data_loaded(self):
         """
@@ -131,15 +111,14 @@ class MudderySkill(TYPECLASS("OBJECT")):
         Returns:
             None
         """
-        self.owner = owner
+        super(MudderySkill, self).set_owner(owner)
         self.owner_dbref = owner.dbref
-        self.db.owner_dbref = owner.dbref
-    
+
         if not self.passive:
             # Set skill cd. Add gcd to new the skill.
             gcd = GAME_SETTINGS.get("global_cd")
             if gcd > 0:
-                self.db.cd_finish_time = time.time() + gcd
+                self.cd_finish_time = time.time() + gcd
 
     def cast_skill(self, target):
         """
@@ -188,7 +167,7 @@ class MudderySkill(TYPECLASS("OBJECT")):
             # set cd
             time_now = time.time()
             if self.cd > 0:
-                self.db.cd_finish_time = time_now + self.cd
+                self.cd_finish_time = time_now + self.cd
 
         # call skill function
         return STATEMENT_HANDLER.do_skill(self.function, self.owner, target)
@@ -224,13 +203,14 @@ class MudderySkill(TYPECLASS("OBJECT")):
 
         return True
 
+    @timed("skill.is_cooling_down")
     def is_cooling_down(self):
         """
         If this skill is cooling down.
         """
         if self.cd > 0:
-            if self.db.cd_finish_time:
-                if time.time() < self.db.cd_finish_time:
+            if self.cd_finish_time:
+                if time.time() < self.cd_finish_time:
                     return True
         return False
 
@@ -241,7 +221,7 @@ class MudderySkill(TYPECLASS("OBJECT")):
         Returns:
             (float) Remain CD in seconds.
         """
-        remain_cd = self.db.cd_finish_time - time.time()
+        remain_cd = self.cd_finish_time - time.time()
         if remain_cd < 0:
             remain_cd = 0
         return remain_cd
@@ -2,10 +2,12 @@
 This module handles importing data from csv files and creating the whole game world from these data.
 """
 
-import traceback
+import traceback, hashlib
 from django.conf import settings
+from django.db import transaction
 from evennia.utils import create, search, logger
 from evennia.comms.models import ChannelDB
+from evennia.objects.models import ObjectDB
 from muddery.server.utils import utils
 from muddery.server.utils.game_settings import GAME_SETTINGS
 from muddery.server.mappings.typeclass_set import TYPECLASS, TYPECLASS_SET
@@ -108,13 +110,45 @@ def build_object(obj_key, level=None, caller=None, reset_location=True):
     return obj
 
 
-def build_unique_objects(objects_data, type_name, caller=None):
+def build_data_object(obj_key, owner, state=None):
+    """
+    Build a data object, such as a quest or a skill. Data objects are not
+    saved in the db, see typeclasses.data_object.
+
+    Args:
+        obj_key: (string) The key of the object.
+        owner: (object) The object which keeps the data object.
+        state: (dict) The data object's state stored in the owner.
+    """
+    record = get_object_record(obj_key)
+    if not record:
+        return
+
+    typeclass = TYPECLASS(record.typeclass)
+    if not typeclass:
+        print("Can not get typeclass of %s." % obj_key)
+        return
+
+    try:
+        obj = typeclass(record.key, owner, state)
+    except Exception as e:
+        ostring = "Can not create data object %s: %s" % (obj_key, e)
+        print(ostring)
+        print(traceback.print_exc())
+        return
+
+    return obj
+
+
+def build_unique_objects(objects_data, type_name, caller=None, related_data=None):
     """
     Build all objects in a model.
 
     Args:
         model_name: (string) The name of the data model.
         caller: (command caller) If provide, running messages will send to the caller.
+        related_data: (dict) related data from get_related_data(), store objects' data
+                      checksums if it is set.
     """
     # new objects
     new_obj_keys = set(record.key for record in objects_data)
@@ -164,6 +198,8 @@ def build_unique_objects(objects_data, type_name, caller=None):
             obj.load_data()
             # put obj to its default location
             obj.reset_location()
+            if related_data is not None:
+                set_data_checksum(obj, obj_key, related_data)
         except Exception as e:
             ostring = "%s can not load data:%s" % (obj.dbref, e)
             print(ostring)
@@ -200,6 +236,8 @@ def build_unique_objects(objects_data, type_name, caller=None):
             try:
                 obj.set_data_key(record.key)
                 utils.set_obj_unique_type(obj, type_name)
+                if related_data is not None:
+                    set_data_checksum(obj, record.key, related_data)
             except Exception as e:
                 ostring = "Can not set data info to obj %s: %s" % (record.key, e)
                 print(ostring)
@@ -215,28 +253,559 @@ def build_unique_objects(objects_data, type_name, caller=None):
         caller.msg(ostring)
 
 
-def build_all(caller=None):
+def prepare_unique_records(objects_data, caller=None):
+    """
+    Prepare records of unique objects in memory before building them.
+
+    Args:
+        objects_data: (list) records of unique objects.
+        caller: (command caller) If provide, running messages will send to the caller.
+
+    Returns:
+        (list) a list of (key, typeclass path, name) tuples.
+    """
+    object_model_name = TYPECLASS("OBJECT").model_name
+
+    prepared = []
+    for record in objects_data:
+        try:
+            object_record = WorldData.get_table_data(object_model_name, key=record.key)
+            object_record = object_record[0]
+            typeclass_path = TYPECLASS_SET.get_module(object_record.typeclass)
+        except Exception as e:
+            ostring = "Can not get the data of %s: %s" % (record.key, e)
+            print(ostring)
+            if caller:
+                caller.msg(ostring)
+            continue
+
+        prepared.append((record.key, typeclass_path, object_record.name))
+
+    return prepared
+
+
+def report_progress(type_name, count, total, caller=None):
+    """
+    Report building progress periodically.
+
+    Args:
+        type_name: (string) unique objects' type.
+        count: (number) number of built objects.
+        total: (number) number of all objects.
+        caller: (command caller) If provide, running messages will send to the caller.
+    """
+    if count % settings.BUILDER_PROGRESS_INTERVAL and count != total:
+        return
+
+    ostring = "Building %s: %d/%d." % (type_name, count, total)
+    print(ostring)
+    if caller:
+        caller.msg(ostring)
+
+
+def bulk_build_unique_objects(objects_data, type_name, built_objects, caller=None, related_data=None):
+    """
+    Build all objects in a model in bulk mode. Objects are created in large
+    transactions and their locations are not set, call reset_built_locations()
+    after all objects are built.
+
+    Args:
+        objects_data: (list) records of unique objects.
+        type_name: (string) unique objects' type.
+        built_objects: (dict) built objects will be put in this dict, {data key: object}.
+        caller: (command caller) If provide, running messages will send to the caller.
+        related_data: (dict) related data from get_related_data(), store objects' data
+                      checksums if it is set.
+    """
+    # Prepare new objects' records.
+    new_records = prepare_unique_records(objects_data, caller)
+
+    # Objects whose records can not be prepared are kept.
+    new_obj_keys = set(record.key for record in objects_data)
+    total = len(new_obj_keys)
+
+    # current objects
+    current_objs = utils.search_obj_unique_type(type_name)
+
+    count_remove = 0
+    count_update = 0
+    count_create = 0
+    count_built = 0
+    batch_size = settings.BUILDER_BATCH_SIZE
+
+    # Remove or update current objects.
+    for start in range(0, len(current_objs), batch_size):
+        with transaction.atomic():
+            for obj in current_objs[start:start + batch_size]:
+                obj_key = obj.get_data_key()
+
+                if obj_key in built_objects or obj_key not in new_obj_keys:
+                    # This object is duplicated or should be removed.
+                    # If default home will be removed, set default home to the Limbo.
+                    if obj.dbref == settings.DEFAULT_HOME:
+                        settings.DEFAULT_HOME = "#2"
+                    obj.delete()
+                    count_remove += 1
+                    continue
+
+                try:
+                    # set data
+                    with transaction.atomic():
+                        obj.load_data(reset_location=False)
+                        if related_data is not None:
+                            set_data_checksum(obj, obj_key, related_data)
+                    count_update += 1
+                except Exception as e:
+                    # The object's data has been rolled back.
+                    obj.flush_from_cache(force=True)
+                    ostring = "%s can not load data:%s" % (obj.dbref, e)
+                    print(ostring)
+                    print(traceback.print_exc())
+                    if caller:
+                        caller.msg(ostring)
+
+                built_objects[obj_key] = obj
+                count_built += 1
+                report_progress(type_name, count_built, total, caller)
+
+    # Create new objects.
+    new_records = [record for record in new_records if record[0] not in built_objects]
+    for start in range(0, len(new_records), batch_size):
+        with transaction.atomic():
+            for key, typeclass_path, name in new_records[start:start + batch_size]:
+                obj = None
+                try:
+                    with transaction.atomic():
+                        obj = create.create_object(typeclass_path, name)
+                        obj.attributes.batch_add(("key", key, settings.DATA_KEY_CATEGORY),
+                                                 ("type", type_name, settings.DATA_KEY_CATEGORY),
+                                                 strattr=True)
+                        obj.load_data(reset_location=False)
+                        obj.after_data_key_changed()
+                        if related_data is not None:
+                            set_data_checksum(obj, key, related_data)
+                    count_create += 1
+                except Exception as e:
+                    if obj:
+                        # The object has been rolled back.
+                        obj.flush_from_cache(force=True)
+                    ostring = "Can not create obj %s: %s" % (key, e)
+                    print(ostring)
+                    print(traceback.print_exc())
+                    if caller:
+                        caller.msg(ostring)
+                    continue
+
+                built_objects[key] = obj
+                count_built += 1
+                report_progress(type_name, count_built, total, caller)
+
+    ostring = "Removed %d object(s). Created %d object(s). Updated %d object(s). Total %d objects.\n"\
+              % (count_remove, count_create, count_update, len(objects_data))
+    print(ostring)
+    if caller:
+        caller.msg(ostring)
+
+
+def reset_built_locations(built_objects, caller=None):
+    """
+    Put built objects to their default locations.
+
+    Args:
+        built_objects: (dict) built objects, {data key: object}.
+        caller: (command caller) If provide, running messages will send to the caller.
+    """
+    objects = list(built_objects.values())
+    batch_size = settings.BUILDER_BATCH_SIZE
+
+    for start in range(0, len(objects), batch_size):
+        with transaction.atomic():
+            for obj in objects[start:start + batch_size]:
+                location = getattr(obj.system, "location", "")
+                location_obj = None
+                if location:
+                    location_obj = built_objects.get(location)
+                    if not location_obj:
+                        location_obj = utils.search_obj_data_key(location)
+                        if not location_obj:
+                            logger.log_errmsg("%s can't find location %s!" % (obj.get_data_key(), location))
+                            continue
+                        location_obj = location_obj[0]
+
+                if obj.location == location_obj or obj == location_obj:
+                    continue
+
+                try:
+                    obj.move_to(location_obj, quiet=True, to_none=True)
+                except Exception as e:
+                    ostring = "%s can not move to %s: %s" % (obj.dbref, location, e)
+                    print(ostring)
+                    if caller:
+                        caller.msg(ostring)
+
+        report_progress("locations", min(start + batch_size, len(objects)), len(objects), caller)
+
+
+def build_all(caller=None, bulk=None):
     """
     Build all objects in the world.
 
     Args:
         caller: (command caller) If provide, running messages will send to the caller.
+        bulk: (boolean) build in bulk mode, use settings.BUILDER_BULK_MODE if it is None.
     """
+    if bulk is None:
+        bulk = settings.BUILDER_BULK_MODE
+
+    # Store objects' data checksums, so build_changed() can skip unchanged objects.
+    related_data = get_related_data()
+
+    if bulk:
+        built_objects = {}
+
+        bulk_build_unique_objects(WorldAreas.all(), "world_areas", built_objects, caller, related_data)
+        bulk_build_unique_objects(WorldRooms.all(), "world_rooms", built_objects, caller, related_data)
+        reset_default_locations()
+
+        # Exits' destinations are rooms, so build them after rooms.
+        bulk_build_unique_objects(WorldExits.all(), "world_exits", built_objects, caller, related_data)
+        bulk_build_unique_objects(WorldObjects.all(), "world_objects", built_objects, caller, related_data)
+        bulk_build_unique_objects(WorldNPCs.all(), "world_npcs", built_objects, caller, related_data)
+
+        # Set locations after all objects are built.
+        reset_built_locations(built_objects, caller)
+        return
+
     # Build areas.
-    build_unique_objects(WorldAreas.all(), "world_areas", caller)
+    build_unique_objects(WorldAreas.all(), "world_areas", caller, related_data)
     
     # Build rooms.
-    build_unique_objects(WorldRooms.all(), "world_rooms", caller)
+    build_unique_objects(WorldRooms.all(), "world_rooms", caller, related_data)
     reset_default_locations()
 
     # Build exits.
-    build_unique_objects(WorldExits.all(), "world_exits", caller)
+    build_unique_objects(WorldExits.all(), "world_exits", caller, related_data)
 
     # Build objects.
-    build_unique_objects(WorldObjects.all(), "world_objects", caller)
+    build_unique_objects(WorldObjects.all(), "world_objects", caller, related_data)
 
     # Build NPCs.
-    build_unique_objects(WorldNPCs.all(), "world_npcs", caller)
+    build_unique_objects(WorldNPCs.all(), "world_npcs", caller, related_data)
+
+
+# Tables of objects' related data and their fields of objects' keys. Changes
+# of these records change the checksums of objects' data.
+RELATED_TABLES = (
+    ("object_properties", "object"),
+    ("default_objects", "character"),
+    ("default_skills", "character"),
+    ("character_loot_list", "provider"),
+    ("creator_loot_list", "provider"),
+    ("npc_dialogues", "npc"),
+    ("npc_shops", "npc"),
+    ("shop_goods", "shop"),
+    ("event_data", "trigger_obj"),
+)
+
+
+def get_related_data():
+    """
+    Get records related to objects grouped by objects' keys. NPCs have the
+    related records of their shops too.
+
+    Returns:
+        (dict) {object's key: [(table's name, record's values), ...]}
+    """
+    related_data = {}
+    npc_shops = []
+    for table_name, key_field in RELATED_TABLES:
+        try:
+            fields = [name for name in WorldData.get_fields(table_name) if name != "id"]
+            records = WorldData.get_table_all(table_name)
+        except Exception as e:
+            logger.log_errmsg("Can not load table %s: %s" % (table_name, e))
+            continue
+
+        for record in records:
+            values = tuple(getattr(record, name) for name in fields)
+            related_data.setdefault(getattr(record, key_field), []).append((table_name, values))
+            if table_name == "npc_shops":
+                npc_shops.append((record.npc, record.shop))
+
+    for npc, shop in npc_shops:
+        related_data[npc].extend(related_data.get(shop, []))
+
+    for values in related_data.values():
+        values.sort(key=repr)
+
+    return related_data
+
+
+def get_unique_object_data(key):
+    """
+    Get an object's world data merged from all its models.
+
+    Args:
+        key: (string) object's key.
+
+    Returns:
+        (tuple) (typeclass, data)
+    """
+    base_model = TYPECLASS("OBJECT").model_name
+    record = WorldData.get_table_data(base_model, key=key)
+    if not record:
+        return None, {}
+
+    typeclass_key = record[0].typeclass
+    models = tuple(TYPECLASS_SET.get_class_modeles(typeclass_key))
+    if base_model not in models:
+        models = (base_model,) + models
+
+    return typeclass_key, WorldData.get_object_data(models, key)
+
+
+def get_data_checksum(key, related_data):
+    """
+    Get the checksum of an object's world data. It covers all the object's
+    models and its records in related tables.
+
+    Args:
+        key: (string) object's key.
+        related_data: (dict) related data from get_related_data().
+
+    Returns:
+        (string) checksum
+    """
+    typeclass_key, data = get_unique_object_data(key)
+    if not data:
+        return None
+
+    content = repr((typeclass_key, sorted(data.items()), related_data.get(key, [])))
+    return hashlib.md5(content.encode("utf-8")).hexdigest()
+
+
+def set_data_checksum(obj, key, related_data):
+    """
+    Store the checksum of an object's world data in the object.
+
+    Args:
+        obj: (object) the object.
+        key: (string) object's key.
+        related_data: (dict) related data from get_related_data().
+    """
+    checksum = get_data_checksum(key, related_data)
+    if checksum:
+        utils.set_obj_data_checksum(obj, checksum)
+
+
+def query_data_key_attributes(attr_key):
+    """
+    Query an attribute in the data key category of all objects in one query.
+
+    Args:
+        attr_key: (string) attribute's key.
+
+    Returns:
+        (dict) {object's id: attribute's value}
+    """
+    values = ObjectDB.objects.filter(db_attributes__db_key=attr_key,
+                                     db_attributes__db_category=settings.DATA_KEY_CATEGORY)\
+                             .values_list("id", "db_attributes__db_strvalue")
+    return dict(values)
+
+
+def query_objects(obj_ids):
+    """
+    Get objects by their ids in batches.
+
+    Args:
+        obj_ids: (list) objects' ids.
+    """
+    obj_ids = list(obj_ids)
+    batch_size = settings.BUILDER_BATCH_SIZE
+    for start in range(0, len(obj_ids), batch_size):
+        for obj in ObjectDB.objects.filter(id__in=obj_ids[start:start + batch_size]):
+            yield obj
+
+
+def diff_unique_objects(objects_data, type_name, current, related_data):
+    """
+    Compare unique objects with their world data.
+
+    Args:
+        objects_data: (list) records of unique objects.
+        type_name: (string) unique objects' type.
+        current: (dict) current objects' stored info, {object's id: (data key, unique type, checksum)}.
+        related_data: (dict) related data from get_related_data().
+
+    Returns:
+        (tuple) (to_create, to_update, to_delete, unchanged)
+            to_create: (list) (key, checksum) of new objects.
+            to_update: (dict) {object's id: (key, checksum)} of changed objects.
+            to_delete: (list) ids of objects to remove.
+            unchanged: (dict) {key: object's id} of unchanged objects.
+    """
+    new_checksums = {}
+    for record in objects_data:
+        checksum = get_data_checksum(record.key, related_data)
+        if checksum is None:
+            logger.log_errmsg("Can not get the data of %s." % record.key)
+            continue
+        new_checksums[record.key] = checksum
+
+    to_update = {}
+    to_delete = []
+    unchanged = {}
+    current_keys = set()
+    for obj_id, (key, unique_type, checksum) in current.items():
+        if unique_type != type_name:
+            continue
+
+        if key in current_keys or key not in new_checksums:
+            # This object is duplicated or should be removed.
+            to_delete.append(obj_id)
+            continue
+
+        current_keys.add(key)
+        if checksum != new_checksums[key]:
+            to_update[obj_id] = (key, new_checksums[key])
+        else:
+            unchanged[key] = obj_id
+
+    to_create = [(key, checksum) for key, checksum in new_checksums.items() if key not in current_keys]
+
+    return to_create, to_update, to_delete, unchanged
+
+
+def build_changed(caller=None):
+    """
+    Rebuild the world, only create, reload, relocate or delete objects whose
+    world data have changed. Objects' data checksums are stored in their
+    attributes to compare with the current world data, objects built without
+    checksums are treated as changed.
+
+    Args:
+        caller: (command caller) If provide, running messages will send to the caller.
+    """
+    related_data = get_related_data()
+
+    # Query stored info of all unique objects at once.
+    types = query_data_key_attributes("type")
+    keys = query_data_key_attributes("key")
+    checksums = query_data_key_attributes("checksum")
+    current = dict((obj_id, (keys.get(obj_id, ""), unique_type, checksums.get(obj_id)))
+                   for obj_id, unique_type in types.items())
+
+    # {data key: object's id} of all unique objects
+    key_ids = {}
+    # {object's id: data key} of objects whose locations should be checked
+    to_locate = {}
+
+    count_remove = 0
+    count_update = 0
+    count_create = 0
+    count_relocate = 0
+
+    all_types = (
+        (WorldAreas, "world_areas"),
+        (WorldRooms, "world_rooms"),
+        (WorldExits, "world_exits"),
+        (WorldObjects, "world_objects"),
+        (WorldNPCs, "world_npcs"),
+    )
+
+    for data_query, type_name in all_types:
+        to_create, to_update, to_delete, unchanged = \
+            diff_unique_objects(data_query.all(), type_name, current, related_data)
+
+        key_ids.update(unchanged)
+        to_locate.update((obj_id, key) for key, obj_id in unchanged.items())
+
+        with transaction.atomic():
+            for obj in query_objects(to_delete):
+                ostring = "Deleting %s" % obj.get_data_key()
+                print(ostring)
+                if caller:
+                    caller.msg(ostring)
+
+                # If default home will be removed, set default home to the Limbo.
+                if obj.dbref == settings.DEFAULT_HOME:
+                    settings.DEFAULT_HOME = "#2"
+                obj.delete()
+                count_remove += 1
+
+            for obj in query_objects(to_update.keys()):
+                key, checksum = to_update[obj.id]
+                try:
+                    obj.load_data(reset_location=False)
+                    utils.set_obj_data_checksum(obj, checksum)
+                    count_update += 1
+                except Exception as e:
+                    # The object's data has been rolled back.
+                    obj.flush_from_cache(force=True)
+                    ostring = "%s can not load data:%s" % (obj.dbref, e)
+                    print(ostring)
+                    print(traceback.print_exc())
+                    if caller:
+                        caller.msg(ostring)
+
+                key_ids[key] = obj.id
+                to_locate[obj.id] = key
+
+            for key, checksum in to_create:
+                ostring = "Creating %s." % key
+                print(ostring)
+                if caller:
+                    caller.msg(ostring)
+
+                obj = build_object(key, caller=caller, reset_location=False)
+                if not obj:
+                    continue
+
+                utils.set_obj_unique_type(obj, type_name)
+                utils.set_obj_data_checksum(obj, checksum)
+                count_create += 1
+
+                key_ids[key] = obj.id
+                to_locate[obj.id] = key
+
+        if type_name == "world_rooms" and (to_create or to_delete):
+            reset_default_locations()
+
+    # Relocate objects which are not in their default locations.
+    obj_ids = list(to_locate.keys())
+    current_locations = {}
+    batch_size = settings.BUILDER_BATCH_SIZE
+    for start in range(0, len(obj_ids), batch_size):
+        current_locations.update(ObjectDB.objects.filter(id__in=obj_ids[start:start + batch_size])
+                                                 .values_list("id", "db_location_id"))
+
+    relocate_ids = []
+    for obj_id, key in to_locate.items():
+        typeclass_key, data = get_unique_object_data(key)
+        if "location" not in data:
+            continue
+
+        location_key = data["location"]
+        if location_key:
+            location_id = key_ids.get(location_key)
+            if location_id is not None and location_id == current_locations.get(obj_id):
+                continue
+        elif current_locations.get(obj_id) is None:
+            continue
+
+        relocate_ids.append(obj_id)
+
+    with transaction.atomic():
+        for obj in query_objects(relocate_ids):
+            obj.reset_location()
+            count_relocate += 1
+
+    ostring = "Removed %d object(s). Created %d object(s). Updated %d object(s). Relocated %d object(s).\n"\
+              % (count_remove, count_create, count_update, count_relocate)
+    print(ostring)
+    if caller:
+        caller.msg(ostring)
 
 
 def reset_default_locations():
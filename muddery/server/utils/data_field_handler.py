@@ -13,14 +13,33 @@ class DataFieldHandler(object):
     It is similar to `NAttributeHandler` and is used
     by the `.data` handler in the same way as `.ndb` does
     for the `NAttributeHandler`.
+
+    Data can be backed by a shared read-only mapping (see `set_shared`), so
+    objects with the same data key do not keep their own copies of the same
+    world data. Values added to the handler are stored in a small overlay of
+    this instance and shadow the shared values.
     """
     def __init__(self, obj):
         """
         Initialized on the object
         """
+        self._shared = {}
         self._store = {}
         self.obj = weakref.proxy(obj)
 
+    def set_shared(self, shared):
+        """
+        Set the shared read-only data of this handler. Overlay values with the
+        same keys are dropped, so the new shared data takes effect.
+
+        Args:
+            shared (Mapping): The shared data. It must not be modified.
+
+        """
+        if self._store:
+            self._store = {key: value for key, value in self._store.items() if key not in shared}
+        self._shared = shared
+
     def has(self, key):
         """
         Check if object has this data or not.
@@ -32,7 +51,7 @@ class DataFieldHandler(object):
             has_data (bool): If Data is set or not.
 
         """
-        return key in self._store
+        return key in self._store or key in self._shared
 
     def get(self, key):
         """
@@ -44,9 +63,15 @@ class DataFieldHandler(object):
         Returns:
             the value of the Data.
         """
-        if key not in self._store:
+        try:
+            return self._store[key]
+        except KeyError:
+            pass
+
+        try:
+            return self._shared[key]
+        except KeyError:
             raise AttributeError
-        return self._store.get(key)
 
     def add(self, key, value):
         """
@@ -64,6 +89,7 @@ class DataFieldHandler(object):
         Remove all NAttributes from handler.
 
         """
+        self._shared = {}
         self._store = {}
 
     def all(self, return_tuples=False):
@@ -80,6 +106,12 @@ class DataFieldHandler(object):
                 setting of `return_tuples`.
 
         """
+        if self._shared:
+            store = dict(self._shared)
+            store.update(self._store)
+        else:
+            store = self._store
+
         if return_tuples:
-            return [(key, value) for (key, value) in self._store.items()]
-        return [key for key in self._store]
+            return [(key, value) for (key, value) in store.items()]
+        return [key for key in store]
@@ -0,0 +1,123 @@
+"""
+Migrate quests, skills and shop goods of old saves to data objects.
+
+Old versions created a db object for every quest, skill and goods, and kept
+them in their owners' attributes. This migration moves the objects' states
+into these attributes and deletes the objects. It is called when the server
+starts, and does nothing if there are no such objects.
+"""
+
+from django.db import transaction
+from evennia.objects.models import ObjectDB
+from evennia.typeclasses.attributes import Attribute
+from evennia.utils import logger
+from evennia.utils.utils import class_from_module
+from muddery.server.typeclasses.data_object import MudderyDataObject
+from muddery.server.typeclasses.character import MudderyCharacter
+from muddery.server.typeclasses.shop import MudderyShop
+
+
+def get_quest_state(obj):
+    """
+    Get the state of an old quest object.
+    """
+    return {"accomplished": dict(obj.attributes.get("accomplished") or {})}
+
+
+def get_skill_state(obj):
+    """
+    Get the state of an old skill object.
+    """
+    return {"is_default": bool(obj.attributes.get("is_default"))}
+
+
+# Owners' attributes which kept old objects, owners' base typeclasses and
+# functions to get the objects' states. Goods have no states, their attribute
+# is removed.
+OWNER_ATTRIBUTES = {
+    "current_quests": (MudderyCharacter, get_quest_state),
+    "skills": (MudderyCharacter, get_skill_state),
+    "goods": (MudderyShop, None),
+}
+
+
+def get_typeclass_paths(base_class):
+    """
+    Get typeclass paths of objects in the db which are subclasses of the base
+    class.
+
+    Args:
+        base_class: (class) the base class.
+    """
+    paths = []
+    for path in ObjectDB.objects.values_list("db_typeclass_path", flat=True).distinct():
+        try:
+            typeclass = class_from_module(path)
+        except Exception:
+            continue
+
+        if isinstance(typeclass, type) and issubclass(typeclass, base_class):
+            paths.append(path)
+
+    return paths
+
+
+def migrate_attribute(attr):
+    """
+    Replace old objects in an owner's attribute with their states.
+
+    Args:
+        attr: (Attribute) the owner's attribute.
+    """
+    value = attr.value
+    if not hasattr(value, "items"):
+        return
+
+    if not [obj for obj in value.values() if obj is None or isinstance(obj, ObjectDB)]:
+        # It has no old objects.
+        return
+
+    get_state = OWNER_ATTRIBUTES[attr.db_key][1]
+    if not get_state:
+        attr.delete()
+        return
+
+    states = {}
+    for key, obj in value.items():
+        if isinstance(obj, ObjectDB):
+            states[key] = get_state(obj)
+        elif obj is not None:
+            states[key] = obj
+
+    attr.value = states
+
+
+def migrate_data_objects():
+    """
+    Migrate old quest, skill and goods objects.
+    """
+    # Typeclasses of data objects.
+    paths = get_typeclass_paths(MudderyDataObject)
+    if not paths:
+        return
+
+    with transaction.atomic():
+        queryset = ObjectDB.objects.filter(db_typeclass_path__in=paths)
+        old_ids = list(queryset.values_list("id", flat=True))
+
+        # Data object typeclasses are not db objects, load these objects as
+        # default objects.
+        queryset.update(db_typeclass_path=ObjectDB.__defaultclasspath__)
+
+        for key, (owner_class, _) in OWNER_ATTRIBUTES.items():
+            owner_paths = get_typeclass_paths(owner_class)
+            attrs = Attribute.objects.filter(db_key=key,
+                                             db_category__isnull=True,
+                                             objectdb__db_typeclass_path__in=owner_paths).distinct()
+            for attr in attrs:
+                migrate_attribute(attr)
+
+        for obj in ObjectDB.objects.filter(id__in=old_ids):
+            obj.delete()
+
+    logger.log_infomsg("Migrated %d quest, skill and goods objects to data objects." % len(old_ids))
@@ -16,6 +16,7 @@ from muddery.server.dao.dialogue_relations import DialogueRelations
 from muddery.server.dao.dialogue_quests import DialogueQuests
 from muddery.server.mappings.quest_status_set import QUEST_STATUS_SET
 from muddery.server.events.event_trigger import EventTrigger
+from muddery.server.profiling.timing_handler import timed
 
 
 class DialogueHandler(object):
@@ -43,6 +44,7 @@ class DialogueHandler(object):
         self.can_close_dialogue = GAME_SETTINGS.get("can_close_dialogue")
         self.dialogue_storage = {}
     
+    @timed("dialogue.load_cache")
     def load_cache(self, dialogue):
         """
         To reduce database accesses, add a cache.
@@ -155,6 +157,7 @@ class DialogueHandler(object):
 
         return
 
+    @timed("dialogue.get_npc_sentences")
     def get_npc_sentences(self, caller, npc):
         """
         Get NPC's sentences that can show to the caller.
@@ -210,6 +213,7 @@ class DialogueHandler(object):
             
         return self.create_output_sentences(sentences, caller, npc)
 
+    @timed("dialogue.get_dialogue_sentences")
     def get_dialogue_sentences(self, caller, npc, dialogue):
         """
         Get current sentence's next sentences.
@@ -233,6 +237,7 @@ class DialogueHandler(object):
         sentences = [dlg["sentences"][0]]
         return self.create_output_sentences(sentences, caller, npc)
 
+    @timed("dialogue.get_next_sentences")
     def get_next_sentences(self, caller, npc, current_dialogue, current_sentence):
         """
         Get current sentence's next sentences.
@@ -403,6 +408,7 @@ class DialogueHandler(object):
         """
         self.dialogue_storage = {}
 
+    @timed("dialogue.have_quest")
     def have_quest(self, caller, npc):
         """
         Check if the npc can provide or finish quests.
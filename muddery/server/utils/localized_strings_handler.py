@@ -1,8 +1,42 @@
 """
 This model translates default strings into localized strings.
+
+Strings of the server's language (settings.LANGUAGE_CODE) come from the
+localized strings table. Other languages in settings.EXTRA_LANGUAGES are
+loaded from their data folders when they are used for the first time, they
+are shared by all sessions.
 """
 
+import os, glob
+from django.conf import settings
+from evennia.utils import logger
 from muddery.server.dao.localized_strings import LocalizedStrings
+from muddery.worldeditor.utils import readers
+
+
+# Categories without localized strings.
+EMPTY_CATEGORY = {}
+
+
+class UnloadedCategories(dict):
+    """
+    Categories before localized strings are loaded. Load localized strings
+    when they are used for the first time.
+    """
+    def __init__(self, handler):
+        super(UnloadedCategories, self).__init__()
+        self.handler = handler
+
+    def get(self, category, default=None):
+        if self.handler.load_failed:
+            # Can not load localized strings, use origin strings until the
+            # handler is reloaded.
+            return default
+
+        self.handler.reload()
+        if self.handler.load_failed:
+            return default
+        return self.handler.categories.get(category, default)
 
 
 class LocalizedStringsHandler(object):
@@ -13,14 +47,23 @@ class LocalizedStringsHandler(object):
         """
         Initialize handler
         """
-        self.loaded = False
+        # Whether the last loading failed, such as before the db is migrated.
+        # It is kept when the handler is cleared.
+        self.load_failed = False
+
         self.clear()
 
     def clear(self):
         """
         Clear data.
         """
-        self.dict = {}
+        # Localized strings compiled into dicts of categories.
+        # {category: {origin: local}}
+        self.categories = UnloadedCategories(self)
+
+        # Categories of other languages.
+        # {locale: {category: {origin: local}}}
+        self.catalogues = {}
 
     def reload(self):
         """
@@ -30,43 +73,205 @@ class LocalizedStringsHandler(object):
 
         # Load localized string model.
         try:
+            categories = {}
             for record in LocalizedStrings.all():
                 # Add db fields to dict. Overwrite system localized strings.
-                self.dict[(record.category, record.origin)] = record.local
+                # Empty local strings are not added, so origin strings are used.
+                if record.local:
+                    categories.setdefault(record.category, {})[record.origin] = record.local
+                elif record.category in categories:
+                    categories[record.category].pop(record.origin, None)
 
-            self.loaded = True
+            self.categories = categories
+            self.load_failed = False
         except Exception as e:
+            self.load_failed = True
             print("Can not load custom localized string: %s" % e)
 
-    def translate(self, origin, category="", default=None):
+    def get_locales(self):
         """
-        Translate origin string to local string.
+        Get all available languages.
+        """
+        return [settings.LANGUAGE_CODE] + [locale for locale in settings.EXTRA_LANGUAGES
+                                           if locale != settings.LANGUAGE_CODE]
+
+    def get_catalogue(self, locale):
         """
-        if not self.loaded:
-            self.reload()
+        Get localized strings of a language, use the server's language if the
+        language is not available.
+
+        Args:
+            locale: (string) language's code.
 
+        Returns:
+            (dict) {category: {origin: local}}
+        """
         try:
-            # Get local string.
-            local = self.dict[(category, origin)]
-            if local:
-                return local
-        except:
+            return self.catalogues[locale]
+        except KeyError:
             pass
 
+        if locale == settings.LANGUAGE_CODE or locale not in settings.EXTRA_LANGUAGES:
+            return self.categories
+
+        self.catalogues[locale] = self.load_catalogue(locale)
+        return self.catalogues[locale]
+
+    def load_catalogue(self, locale):
+        """
+        Load localized strings of a language from its data folders. Game's
+        strings overwrite system strings.
+
+        Args:
+            locale: (string) language's code.
+        """
+        categories = {}
+        for data_path in (os.path.join(settings.MUDDERY_DIR, settings.WORLD_DATA_FOLDER),
+                          os.path.join(settings.GAME_DIR, settings.WORLD_DATA_FOLDER)):
+            path = os.path.join(data_path, settings.LOCALIZED_STRINGS_FOLDER, locale)
+            for file_name in sorted(glob.glob(os.path.join(path, "*.*"))):
+                file_type = os.path.splitext(file_name)[1][1:].lower()
+                try:
+                    lines = readers.read_lines(file_name, file_type)
+                    if not lines:
+                        continue
+
+                    titles = lines[0]
+                    category_index = titles.index("category") if "category" in titles else None
+                    origin_index = titles.index("origin")
+                    local_index = titles.index("local")
+                    for values in lines[1:]:
+                        category = values[category_index] if category_index is not None else ""
+                        if values[local_index]:
+                            categories.setdefault(category, {})[values[origin_index]] = values[local_index]
+                except Exception as e:
+                    logger.log_errmsg("Can not load localized strings %s: %s" % (file_name, e))
+
+        return categories
+
+    def get_category(self, category):
+        """
+        Get all localized strings of a category.
+
+        Args:
+            category: (string) strings' category.
+
+        Returns:
+            (dict) {origin: local}, it must not be modified.
+        """
+        return self.categories.get(category, EMPTY_CATEGORY)
+
+    def translate(self, origin, category="", default=None):
+        """
+        Translate origin string to local string.
+        """
+        local = self.categories.get(category, EMPTY_CATEGORY).get(origin)
+        if local:
+            return local
+
         if default is None:
             # Else return origin string.
             return origin
         else:
             return default
 
+    def translate_locale(self, origin, category="", default=None, locale=None):
+        """
+        Translate origin string to local string of a language.
+        """
+        local = self.get_catalogue(locale).get(category, EMPTY_CATEGORY).get(origin)
+        if local:
+            return local
+
+        if default is None:
+            return origin
+        else:
+            return default
+
+
+class LazyTranslation(object):
+    """
+    A string which is translated when it is sent to a session, so every
+    recipient gets it in the session's language. Translations are cached by
+    languages, a message sent to many sessions is translated once for each
+    language.
+
+    It can be formatted by % or format(), arguments are formatted after
+    translating.
+    """
+    __slots__ = ("origin", "category", "default", "args", "kwargs", "results")
+
+    def __init__(self, origin, category="", default=None, args=None, kwargs=None):
+        self.origin = origin
+        self.category = category
+        self.default = default
+        self.args = args
+        self.kwargs = kwargs
+        self.results = {}
+
+    def __mod__(self, args):
+        return LazyTranslation(self.origin, self.category, self.default, args=args)
+
+    def format(self, *args, **kwargs):
+        return LazyTranslation(self.origin, self.category, self.default, args=args, kwargs=kwargs)
+
+    def translate(self, locale=None):
+        """
+        Get the string of a language.
+
+        Args:
+            locale: (string) language's code, use the server's language if it is None.
+        """
+        try:
+            return self.results[locale]
+        except KeyError:
+            pass
+
+        result = LOCALIZED_STRINGS_HANDLER.translate_locale(self.origin, self.category, self.default, locale)
+        if self.kwargs is not None:
+            args = [translate_value(value, locale) for value in self.args]
+            kwargs = {key: translate_value(value, locale) for key, value in self.kwargs.items()}
+            result = result.format(*args, **kwargs)
+        elif self.args is not None:
+            if isinstance(self.args, tuple):
+                result = result % tuple(translate_value(value, locale) for value in self.args)
+            elif isinstance(self.args, dict):
+                result = result % {key: translate_value(value, locale) for key, value in self.args.items()}
+            else:
+                result = result % translate_value(self.args, locale)
+
+        self.results[locale] = result
+        return result
+
+    def __str__(self):
+        return self.translate()
+
+    def __repr__(self):
+        return repr(self.translate())
+
+
+def translate_value(value, locale):
+    """
+    Translate a value if it is a LazyTranslation.
+    """
+    if isinstance(value, LazyTranslation):
+        return value.translate(locale)
+    return value
+
 
 # main dialogue handler
 LOCALIZED_STRINGS_HANDLER = LocalizedStringsHandler()
 
 
 # translator
-def _(origin, category="", default=None):
+# _(origin, category="", default=None) returns the localized string. It is the
+# handler's bound method, so translating does not add another function call.
+_ = LOCALIZED_STRINGS_HANDLER.translate
+
+
+def _lazy(origin, category="", default=None):
     """
-    This function returns the localized string.
+    Get a string which is translated to the recipient's language when it is
+    sent. Use it in messages sent to many sessions.
     """
-    return LOCALIZED_STRINGS_HANDLER.translate(origin, category, default)
+    return LazyTranslation(origin, category, default)
@@ -2,25 +2,24 @@
 This model localize other models.
 """
 
-from muddery.server.utils.localized_strings_handler import _
-from django.db.models import Model
-from worlddata import models
+from django.apps import apps
+from django.conf import settings
+from muddery.server.utils.localized_strings_handler import LOCALIZED_STRINGS_HANDLER
 
 
 def localize_model_fields():
     """
     Localize models field's verbose name and help text.
     """
-    for model_name in dir(models):
-        # get model classes
-        model = getattr(models, model_name)
-        if type(model) != type(Model):
-            continue
+    for model in apps.get_app_config(settings.WORLD_DATA_APP).get_models():
+        # get the model's localized strings at once
+        names = LOCALIZED_STRINGS_HANDLER.get_category("field_" + model.__name__)
+        help_texts = LOCALIZED_STRINGS_HANDLER.get_category("help_" + model.__name__)
 
         # get model fields
         for field in model._meta.fields:
-            field.verbose_name = _(field.name, "field_" + model.__name__)
-            field.help_text = _(field.name, "help_" + model.__name__, "")
+            field.verbose_name = names.get(field.name) or field.name
+            field.help_text = help_texts.get(field.name) or ""
 
 
 def localize_form_field(form, field_name):
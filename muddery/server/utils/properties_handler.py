@@ -4,7 +4,8 @@ Data are arbitrary data stored in worlddata tables. They are read only.
 """
 
 from builtins import object
-import weakref
+import ast, weakref
+from muddery.server.dao.object_properties import ObjectProperties
 
 
 class PropertiesHandler(object):
@@ -88,3 +89,64 @@ class PropertiesHandler(object):
         if return_tuples:
             return [(key, value) for (key, value) in self._store.items()]
         return [key for key in self._store]
+
+
+def parse_property_value(serializable_value):
+    """
+    Parse a property's value from its string.
+
+    Args:
+        serializable_value: (string) the value's string.
+    """
+    try:
+        return ast.literal_eval(serializable_value)
+    except (SyntaxError, ValueError) as e:
+        # treat as a raw string
+        return serializable_value
+
+
+def load_custom_properties(handler, data_key, level):
+    """
+    Load an object's custom properties to its properties handler.
+
+    Args:
+        handler: (PropertiesHandler) the object's properties handler.
+        data_key: (string) the object's data key.
+        level: (number) the object's level.
+    """
+    # Load values from db.
+    values = {}
+    for record in ObjectProperties.get_properties(data_key, level):
+        if record.value == "":
+            values[record.property] = None
+        else:
+            values[record.property] = parse_property_value(record.value)
+
+    # Set values.
+    for key, info in handler.info.items():
+        if not info["mutable"]:
+            handler.add(key, values.get(key, ast.literal_eval(info["default"])))
+
+    # Set default mutable custom properties.
+    set_mutable_custom_properties(handler)
+
+
+def set_mutable_custom_properties(handler, reset=False):
+    """
+    Set default mutable custom properties.
+
+    Args:
+        handler: (PropertiesHandler) the object's properties handler.
+        reset: (boolean) reset properties which have values too.
+    """
+    for key, info in handler.info.items():
+        if info["mutable"]:
+            # Set default mutable properties to prop.
+            if reset or not handler.has(key):
+                default = info["default"]
+                if handler.has(default):
+                    # User another property'a value
+                    value = handler.get(default)
+                else:
+                    value = parse_property_value(default)
+                handler.add(key, value)
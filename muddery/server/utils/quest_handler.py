@@ -1,9 +1,12 @@
 """
 QuestHandler handles a character's quests.
+
+Quests are data objects, their states are stored in the character's
+current_quests as {<quest's key>: <quest's state>}.
 """
 
 from evennia.utils import logger
-from muddery.server.utils.builder import build_object
+from muddery.server.utils.builder import build_data_object
 from muddery.server.statements.statement_handler import STATEMENT_HANDLER
 from muddery.server.utils.localized_strings_handler import _
 from muddery.server.utils.exception import MudderyError
@@ -24,9 +27,16 @@ class QuestHandler(object):
         Initialize handler
         """
         self.owner = owner
-        self.current_quests = owner.db.current_quests
+        self.quests_state = owner.db.current_quests
         self.finished_quests = owner.db.finished_quests
 
+        # Build quest objects from their states.
+        self.current_quests = {}
+        for quest_key, state in self.quests_state.items():
+            quest = build_data_object(quest_key, owner, state)
+            if quest:
+                self.current_quests[quest_key] = quest
+
     def accept(self, quest_key):
         """
         Accept a quest.
@@ -41,11 +51,12 @@ class QuestHandler(object):
             return
 
         # Create quest object.
-        new_quest = build_object(quest_key)
+        self.quests_state[quest_key] = {}
+        new_quest = build_data_object(quest_key, self.owner, self.quests_state[quest_key])
         if not new_quest:
+            del self.quests_state[quest_key]
             return
 
-        new_quest.set_owner(self.owner)
         self.current_quests[quest_key] = new_quest
 
         self.owner.msg({"msg": _("Accepted quest {C%s{n.") % new_quest.get_name()})
@@ -58,9 +69,8 @@ class QuestHandler(object):
         
         It will be called when quests' owner will be deleted.
         """
-        for quest_key in self.current_quests:
-            self.current_quests[quest_key].delete()
-        self.current_quests = []
+        self.quests_state.clear()
+        self.current_quests = {}
 
     def give_up(self, quest_key):
         """
@@ -79,7 +89,7 @@ class QuestHandler(object):
         if quest_key not in self.current_quests:
             raise MudderyError(_("Can not find this quest."))
 
-        self.current_quests[quest_key].delete()
+        del(self.quests_state[quest_key])
         del(self.current_quests[quest_key])
 
         if quest_key in self.finished_quests:
@@ -110,7 +120,7 @@ class QuestHandler(object):
         self.current_quests[quest_key].turn_in()
 
         # Delete the quest.
-        self.current_quests[quest_key].delete()
+        del (self.quests_state[quest_key])
         del (self.current_quests[quest_key])
 
         self.finished_quests.add(quest_key)
@@ -260,7 +270,7 @@ class QuestHandler(object):
         for quest in self.current_quests.values():
             info = {"dbref": quest.dbref,
                     "name": quest.name,
-                    "desc": quest.db.desc,
+                    "desc": quest.desc,
                     "objectives": quest.return_objectives(),
                     "accomplished": quest.is_accomplished()}
             quests.append(info)
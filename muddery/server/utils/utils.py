@@ -13,6 +13,7 @@ from django.conf import settings
 from evennia.utils import search, logger
 from muddery.launcher import configs
 from muddery.server.dao.localized_strings import LocalizedStrings
+from muddery.server.profiling.timing_handler import timed
 
 
 def get_muddery_version():
@@ -34,6 +35,7 @@ def set_obj_data_key(obj, key):
     obj.attributes.add("key", key, category=settings.DATA_KEY_CATEGORY, strattr=True)
 
 
+@timed("utils.search_obj_data_key")
 def search_obj_data_key(key):
     """
     Search objects which have the given key.
@@ -66,6 +68,17 @@ def set_obj_unique_type(obj, type):
     obj.attributes.add("type", type, category=settings.DATA_KEY_CATEGORY, strattr=True)
 
 
+def set_obj_data_checksum(obj, checksum):
+    """
+    Set the checksum of the object's world data.
+
+    Args:
+        obj: (object) object to be set
+        checksum: (string) checksum of the object's data.
+    """
+    obj.attributes.add("checksum", checksum, category=settings.DATA_KEY_CATEGORY, strattr=True)
+
+
 def search_obj_unique_type(type):
     """
     Search objects which have the given unique type.
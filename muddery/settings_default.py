@@ -121,6 +121,20 @@ SERVER_SERVICES_PLUGIN_MODULES = []
 # It will be called last in the startup sequence.
 PORTAL_SERVICES_PLUGIN_MODULES = []
 
+# Websocket protocol of the webclient.
+WEBSOCKET_PROTOCOL_CLASS = "muddery.server.conf.webclient.WebSocketClient"
+
+# Accept permessage-deflate compression of websocket frames. The window of
+# 2^13 bytes and memory level 6 use 64KB of each connection (256KB by zlib's
+# default), and compress messages nearly as well.
+WEBSOCKET_DEFLATE_ENABLED = True
+WEBSOCKET_DEFLATE_WINDOW_BITS = 13
+WEBSOCKET_DEFLATE_MEM_LEVEL = 6
+
+# Send MessagePack binary frames to webclients which ask for them. Needs the
+# msgpack package.
+WEBSOCKET_BINARY_FRAMES = True
+
 # Module holding MSSP meta data. This is used by MUD-crawlers to determine
 # what type of game you are running, how many players you have etc.
 MSSP_META_MODULE = "muddery.server.conf.mssp"
@@ -135,11 +149,61 @@ LOCK_FUNC_MODULES = ("evennia.locks.lockfuncs",)
 # Module holding handlers for managing incoming data from the client. These
 # will be loaded in order, meaning functions in later modules may overload
 # previous ones if having the same name.
-INPUT_FUNC_MODULES = ["evennia.server.inputfuncs"]
+INPUT_FUNC_MODULES = ["evennia.server.inputfuncs", "muddery.server.conf.inputfuncs"]
+
+# Run JSON commands from command tables of callers' states without merging
+# cmdsets. Commands in cmdsets of objects, exits and channels, and commands
+# added to cmdsets at runtime, are only found by text commands or by JSON
+# commands which are not in the tables.
+COMMAND_TABLE_DISPATCH = False
 
 # Modules that contain prototypes for use with the spawner mechanism.
 PROTOTYPE_MODULES = []
 
+# Rate of JSON commands to log in COMMAND_LOG_FILE (in the logs directory).
+# All commands are logged in DEBUG mode.
+COMMAND_LOG_RATE = 0
+COMMAND_LOG_FILE = "commands.log"
+
+# Settings module of the load runner (muddery --loadrunner <N>), it defines
+# bots' personas, think times and the test's duration.
+LOADRUNNER_SETTINGS_MODULE = "muddery.server.profiling.loadrunner_settings"
+
+# If muddery.server.profiling.server_stats is in SERVER_SERVICES_PLUGIN_MODULES,
+# the server writes its CPU time and db queries to SERVER_STATS_FILE (in the
+# logs directory) every this number of seconds, for the load runner to report.
+SERVER_STATS_INTERVAL = 5
+SERVER_STATS_FILE = "server_stats.json"
+
+# Time commands and hooks (see muddery.server.profiling.timing_handler). It
+# can be turned on or off at runtime with the "timing" command.
+TIMING_ENABLED = False
+
+# Upper bounds of timing histogram's buckets in milliseconds.
+TIMING_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Number of the slowest records shown by the "timing" command.
+TIMING_SHOW_LIMIT = 30
+
+# Default file (in the logs directory) to dump timing records.
+TIMING_DUMP_FILE = "timing.json"
+
+# Count db queries of each command and timed hook, and log offenders in
+# QUERY_LOG_FILE (in the logs directory), see
+# muddery.server.profiling.query_tracker. It can be turned on or off at
+# runtime with the "timing queries on/off" command.
+QUERY_TRACKING = False
+
+# A command or hook is logged if it runs more queries than the budget, or runs
+# the same SQL for this number of times or more.
+QUERY_BUDGET = 20
+QUERY_REPEAT_LIMIT = 5
+
+# Number of frames in stack summaries of repeated queries.
+QUERY_STACK_DEPTH = 6
+
+QUERY_LOG_FILE = "queries.log"
+
 # Delay to use before sending the evennia.syscmdkeys.CMD_LOGINSTART Command
 # when a new session connects (this defaults the unloggedin-look for showing
 # the connection screen). The delay is useful mainly for telnet, to allow
@@ -150,6 +214,19 @@ PROTOTYPE_MODULES = []
 # Set this to 0 to send initial data to the client when its first login.
 DELAY_CMD_LOGINSTART = 0
 
+# Compression of data between the Server and the Portal. Setting up zlib costs
+# more than compressing short messages, so messages shorter than the threshold
+# (in bytes) are sent uncompressed. The codec can be "zlib", "lz4" (needs the
+# lz4 package) or "none".
+AMP_COMPRESSION_CODEC = "zlib"
+AMP_COMPRESSION_LEVEL = 1
+AMP_COMPRESSION_THRESHOLD = 512
+
+# Send all messages produced in one reactor iteration to the Portal in one AMP
+# command, up to AMP_COALESCE_MAX_MESSAGES messages.
+AMP_COALESCE_MESSAGES = True
+AMP_COALESCE_MAX_MESSAGES = 500
+
 ######################################################################
 # Inlinefunc
 ######################################################################
@@ -419,9 +496,21 @@ LOCALIZED_STRINGS_FOLDER = "languages"
 # Localized string model's name
 LOCALIZED_STRINGS_MODEL = "localized_strings"
 
+# Languages can be selected by sessions besides LANGUAGE_CODE, such as
+# ["zh-cn", "zh-tw"]. Their strings are loaded from the language folders in
+# LOCALIZED_STRINGS_FOLDER.
+EXTRA_LANGUAGES = []
+
 # World data API's url path.
 WORLD_EDITOR_API_PATH = "worldeditor/api"
 
+# Max number of requests in a batch request of the world editor's API.
+EDITOR_BATCH_SIZE_LIMIT = 50
+
+# Rate of the world editor's requests to log with their time costs. All
+# requests are logged with their numbers of db queries in DEBUG mode.
+EDITOR_REQUEST_LOG_RATE = 0
+
 
 ###################################
 # permissions
@@ -440,6 +529,60 @@ DEFUALT_LIST_TEMPLATE = "common_list.html"
 
 DEFUALT_FORM_TEMPLATE = "common_form.html"
 
+# Max number of records in a page of the world editor's tables.
+EDITOR_PAGE_SIZE_LIMIT = 1000
+
+# Max number of cached record counts of the world editor's tables.
+EDITOR_COUNT_CACHE_SIZE = 1000
+
+# Fields with more choices than this are edited with autocomplete inputs
+# instead of sending all choices in forms.
+EDITOR_CHOICES_LIMIT = 1000
+
+# Max number of choices returned by an autocomplete query.
+EDITOR_AUTOCOMPLETE_LIMIT = 20
+
+# Import data files in bulk mode. Records are validated in memory and
+# inserted in batches in one transaction.
+IMPORT_BULK_MODE = True
+
+# Number of records inserted in one statement in bulk mode.
+IMPORT_BATCH_SIZE = 1000
+
+# Size of chunks when uploading files to the world editor.
+EDITOR_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Remove unfinished uploads after they have not been updated for this
+# number of seconds.
+EDITOR_UPLOAD_EXPIRE = 24 * 60 * 60
+
+# Number of finished import jobs to keep their results.
+EDITOR_IMPORT_JOBS_KEEP = 20
+
+# Number of worker processes to parse world data files in parallel when
+# importing local data files from the command line. Tables are still written
+# to the db by one process. Files are parsed while they are imported if it is
+# 1. Imports in the world editor never use worker processes.
+WORLD_DATA_WORKERS = 1
+
+# Number of records read from the db at a time when exporting data files.
+# Downloads are streamed to the client after each chunk.
+EXPORT_CHUNK_SIZE = 2000
+
+
+###################################
+# world builder
+###################################
+# Build the world in bulk mode. Objects are created in large transactions
+# and their locations are set after all objects are built.
+BUILDER_BULK_MODE = False
+
+# Number of objects handled in one transaction in bulk mode.
+BUILDER_BATCH_SIZE = 500
+
+# Report building progress after building this number of objects in bulk mode.
+BUILDER_PROGRESS_INTERVAL = 1000
+
 
 ###################################
 # combat settings
@@ -449,6 +592,14 @@ NORMAL_COMBAT_HANDLER = "muddery.server.combat.normal_combat_handler.NormalComba
 
 AUTO_COMBAT_TIMEOUT = 60
 
+# Combats are kept in memory. Save unfinished combats when the server reloads
+# and resume them when it starts again.
+COMBAT_RESUMABLE = False
+
+# Number of idle temporary mobs of each data key kept for later combats.
+# Temporary mobs are deleted after combats if it is 0.
+TEMP_MOB_POOL_SIZE = 10
+
 
 ###################################
 # AI modules
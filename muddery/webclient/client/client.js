@@ -66,7 +66,8 @@ MudderyClient.prototype = {
         
         if (type == "out") {
             try {
-                var decode = JSON.parse(msg);
+                // Messages in websocket frames have been decoded.
+                var decode = (typeof(msg) == "object") ? msg : JSON.parse(msg);
                 
                 if (typeof(decode) == "object") {
                     // Json object.
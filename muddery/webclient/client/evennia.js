@@ -230,6 +230,7 @@ An "emitter" object must have a function
         var websocket = null;
         var wsurl = settings.wsurl;
         var csessid = settings.csessid;
+        var decoder = null;
 
         var connect = function() {
             if (websocket && !(websocket.readyState == websocket.CLOSED || websocket.readyState == websocket.CLOSING)) {
@@ -237,7 +238,14 @@ An "emitter" object must have a function
                 return;
             }
             // Important - we pass csessid tacked on the url
-            websocket = new WebSocket(wsurl + '?' + csessid);
+            if (settings.binary_frames && window.MsgPackDecoder && window.DataView) {
+                // Ask for MessagePack frames, the server uses JSON if it can not send them.
+                websocket = new WebSocket(wsurl + '?' + csessid, ["msgpack", "json"]);
+            }
+            else {
+                websocket = new WebSocket(wsurl + '?' + csessid);
+            }
+            websocket.binaryType = "arraybuffer";
 
             // Handle Websocket open event
             websocket.onopen = function (event) {
@@ -271,7 +279,16 @@ An "emitter" object must have a function
                 }
                 // Parse the incoming data, send to emitter
                 // Incoming data is on the form [cmdname, args, kwargs]
-                data = JSON.parse(data);
+                if (typeof data === 'string') {
+                    data = JSON.parse(data);
+                }
+                else {
+                    // Binary frames are in MessagePack.
+                    if (!decoder) {
+                        decoder = new MsgPackDecoder();
+                    }
+                    data = decoder.decode(data);
+                }
                 Evennia.emit(data[0], data[1], data[2]);
             };
         }
@@ -6,6 +6,9 @@ var settings = {
     wsurl: "ws://" + window.location.hostname + ":8001",
 
     csessid: false,
+
+    // ask the server for MessagePack binary frames
+    binary_frames: false,
         
     // resource's url
     resource_url: window.location.protocol + "//" + window.location.host + "/media/",
@@ -0,0 +1,163 @@
+
+/***************************************
+ *
+ * Decode MessagePack binary frames.
+ *
+ ***************************************/
+MsgPackDecoder = function() {
+}
+
+MsgPackDecoder.prototype = {
+    text_decoder: window.TextDecoder ? new TextDecoder("utf-8") : null,
+
+    // Decode MessagePack data.
+    // args:
+    //      buffer - an ArrayBuffer of data.
+    decode: function(buffer) {
+        this.view = new DataView(buffer);
+        this.bytes = new Uint8Array(buffer);
+        this.pos = 0;
+
+        var value = this.read();
+        this.view = null;
+        this.bytes = null;
+        return value;
+    },
+
+    read: function() {
+        var type = this.bytes[this.pos++];
+
+        if (type < 0x80) {
+            // positive fixint
+            return type;
+        }
+        else if (type < 0x90) {
+            // fixmap
+            return this.read_map(type & 0x0f);
+        }
+        else if (type < 0xa0) {
+            // fixarray
+            return this.read_array(type & 0x0f);
+        }
+        else if (type < 0xc0) {
+            // fixstr
+            return this.read_str(type & 0x1f);
+        }
+        else if (type >= 0xe0) {
+            // negative fixint
+            return type - 0x100;
+        }
+
+        var value;
+        switch (type) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xc4: return this.read_bin(this.read_uint(1));
+            case 0xc5: return this.read_bin(this.read_uint(2));
+            case 0xc6: return this.read_bin(this.read_uint(4));
+            case 0xca:
+                value = this.view.getFloat32(this.pos);
+                this.pos += 4;
+                return value;
+            case 0xcb:
+                value = this.view.getFloat64(this.pos);
+                this.pos += 8;
+                return value;
+            case 0xcc: return this.read_uint(1);
+            case 0xcd: return this.read_uint(2);
+            case 0xce: return this.read_uint(4);
+            case 0xcf: return this.read_uint(8);
+            case 0xd0: return this.read_int(1);
+            case 0xd1: return this.read_int(2);
+            case 0xd2: return this.read_int(4);
+            case 0xd3: return this.read_int(8);
+            case 0xd9: return this.read_str(this.read_uint(1));
+            case 0xda: return this.read_str(this.read_uint(2));
+            case 0xdb: return this.read_str(this.read_uint(4));
+            case 0xdc: return this.read_array(this.read_uint(2));
+            case 0xdd: return this.read_array(this.read_uint(4));
+            case 0xde: return this.read_map(this.read_uint(2));
+            case 0xdf: return this.read_map(this.read_uint(4));
+        }
+
+        throw new Error("Unknown MessagePack type: " + type);
+    },
+
+    read_uint: function(size) {
+        var value;
+        if (size == 1) {
+            value = this.view.getUint8(this.pos);
+        }
+        else if (size == 2) {
+            value = this.view.getUint16(this.pos);
+        }
+        else if (size == 4) {
+            value = this.view.getUint32(this.pos);
+        }
+        else {
+            // Numbers larger than 2^53 lose precision.
+            value = this.view.getUint32(this.pos) * 0x100000000 + this.view.getUint32(this.pos + 4);
+        }
+        this.pos += size;
+        return value;
+    },
+
+    read_int: function(size) {
+        var value;
+        if (size == 1) {
+            value = this.view.getInt8(this.pos);
+        }
+        else if (size == 2) {
+            value = this.view.getInt16(this.pos);
+        }
+        else if (size == 4) {
+            value = this.view.getInt32(this.pos);
+        }
+        else {
+            // Numbers larger than 2^53 lose precision.
+            value = this.view.getInt32(this.pos) * 0x100000000 + this.view.getUint32(this.pos + 4);
+        }
+        this.pos += size;
+        return value;
+    },
+
+    read_str: function(size) {
+        var bytes = this.bytes.subarray(this.pos, this.pos + size);
+        this.pos += size;
+
+        if (this.text_decoder) {
+            return this.text_decoder.decode(bytes);
+        }
+
+        // Decode UTF-8 without TextDecoder.
+        var str = "";
+        for (var i = 0; i < bytes.length; i++) {
+            str += "%" + ("0" + bytes[i].toString(16)).slice(-2);
+        }
+        return decodeURIComponent(str);
+    },
+
+    read_bin: function(size) {
+        var bytes = this.bytes.slice(this.pos, this.pos + size);
+        this.pos += size;
+        return bytes;
+    },
+
+    read_array: function(size) {
+        var array = new Array(size);
+        for (var i = 0; i < size; i++) {
+            array[i] = this.read();
+        }
+        return array;
+    },
+
+    read_map: function(size) {
+        var map = {};
+        for (var i = 0; i < size; i++) {
+            var key = this.read();
+            map[key] = this.read();
+        }
+        return map;
+    },
+};
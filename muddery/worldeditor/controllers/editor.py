@@ -8,7 +8,7 @@ from evennia.server.sessionhandler import SESSIONS
 from muddery.worldeditor.services import data_query, data_edit, general_query
 from muddery.server.utils.exception import MudderyError, ERR
 from muddery.worldeditor.utils.response import success_response
-from muddery.server.utils.builder import build_all
+from muddery.server.utils.builder import build_all, build_changed
 from muddery.worldeditor.controllers.base_request_processer import BaseRequestProcesser
 from muddery.worldeditor.dao import general_query_mapper
 from muddery.server.mappings.event_action_set import EVENT_ACTION_SET
@@ -52,10 +52,17 @@ class QueryFields(BaseRequestProcesser):
 
 class QueryTable(BaseRequestProcesser):
     """
-    Query all records of a table.
+    Query records of a table.
 
     Args:
-        None.
+        table: (string) table's name.
+        page: (dict, optional) page arguments, query all records if it is empty.
+            offset: (number) the position of the first record.
+            limit: (number) max number of records.
+            filters: (dict, optional) {field: value} records whose field contains the value.
+            search: (string, optional) records whose any field contains the value.
+            sort: (string, optional) the field to sort by.
+            order: (string, optional) "asc" or "desc".
     """
     path = "query_table"
     name = ""
@@ -65,8 +72,9 @@ class QueryTable(BaseRequestProcesser):
             raise MudderyError(ERR.missing_args, 'Missing the argument: "table".')
 
         table_name = args["table"]
+        page = args.get("page", None)
 
-        data = general_query.query_table(table_name)
+        data = general_query.query_table(table_name, page)
         return success_response(data)
 
 
@@ -76,6 +84,8 @@ class QueryTypeclassTable(BaseRequestProcesser):
 
     Args:
         typeclass: (string) typeclass's key.
+        page: (dict, optional) page arguments, query all records if it is empty.
+              See QueryTable.
     """
     path = "query_typeclass_table"
     name = ""
@@ -85,9 +95,10 @@ class QueryTypeclassTable(BaseRequestProcesser):
             raise MudderyError(ERR.missing_args, 'Missing the argument: "typeclass".')
 
         typeclass_key = args["typeclass"]
+        page = args.get("page", None)
 
         # Query data.
-        data = data_query.query_typeclass_table(typeclass_key)
+        data = data_query.query_typeclass_table(typeclass_key, page)
         return success_response(data)
 
 
@@ -113,6 +124,30 @@ class QueryRecord(BaseRequestProcesser):
         return success_response(data)
 
 
+class QueryChoices(BaseRequestProcesser):
+    """
+    Query choices of a field by text, for fields which have too many choices.
+
+    Args:
+        provider: (string) choice provider's name.
+        text: (string) text to search.
+        limit: (number, optional) max number of choices.
+    """
+    path = "query_choices"
+    name = ""
+
+    def func(self, args, request):
+        if 'provider' not in args:
+            raise MudderyError(ERR.missing_args, 'Missing the argument: "provider".')
+
+        provider = args["provider"]
+        text = args.get("text", "")
+        limit = args.get("limit", None)
+
+        data = data_query.query_choices(provider, text, limit)
+        return success_response(data)
+
+
 class QueryAreas(BaseRequestProcesser):
     """
     Query all available areas.
@@ -847,10 +882,11 @@ class QueryTables(BaseRequestProcesser):
 
 class ApplyChanges(BaseRequestProcesser):
     """
-    Query all tables' names.
+    Apply world data changes to the game world and restart the server.
 
     Args:
-        None.
+        full: (boolean, optional) rebuild all objects, otherwise only rebuild
+              objects whose data have changed.
     """
     path = "apply_changes"
     name = ""
@@ -867,7 +903,10 @@ class ApplyChanges(BaseRequestProcesser):
             WorldData.reload()
 
             # rebuild the world
-            build_all()
+            if args and args.get("full", False):
+                build_all()
+            else:
+                build_changed()
 
             # restart the server
             SESSIONS.announce_all("Server restarting ...")
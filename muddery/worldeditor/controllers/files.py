@@ -7,7 +7,9 @@ from PIL import Image
 from django.conf import settings
 from evennia.utils import logger
 from muddery.worldeditor.services import exporter, importer
-from muddery.worldeditor.utils.response import success_response, file_response
+from muddery.worldeditor.services.chunked_uploads import CHUNKED_UPLOADS
+from muddery.worldeditor.services.import_jobs import IMPORT_JOBS
+from muddery.worldeditor.utils.response import success_response, file_response, stream_response
 from muddery.server.utils.exception import MudderyError, ERR
 from muddery.worldeditor.utils import writers
 from muddery.worldeditor.controllers.base_request_processer import BaseRequestProcesser
@@ -119,6 +121,134 @@ class upload_single_data(BaseRequestProcesser):
         return success_response("success")
 
 
+class begin_upload(BaseRequestProcesser):
+    """
+    Begin to upload a file in chunks. If the same file has been partly
+    uploaded, the upload is resumed from its received size.
+
+    Args:
+        args:
+            name: (string) file's name.
+            size: (number) file's size.
+            checksum: (number) file's CRC32 checksum.
+    """
+    path = "begin_upload"
+    name = ""
+
+    def func(self, args, request):
+        if 'name' not in args:
+            raise MudderyError(ERR.missing_args, 'Missing the argument: "name".')
+
+        if 'size' not in args:
+            raise MudderyError(ERR.missing_args, 'Missing the argument: "size".')
+
+        if 'checksum' not in args:
+            raise MudderyError(ERR.missing_args, 'Missing the argument: "checksum".')
+
+        upload = CHUNKED_UPLOADS.begin(args["name"], int(args["size"]), int(args["checksum"]))
+        return success_response(upload.info())
+
+
+class upload_chunk(BaseRequestProcesser):
+    """
+    Upload a chunk of a file.
+
+    Args:
+        args:
+            upload: (string) upload's id.
+            offset: (number) chunk's position in the file.
+            checksum: (number) chunk's CRC32 checksum.
+    """
+    path = "upload_chunk"
+    name = ""
+
+    def func(self, args, request):
+        file_obj = request.FILES.get("file", None)
+
+        if not file_obj:
+            raise MudderyError(ERR.missing_args, 'Missing the chunk.')
+
+        if 'upload' not in args:
+            raise MudderyError(ERR.missing_args, 'Missing the argument: "upload".')
+
+        if 'offset' not in args:
+            raise MudderyError(ERR.missing_args, 'Missing the argument: "offset".')
+
+        if 'checksum' not in args:
+            raise MudderyError(ERR.missing_args, 'Missing the argument: "checksum".')
+
+        upload = CHUNKED_UPLOADS.write(args["upload"], int(args["offset"]), file_obj.read(), int(args["checksum"]))
+        return success_response(upload.info())
+
+
+class import_upload(BaseRequestProcesser):
+    """
+    Import an uploaded file in the background.
+
+    Args:
+        args:
+            upload: (string) upload's id.
+            kind: (string) "zip": a zip package of data, "table": a table's data file.
+            table: (string, optional) data table's name, default is the file's name.
+    """
+    path = "import_upload"
+    name = ""
+
+    def func(self, args, request):
+        if 'upload' not in args:
+            raise MudderyError(ERR.missing_args, 'Missing the argument: "upload".')
+
+        upload = CHUNKED_UPLOADS.pop(args["upload"])
+
+        if args.get("kind") == "table":
+            filename, ext_name = os.path.splitext(upload.name)
+            table_name = args.get("table", None) or filename
+            file_type = ext_name[1:].lower() if ext_name else ""
+            job = IMPORT_JOBS.add(upload, table_name, file_type)
+        else:
+            job = IMPORT_JOBS.add(upload)
+
+        return success_response(job.info())
+
+
+class query_import_job(BaseRequestProcesser):
+    """
+    Query an import job's progress.
+
+    Args:
+        args:
+            job: (string) job's id.
+    """
+    path = "query_import_job"
+    name = ""
+
+    def func(self, args, request):
+        if 'job' not in args:
+            raise MudderyError(ERR.missing_args, 'Missing the argument: "job".')
+
+        job = IMPORT_JOBS.get(args["job"])
+        return success_response(job.info())
+
+
+class cancel_import_job(BaseRequestProcesser):
+    """
+    Cancel an import job, all its changes will be rolled back.
+
+    Args:
+        args:
+            job: (string) job's id.
+    """
+    path = "cancel_import_job"
+    name = ""
+
+    def func(self, args, request):
+        if 'job' not in args:
+            raise MudderyError(ERR.missing_args, 'Missing the argument: "job".')
+
+        job = IMPORT_JOBS.cancel(args["job"])
+        return success_response(job.info())
+
+
 class download_zip(BaseRequestProcesser):
     """
     Download a zip package of data.
@@ -134,19 +264,15 @@ class download_zip(BaseRequestProcesser):
         file_type = args.get("type", "csv")
 
         # get data's zip
-        fp = tempfile.TemporaryFile()
         try:
-            exporter.export_zip_all(fp, file_type)
-            fp.seek(0)
-
-            filename = time.strftime("worlddata_%Y%m%d_%H%M%S.zip", time.localtime())
-            return file_response(fp, filename)
+            stream = exporter.stream_zip_all(file_type)
         except Exception as e:
-            if fp:
-                fp.close()
             logger.log_tracemsg("Download error: %s" % e)
             raise MudderyError(ERR.download_error, "Download file error: %s" % e)
 
+        filename = time.strftime("worlddata_%Y%m%d_%H%M%S.zip", time.localtime())
+        return stream_response(stream, filename)
+
 
 class download_resources(BaseRequestProcesser):
     """
@@ -197,19 +323,15 @@ class download_single_data(BaseRequestProcesser):
         if not writer_class:
             raise MudderyError(ERR.download_error, "Unknown file type: %s" % file_type)
 
-        # Get tempfile's name.
-        temp_name = tempfile.mktemp()
-        exporter.export_file(temp_name, table_name, file_type)
-        fp = open(temp_name, "rb")
         try:
-            filename = table_name + "." + writer_class.file_ext
-            return file_response(fp, filename)
+            stream = exporter.stream_file(table_name, file_type)
         except Exception as e:
-            if fp:
-                fp.close()
             logger.log_tracemsg("Download error: %s" % e)
             raise MudderyError(ERR.download_error, "Download file error: %s" % e)
 
+        filename = table_name + "." + writer_class.file_ext
+        return stream_response(stream, filename)
+
 
 class query_data_file_types(BaseRequestProcesser):
     """
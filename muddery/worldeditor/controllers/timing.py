@@ -0,0 +1,61 @@
+"""
+Timing of the server's commands and hooks.
+"""
+
+from muddery.server.utils.exception import MudderyError, ERR
+from muddery.worldeditor.utils.response import success_response
+from muddery.worldeditor.controllers.base_request_processer import BaseRequestProcesser
+from muddery.server.profiling.timing_handler import TIMING_HANDLER
+from muddery.server.profiling.query_tracker import QUERY_TRACKER
+
+
+class QueryTiming(BaseRequestProcesser):
+    """
+    Query all timing records and tracked queries. Times are in milliseconds.
+
+    Args:
+        None.
+    """
+    path = "query_timing"
+    name = ""
+
+    def func(self, args, request):
+        data = TIMING_HANDLER.get_stats()
+        data["queries"] = QUERY_TRACKER.get_stats()
+        return success_response(data)
+
+
+class SetTiming(BaseRequestProcesser):
+    """
+    Control the timing and query tracking.
+
+    Args:
+        enabled: (boolean, optional) turn timing on or off.
+        queries: (boolean, optional) turn query tracking on or off.
+        reset: (boolean, optional) clear all records.
+        dump: (string, optional) dump all records to a file in the logs folder.
+    """
+    path = "set_timing"
+    name = ""
+
+    def func(self, args, request):
+        if not args:
+            raise MudderyError(ERR.missing_args, 'Missing arguments.')
+
+        if "enabled" in args:
+            TIMING_HANDLER.enable(bool(args["enabled"]))
+
+        if "queries" in args:
+            QUERY_TRACKER.enable(bool(args["queries"]))
+
+        if args.get("reset"):
+            TIMING_HANDLER.reset()
+            QUERY_TRACKER.reset()
+
+        data = {"enabled": TIMING_HANDLER.enabled,
+                "queries": QUERY_TRACKER.enabled}
+        if "dump" in args:
+            filename = args["dump"] if isinstance(args["dump"], str) else None
+            data["file"] = TIMING_HANDLER.dump(filename)
+
+        return success_response(data)
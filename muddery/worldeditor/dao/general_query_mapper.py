@@ -5,7 +5,9 @@ Query and deal common tables.
 from django.apps import apps
 from django.conf import settings
 from django.db import connections
+from django.db.models import Q
 from django.core.exceptions import ObjectDoesNotExist
+from muddery.worldeditor.utils.table_versions import TABLE_VERSIONS
 
 
 def get_all_fields(table_name):
@@ -32,6 +34,63 @@ def get_all_records(table_name):
     return model_obj.objects.all()
 
 
+def get_records_page(table_name, columns, filters=None, search=None, sort=None, order="asc", offset=0, limit=None):
+    """
+    Query a page of a table's records. Filtering, searching and sorting are
+    done by the db.
+
+    Args:
+        table_name: (string) db table's name.
+        columns: (list) columns to query.
+        filters: (dict) {column: value} records whose column contains the value.
+        search: (string) records whose any column contains the value.
+        sort: (string) the column to sort by.
+        order: (string) "asc" or "desc".
+        offset: (number) the position of the first record.
+        limit: (number) max number of records, query all records if it is None.
+
+    Returns:
+        (list) a list of value tuples
+    """
+    records = filter_records_by_text(table_name, columns, filters, search)
+
+    if sort:
+        records = records.order_by(("-" if order == "desc" else "") + sort, "id")
+    else:
+        records = records.order_by("id")
+
+    records = records.values_list(*columns)
+    if limit is None:
+        return records[offset:]
+    return records[offset:offset + limit]
+
+
+def filter_records_by_text(table_name, columns, filters=None, search=None):
+    """
+    Filter a table's records by text.
+
+    Args:
+        table_name: (string) db table's name.
+        columns: (list) columns can be searched.
+        filters: (dict) {column: value} records whose column contains the value.
+        search: (string) records whose any column contains the value.
+    """
+    # get model
+    model_obj = apps.get_model(settings.WORLD_DATA_APP, table_name)
+    records = model_obj.objects.all()
+
+    if filters:
+        records = records.filter(**{column + "__icontains": value for column, value in filters.items()})
+
+    if search:
+        condition = Q()
+        for column in columns:
+            condition |= Q(**{column + "__icontains": search})
+        records = records.filter(condition)
+
+    return records
+
+
 def filter_records(table_name, **kwargs):
     """
     Filter records by conditions.
@@ -104,6 +163,7 @@ def delete_record_by_id(table_name, record_id):
     model_obj = apps.get_model(settings.WORLD_DATA_APP, table_name)
     record = model_obj.objects.get(id=record_id)
     record.delete()
+    TABLE_VERSIONS.update(table_name)
 
 
 def delete_record_by_key(table_name, object_key):
@@ -118,6 +178,7 @@ def delete_record_by_key(table_name, object_key):
     model_obj = apps.get_model(settings.WORLD_DATA_APP, table_name)
     record = model_obj.objects.get(key=object_key)
     record.delete()
+    TABLE_VERSIONS.update(table_name)
 
 
 def delete_records(table_name, **kwargs):
@@ -130,7 +191,9 @@ def delete_records(table_name, **kwargs):
     """
     # get model
     model_obj = apps.get_model(settings.WORLD_DATA_APP, table_name)
-    return model_obj.objects.filter(**kwargs).delete()
+    result = model_obj.objects.filter(**kwargs).delete()
+    TABLE_VERSIONS.update(table_name)
+    return result
 
 
 def get_all_from_tables(tables):
@@ -200,3 +263,171 @@ def get_tables_record_by_key(tables, key):
         return dict(zip(columns, record))
     else:
         raise ObjectDoesNotExist
+
+
+def get_records_from_tables(tables, key):
+    """
+    Query an object's records from tables with one query. Records of other
+    tables are joined to the first table's record.
+
+    Args:
+        tables: (list) table's list.
+        key: (string) object's key.
+
+    Return:
+        (dict) {table: record}, the record is None if it does not exist.
+    """
+    connection = connections[settings.WORLD_DATA_APP]
+    quote_name = connection.ops.quote_name
+    models = [apps.get_model(settings.WORLD_DATA_APP, table) for table in tables]
+    full_names = [model._meta.db_table for model in models]
+
+    # join tables
+    select = ", ".join("%s.%s" % (full_name, quote_name(field.column))
+                       for model, full_name in zip(models, full_names) for field in model._meta.concrete_fields)
+    from_tables = full_names[0] + "".join(" left join %s on %s.%s=%s.%s" %
+                                          (full_name, full_names[0], quote_name("key"), full_name, quote_name("key"))
+                                          for full_name in full_names[1:])
+    query = "select %s from %s where %s.%s=%%s" % (select, from_tables, full_names[0], quote_name("key"))
+    cursor = connection.cursor()
+    cursor.execute(query, [key])
+    values = cursor.fetchone()
+
+    records = dict((table, None) for table in tables)
+    if values is None:
+        return records
+
+    # split values to records
+    pos = 0
+    for table, model in zip(tables, models):
+        fields = model._meta.concrete_fields
+        record_values = values[pos:pos + len(fields)]
+        pos += len(fields)
+
+        if record_values[fields.index(model._meta.pk)] is None:
+            # does not have this record
+            continue
+
+        record_values = [convert_db_value(connection, field, value) for field, value in zip(fields, record_values)]
+        records[table] = model.from_db(settings.WORLD_DATA_APP,
+                                       [field.attname for field in fields],
+                                       record_values)
+
+    return records
+
+
+def convert_db_value(connection, field, value):
+    """
+    Convert a value from a raw query to the field's value, like querying
+    from the model.
+    """
+    expression = field.get_col(field.model._meta.db_table)
+    converters = connection.ops.get_db_converters(expression) + expression.get_db_converters(connection)
+    for converter in converters:
+        value = converter(value, expression, connection)
+    return value
+
+
+def get_tables_conditions(tables, columns, filters=None, search=None):
+    """
+    Get the sql of joined tables and conditions.
+
+    Args:
+        tables: (list) table's list.
+        columns: (dict) {column: table} columns can be searched and their tables.
+        filters: (dict) {column: value} records whose column contains the value.
+        search: (string) records whose any column contains the value.
+
+    Return:
+        (tuple) tables' sql, conditions' sql, params
+    """
+    connection = connections[settings.WORLD_DATA_APP]
+    full_names = dict((table, settings.WORLD_DATA_APP + "_" + table) for table in tables)
+    first_table = full_names[tables[0]]
+
+    def column_name(column):
+        return "%s.%s" % (full_names[columns[column]], connection.ops.quote_name(column))
+
+    # join tables
+    from_tables = ", ".join(full_names[table] for table in tables)
+    conditions = [first_table + ".key=" + full_names[table] + ".key" for table in tables[1:]]
+    params = []
+
+    if filters:
+        for column, value in filters.items():
+            conditions.append("%s LIKE %%s" % column_name(column))
+            params.append("%" + value + "%")
+
+    if search:
+        conditions.append("(" + " OR ".join("%s LIKE %%s" % column_name(column) for column in columns) + ")")
+        params.extend(["%" + search + "%"] * len(columns))
+
+    return from_tables, " and ".join(conditions) or "1=1", params
+
+
+def count_from_tables(tables, columns, filters=None, search=None):
+    """
+    Count objects' records in tables.
+
+    Args:
+        tables: (list) table's list.
+        columns: (dict) {column: table} columns can be searched and their tables.
+        filters: (dict) {column: value} records whose column contains the value.
+        search: (string) records whose any column contains the value.
+
+    Return:
+        (number) number of records
+    """
+    from_tables, conditions, params = get_tables_conditions(tables, columns, filters, search)
+    query = "select count(*) from %s where %s" % (from_tables, conditions)
+    cursor = connections[settings.WORLD_DATA_APP].cursor()
+    cursor.execute(query, params)
+    return cursor.fetchone()[0]
+
+
+def get_page_from_tables(tables, columns, filters=None, search=None, sort=None, order="asc", offset=0, limit=None):
+    """
+    Query a page of objects' records from tables. Filtering, searching and
+    sorting are done by the db.
+
+    Args:
+        tables: (list) table's list.
+        columns: (dict) {column: table} columns to query and their tables.
+        filters: (dict) {column: value} records whose column contains the value.
+        search: (string) records whose any column contains the value.
+        sort: (string) the column to sort by.
+        order: (string) "asc" or "desc".
+        offset: (number) the position of the first record.
+        limit: (number) max number of records, query all records if it is None.
+
+    Return:
+        a dict of values.
+    """
+    connection = connections[settings.WORLD_DATA_APP]
+    from_tables, conditions, params = get_tables_conditions(tables, columns, filters, search)
+
+    first_table = settings.WORLD_DATA_APP + "_" + tables[0]
+    select = ", ".join("%s_%s.%s" % (settings.WORLD_DATA_APP, table, connection.ops.quote_name(column))
+                       for column, table in columns.items())
+
+    order_by = first_table + ".id"
+    if sort:
+        order_by = "%s_%s.%s %s, %s" % (settings.WORLD_DATA_APP,
+                                        columns[sort],
+                                        connection.ops.quote_name(sort),
+                                        "desc" if order == "desc" else "asc",
+                                        order_by)
+
+    query = "select %s from %s where %s order by %s" % (select, from_tables, conditions, order_by)
+    if limit is not None:
+        query += " limit %d offset %d" % (limit, offset)
+
+    cursor = connections[settings.WORLD_DATA_APP].cursor()
+    cursor.execute(query, params)
+    names = list(columns.keys())
+
+    # return records
+    record = cursor.fetchone()
+    while record is not None:
+        yield dict(zip(names, record))
+        record = cursor.fetchone()
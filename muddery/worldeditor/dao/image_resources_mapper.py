@@ -5,6 +5,7 @@ Query and deal common tables.
 from evennia.utils import logger
 from django.apps import apps
 from django.conf import settings
+from muddery.worldeditor.utils.table_versions import TABLE_VERSIONS
 
 
 class ImageResourcesMapper(object):
@@ -48,6 +49,7 @@ class ImageResourcesMapper(object):
         data = self.model(**record)
         data.full_clean()
         data.save()
+        TABLE_VERSIONS.update(self.model_name)
 
 
 IMAGE_RESOURCES = ImageResourcesMapper()
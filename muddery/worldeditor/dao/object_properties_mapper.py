@@ -7,6 +7,7 @@ from django.apps import apps
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from muddery.server.utils.exception import MudderyError, ERR
+from muddery.worldeditor.utils.table_versions import TABLE_VERSIONS
 
 
 class ObjectPropertiesMapper(object):
@@ -63,6 +64,8 @@ class ObjectPropertiesMapper(object):
                 data = self.model(**record)
                 data.save()
 
+        TABLE_VERSIONS.update(self.model_name)
+
     def delete_properties(self, object, level):
         """
         Delete object's properties.
@@ -71,7 +74,9 @@ class ObjectPropertiesMapper(object):
             object: (string) object's key.
             level: (number) object's level.
         """
-        return self.objects.filter(object=object, level=level).delete()
+        result = self.objects.filter(object=object, level=level).delete()
+        TABLE_VERSIONS.update(self.model_name)
+        return result
 
 
 OBJECT_PROPERTIES = ObjectPropertiesMapper()
@@ -19,26 +19,31 @@ class WorldExitsMapper(object):
         self.objects = self.model.objects
         self.object_model_name = TYPECLASS("OBJECT").model_name
 
-    def exits_of_rooms(self, rooms):
+    def exits_of_area(self, area_key):
         """
-        Get all exits in rooms
+        Get all exits whose locations or destinations are rooms in the area.
 
         Args:
-            rooms: (list) a list of room's keys.
+            area_key: (string) an area's key.
         """
-        query_rooms = ",".join(["'%s'" % room for room in rooms])
+        connection = connections[settings.WORLD_DATA_APP]
+        quote_name = connection.ops.quote_name
 
         # Get table's full name
         object_table = settings.WORLD_DATA_APP + "_" + self.object_model_name
         exit_table = settings.WORLD_DATA_APP + "_" + self.model_name
-
-        # query
-        query = "select * from %(object)s, %(exit)s where %(object)s.key=%(exit)s.key and\
-                    (%(exit)s.location in (%(rooms)s) or %(exit)s.destination in (%(rooms)s))"\
-                    % {"object": object_table, "exit": exit_table, "rooms": query_rooms}
-        cursor = connections[settings.WORLD_DATA_APP].cursor()
-        cursor.execute(query)
-        columns = [col[0] for col in cursor.description]
+        room_table = settings.WORLD_DATA_APP + "_" + TYPECLASS("ROOM").model_name
+
+        # query, both the exit's location and destination are indexed
+        rooms = "select %(room)s.%(key)s from %(room)s where %(room)s.location=%%s" %\
+                {"room": room_table, "key": quote_name("key")}
+        query = "select %(object)s.%(key)s, %(object)s.typeclass, %(exit)s.location, %(exit)s.destination "\
+                "from %(object)s join %(exit)s on %(object)s.%(key)s=%(exit)s.%(key)s "\
+                "where %(exit)s.location in (%(rooms)s) or %(exit)s.destination in (%(rooms)s)" %\
+                {"object": object_table, "exit": exit_table, "key": quote_name("key"), "rooms": rooms}
+        cursor = connection.cursor()
+        cursor.execute(query, [area_key, area_key])
+        columns = ("key", "typeclass", "location", "destination")
 
         # return records
         record = cursor.fetchone()
@@ -5,6 +5,7 @@ Query and deal common tables.
 from django.apps import apps
 from django.conf import settings
 from django.db import connections
+from django.db.models import Case, When, Value, CharField
 from muddery.server.mappings.typeclass_set import TYPECLASS
 from muddery.server.utils.exception import MudderyError, ERR
 
@@ -26,16 +27,20 @@ class WorldRoomsMapper(object):
         Args:
             area_key: (string) an area's key.
         """
+        connection = connections[settings.WORLD_DATA_APP]
+        quote_name = connection.ops.quote_name
+
         # Get table's full name
         object_table = settings.WORLD_DATA_APP + "_" + self.object_model_name
         room_table = settings.WORLD_DATA_APP + "_" + self.model_name
 
         # query
-        query = "select * from %(object)s, %(room)s where %(object)s.key=%(room)s.key and %(room)s.location=%%s"\
-                    % {"object": object_table, "room": room_table}
-        cursor = connections[settings.WORLD_DATA_APP].cursor()
+        query = "select %(object)s.%(key)s, %(object)s.typeclass, %(object)s.name, %(room)s.location, "\
+                "%(room)s.position, %(room)s.icon from %(object)s join %(room)s on %(object)s.%(key)s=%(room)s.%(key)s "\
+                "where %(room)s.location=%%s" % {"object": object_table, "room": room_table, "key": quote_name("key")}
+        cursor = connection.cursor()
         cursor.execute(query, [area_key])
-        columns = [col[0] for col in cursor.description]
+        columns = ("key", "typeclass", "name", "location", "position", "icon")
 
         # return records
         record = cursor.fetchone()
@@ -43,5 +48,30 @@ class WorldRoomsMapper(object):
             yield dict(zip(columns, record))
             record = cursor.fetchone()
 
+    def update_positions(self, positions):
+        """
+        Set rooms' positions. Rooms are updated in one statement, or several
+        statements if there are too many rooms for a statement's params.
+
+        Args:
+            positions: (dict) {room's key: room's position}
+
+        Returns:
+            (number) the number of updated rooms.
+        """
+        connection = connections[settings.WORLD_DATA_APP]
+
+        # every room takes three params: the key in the condition, the key and the position in the case
+        keys = list(positions.keys())
+        batch_size = max(connection.ops.bulk_batch_size(["key", "key", "position"], keys), 1)
+
+        updated = 0
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i:i + batch_size]
+            cases = [When(key=key, then=Value(positions[key])) for key in batch]
+            updated += self.objects.filter(key__in=batch).update(position=Case(*cases, output_field=CharField()))
+
+        return updated
+
 
 WORLD_ROOMS_MAPPER = WorldRoomsMapper()
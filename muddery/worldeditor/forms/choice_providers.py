@@ -0,0 +1,219 @@
+"""
+Choices of form fields which come from world data tables. Choices are sorted
+and cached, they are queried again after their tables are changed.
+"""
+
+from muddery.worldeditor.dao import common_mappers as CM
+from muddery.worldeditor.utils.table_versions import TABLE_VERSIONS
+
+
+class ChoiceProvider(object):
+    """
+    Provide choices of a table's records.
+    """
+    def __init__(self, name, tables):
+        """
+        Args:
+            name: (string) provider's name.
+            tables: (list) tables which choices come from.
+        """
+        self.name = name
+        self.tables = tuple(tables)
+        self.versions = None
+        self.choices = ()
+        self.values = set()
+
+        CHOICE_PROVIDERS[name] = self
+
+    def query(self):
+        """
+        Query choices from the db.
+
+        Returns:
+            (list) a list of (value, label) tuples.
+        """
+        return []
+
+    def all(self):
+        """
+        Get all choices sorted by labels.
+
+        Returns:
+            (tuple) a tuple of (value, label) tuples.
+        """
+        versions = tuple(TABLE_VERSIONS.get(table) for table in self.tables)
+        if versions != self.versions:
+            self.choices = tuple(sorted(self.query(), key=lambda choice: choice[1]))
+            self.values = set(choice[0] for choice in self.choices)
+            self.versions = versions
+
+        return self.choices
+
+    def has(self, value):
+        """
+        Check if the value is a choice's value.
+
+        Args:
+            value: (string) choice's value.
+        """
+        self.all()
+        return value in self.values
+
+    def search(self, text, limit=None):
+        """
+        Search choices whose values or labels contain the text.
+
+        Args:
+            text: (string) text to search.
+            limit: (number) max number of results.
+
+        Returns:
+            (list) a list of (value, label) tuples.
+        """
+        text = text.lower()
+        results = []
+        for choice in self.all():
+            if text in choice[0].lower() or text in choice[1].lower():
+                results.append(choice)
+                if limit and len(results) >= limit:
+                    break
+
+        return results
+
+
+class ObjectChoiceProvider(ChoiceProvider):
+    """
+    Provide choices of objects, labels come from objects' names.
+    """
+    def __init__(self, name, mapper, typeclass=None):
+        """
+        Args:
+            name: (string) provider's name.
+            mapper: (ObjectsMapper) the objects' table's mapper.
+            typeclass: (string) only provide objects of this typeclass.
+        """
+        tables = [CM.OBJECTS.model_name]
+        if mapper.model_name not in tables:
+            tables.append(mapper.model_name)
+
+        super(ObjectChoiceProvider, self).__init__(name, tables)
+        self.mapper = mapper
+        self.typeclass = typeclass
+
+    def query(self):
+        """
+        Query choices from the db.
+        """
+        if self.mapper is CM.OBJECTS:
+            records = self.mapper.all().values("key", "name", "typeclass")
+        else:
+            records = self.mapper.all_with_base() or []
+
+        return [(r["key"], r["name"] + " (" + r["key"] + ")") for r in records
+                if not self.typeclass or r["typeclass"] == self.typeclass]
+
+
+class RecordChoiceProvider(ChoiceProvider):
+    """
+    Provide choices of a common table's records.
+    """
+    def __init__(self, name, mapper, label_field="name", **filters):
+        """
+        Args:
+            name: (string) provider's name.
+            mapper: (CommonMapper) the table's mapper.
+            label_field: (string) the field to show in labels, only show keys if it is None.
+            filters: (dict) conditions of records.
+        """
+        super(RecordChoiceProvider, self).__init__(name, [mapper.model_name])
+        self.mapper = mapper
+        self.label_field = label_field
+        self.filters = filters
+
+    def query(self):
+        """
+        Query choices from the db.
+        """
+        if self.label_field:
+            records = self.mapper.filter(**self.filters).values_list("key", self.label_field)
+            return [(key, label + " (" + key + ")") for key, label in records]
+        else:
+            records = self.mapper.filter(**self.filters).values_list("key", flat=True)
+            return [(key, key) for key in records]
+
+
+class MergedChoiceProvider(ChoiceProvider):
+    """
+    Provide choices of several providers.
+    """
+    def __init__(self, name, *providers):
+        """
+        Args:
+            name: (string) provider's name.
+            providers: (list) providers to merge.
+        """
+        tables = []
+        for provider in providers:
+            tables.extend(table for table in provider.tables if table not in tables)
+
+        super(MergedChoiceProvider, self).__init__(name, tables)
+        self.providers = providers
+
+    def query(self):
+        """
+        Get choices of all providers.
+        """
+        return [choice for provider in self.providers for choice in provider.all()]
+
+
+# All choice providers.
+# {provider's name: provider}
+CHOICE_PROVIDERS = {}
+
+
+OBJECT_CHOICES = ObjectChoiceProvider("objects", CM.OBJECTS)
+
+POCKETABLE_OBJECT_CHOICES = ObjectChoiceProvider("common_objects", CM.COMMON_OBJECTS)
+
+AREA_CHOICES = ObjectChoiceProvider("world_areas", CM.WORLD_AREAS)
+
+ROOM_CHOICES = ObjectChoiceProvider("world_rooms", CM.WORLD_ROOMS)
+
+NPC_CHOICES = ObjectChoiceProvider("world_npcs", CM.WORLD_NPCS)
+
+CHARACTER_CHOICES = ObjectChoiceProvider("characters", CM.CHARACTERS)
+
+PLAYER_CHARACTER_CHOICES = ObjectChoiceProvider("player_characters", CM.CHARACTERS, typeclass="PLAYER_CHARACTER")
+
+NPC_AND_CHARACTER_CHOICES = MergedChoiceProvider("npcs_and_characters", NPC_CHOICES, CHARACTER_CHOICES)
+
+OBJECT_CREATOR_CHOICES = ObjectChoiceProvider("object_creators", CM.OBJECT_CREATORS)
+
+SHOP_CHOICES = ObjectChoiceProvider("shops", CM.SHOPS)
+
+SKILL_CHOICES = ObjectChoiceProvider("skills", CM.SKILLS)
+
+QUEST_CHOICES = ObjectChoiceProvider("quests", CM.QUESTS)
+
+SKILL_TYPE_CHOICES = RecordChoiceProvider("skill_types", CM.SKILL_TYPES)
+
+DIALOGUE_CHOICES = RecordChoiceProvider("dialogues", CM.DIALOGUES)
+
+EQUIPMENT_POSITION_CHOICES = RecordChoiceProvider("equipment_positions", CM.EQUIPMENT_POSITIONS)
+
+EQUIPMENT_TYPE_CHOICES = RecordChoiceProvider("equipment_types", CM.EQUIPMENT_TYPES)
+
+EVENT_CHOICES = RecordChoiceProvider("event_data", CM.EVENT_DATA, label_field=None)
+
+
+def get_event_choices(action):
+    """
+    Get the choice provider of events of an action.
+
+    Args:
+        action: (string) action's type.
+    """
+    name = "event_data." + action
+    if name not in CHOICE_PROVIDERS:
+        RecordChoiceProvider(name, CM.EVENT_DATA, label_field=None, action=action)
+    return CHOICE_PROVIDERS[name]
@@ -8,22 +8,11 @@ from muddery.server.mappings.event_trigger_set import EVENT_TRIGGER_SET
 from muddery.worldeditor.dao import common_mappers as CM
 from muddery.worldeditor.forms.location_field import LocationField
 from muddery.worldeditor.forms.image_field import ImageField
-
-
-def get_all_objects():
-    """
-    Get all objects.
-    """
-    records = CM.OBJECTS.all()
-    return [(r.key, r.name + " (" + r.key + ")") for r in records]
-
-
-def get_all_pocketable_objects():
-    """
-    Get all objects that can be put in player's pockets.
-    """
-    records = CM.COMMON_OBJECTS.all_with_base()
-    return [(r["key"], r["name"] + " (" + r["key"] + ")") for r in records]
+from muddery.worldeditor.forms.provider_choice_field import ProviderChoiceField
+from muddery.worldeditor.forms.choice_providers import OBJECT_CHOICES, POCKETABLE_OBJECT_CHOICES, AREA_CHOICES,\
+    ROOM_CHOICES, NPC_CHOICES, CHARACTER_CHOICES, PLAYER_CHARACTER_CHOICES, NPC_AND_CHARACTER_CHOICES,\
+    OBJECT_CREATOR_CHOICES, SHOP_CHOICES, SKILL_CHOICES, QUEST_CHOICES, SKILL_TYPE_CHOICES, DIALOGUE_CHOICES,\
+    EQUIPMENT_POSITION_CHOICES, EQUIPMENT_TYPE_CHOICES, EVENT_CHOICES, get_event_choices
 
 
 def generate_key(form_obj):
@@ -52,18 +41,11 @@ class GameSettingsForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(GameSettingsForm, self).__init__(*args, **kwargs)
         
-        choices = [("", "---------")]
-        objects = CM.WORLD_ROOMS.all_with_base()
-        choices.extend([(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects])
-        self.fields['default_home_key'] = forms.ChoiceField(choices=choices, required=False)
-        self.fields['start_location_key'] = forms.ChoiceField(choices=choices, required=False)
-        self.fields['default_player_home_key'] = forms.ChoiceField(choices=choices, required=False)
+        self.fields['default_home_key'] = ProviderChoiceField(ROOM_CHOICES, empty=True, required=False)
+        self.fields['start_location_key'] = ProviderChoiceField(ROOM_CHOICES, empty=True, required=False)
+        self.fields['default_player_home_key'] = ProviderChoiceField(ROOM_CHOICES, empty=True, required=False)
 
-        choices = [("", "---------")]
-        objects = CM.CHARACTERS.all_with_base()
-        choices.extend([(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects
-                            if obj["typeclass"]=="PLAYER_CHARACTER"])
-        self.fields['default_player_character_key'] = forms.ChoiceField(choices=choices, required=False)
+        self.fields['default_player_character_key'] = ProviderChoiceField(PLAYER_CHARACTER_CHOICES, empty=True, required=False)
 
         localize_form_fields(self)
 
@@ -124,10 +106,7 @@ class WorldRoomsForm(ObjectsForm):
     def __init__(self, *args, **kwargs):
         super(WorldRoomsForm, self).__init__(*args, **kwargs)
 
-        choices = [("", "---------")]
-        objects = CM.WORLD_AREAS.all_with_base()
-        choices.extend([(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects])
-        self.fields['location'] = forms.ChoiceField(choices=choices)
+        self.fields['location'] = ProviderChoiceField(AREA_CHOICES, empty=True)
 
         self.fields['icon'] = ImageField(image_type="icon", required=False)
 
@@ -144,10 +123,8 @@ class WorldExitsForm(ObjectsForm):
     def __init__(self, *args, **kwargs):
         super(WorldExitsForm, self).__init__(*args, **kwargs)
 
-        rooms = CM.WORLD_ROOMS.all_with_base()
-        choices = [(r["key"], r["name"] + " (" + r["key"] + ")") for r in rooms]
-        self.fields['location'] = LocationField(choices=choices)
-        self.fields['destination'] = LocationField(choices=choices)
+        self.fields['location'] = LocationField(ROOM_CHOICES)
+        self.fields['destination'] = LocationField(ROOM_CHOICES)
 
         localize_form_fields(self)
 
@@ -175,9 +152,7 @@ class WorldObjectsForm(ObjectsForm):
     def __init__(self, *args, **kwargs):
         super(WorldObjectsForm, self).__init__(*args, **kwargs)
 
-        rooms = CM.WORLD_ROOMS.all_with_base()
-        choices = [(r["key"], r["name"] + " (" + r["key"] + ")") for r in rooms]
-        self.fields['location'] = LocationField(choices=choices)
+        self.fields['location'] = LocationField(ROOM_CHOICES)
 
         self.fields['icon'] = ImageField(image_type="icon", required=False)
 
@@ -193,9 +168,7 @@ class WorldNPCsForm(ObjectsForm):
         super(WorldNPCsForm, self).__init__(*args, **kwargs)
         
         # NPC's location
-        rooms = CM.WORLD_ROOMS.all_with_base()
-        choices = [(r["key"], r["name"] + " (" + r["key"] + ")") for r in rooms]
-        self.fields['location'] = LocationField(choices=choices)
+        self.fields['location'] = LocationField(ROOM_CHOICES)
 
         localize_form_fields(self)
 
@@ -224,19 +197,13 @@ class CreatorLootListForm(forms.ModelForm):
         super(CreatorLootListForm, self).__init__(*args, **kwargs)
 
         # providers must be object_creators
-        objects = CM.OBJECT_CREATORS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['provider'] = forms.ChoiceField(choices=choices)
+        self.fields['provider'] = ProviderChoiceField(OBJECT_CREATOR_CHOICES)
 
         # available objects
-        choices = get_all_pocketable_objects()
-        self.fields['object'] = forms.ChoiceField(choices=choices)
+        self.fields['object'] = ProviderChoiceField(POCKETABLE_OBJECT_CHOICES)
         
         # depends on quest
-        choices = [("", "---------")]
-        objects = CM.QUESTS.all_with_base()
-        choices.extend([(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects])
-        self.fields['quest'] = forms.ChoiceField(choices=choices, required=False)
+        self.fields['quest'] = ProviderChoiceField(QUEST_CHOICES, empty=True, required=False)
 
         localize_form_fields(self)
 
@@ -250,23 +217,13 @@ class CharacterLootListForm(forms.ModelForm):
         super(CharacterLootListForm, self).__init__(*args, **kwargs)
 
         # providers can be world_npc or common_character
-        npcs = CM.WORLD_NPCS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in npcs]
-
-        characters = CM.CHARACTERS.all_with_base()
-        choices.extend([(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in characters])
-
-        self.fields['provider'] = forms.ChoiceField(choices=choices)
+        self.fields['provider'] = ProviderChoiceField(NPC_AND_CHARACTER_CHOICES)
 
         # available objects
-        choices = get_all_pocketable_objects()
-        self.fields['object'] = forms.ChoiceField(choices=choices)
+        self.fields['object'] = ProviderChoiceField(POCKETABLE_OBJECT_CHOICES)
 
         # depends on quest
-        choices = [("", "---------")]
-        objects = CM.QUESTS.all_with_base()
-        choices.extend([(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects])
-        self.fields['quest'] = forms.ChoiceField(choices=choices, required=False)
+        self.fields['quest'] = ProviderChoiceField(QUEST_CHOICES, empty=True, required=False)
 
         localize_form_fields(self)
         
@@ -280,19 +237,13 @@ class QuestRewardListForm(forms.ModelForm):
         super(QuestRewardListForm, self).__init__(*args, **kwargs)
 
         # providers must be object_creators
-        objects = CM.QUESTS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['provider'] = forms.ChoiceField(choices=choices)
+        self.fields['provider'] = ProviderChoiceField(QUEST_CHOICES)
 
         # available objects
-        choices = get_all_pocketable_objects()
-        self.fields['object'] = forms.ChoiceField(choices=choices)
+        self.fields['object'] = ProviderChoiceField(POCKETABLE_OBJECT_CHOICES)
         
         # depends on quest
-        choices = [("", "---------")]
-        objects = CM.QUESTS.all_with_base()
-        choices.extend([(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects])
-        self.fields['quest'] = forms.ChoiceField(choices=choices, required=False)
+        self.fields['quest'] = ProviderChoiceField(QUEST_CHOICES, empty=True, required=False)
 
         localize_form_fields(self)
 
@@ -330,9 +281,7 @@ class SkillBooksForm(ObjectsForm):
         super(SkillBooksForm, self).__init__(*args, **kwargs)
         
         # skills
-        objects = CM.SKILLS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['skill'] = forms.ChoiceField(choices=choices)
+        self.fields['skill'] = ProviderChoiceField(SKILL_CHOICES)
 
         localize_form_fields(self)
 
@@ -357,10 +306,7 @@ class CharactersForm(ObjectsForm):
 
         self.fields['icon'] = ImageField(image_type="icon", required=False)
 
-        choices = [("", "---------")]
-        characters = CM.CHARACTERS.all_with_base()
-        choices.extend([(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in characters])
-        self.fields['clone'] = forms.ChoiceField(choices=choices, required=False)
+        self.fields['clone'] = ProviderChoiceField(CHARACTER_CHOICES, empty=True, required=False)
 
         localize_form_fields(self)
 
@@ -404,13 +350,10 @@ class DefaultObjectsForm(forms.ModelForm):
         super(DefaultObjectsForm, self).__init__(*args, **kwargs)
 
         # all character's
-        objects = CM.CHARACTERS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['character'] = forms.ChoiceField(choices=choices)
+        self.fields['character'] = ProviderChoiceField(CHARACTER_CHOICES)
 
         # available objects
-        choices = get_all_pocketable_objects()
-        self.fields['object'] = forms.ChoiceField(choices=choices)
+        self.fields['object'] = ProviderChoiceField(POCKETABLE_OBJECT_CHOICES)
 
         localize_form_fields(self)
         
@@ -437,18 +380,13 @@ class ShopGoodsForm(ObjectsForm):
         super(ShopGoodsForm, self).__init__(*args, **kwargs)
 
         # all shops
-        objects = CM.SHOPS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['shop'] = forms.ChoiceField(choices=choices)
+        self.fields['shop'] = ProviderChoiceField(SHOP_CHOICES)
 
         # available objects
-        choices = get_all_pocketable_objects()
-        self.fields['goods'] = forms.ChoiceField(choices=choices)
+        self.fields['goods'] = ProviderChoiceField(POCKETABLE_OBJECT_CHOICES)
 
         # available units are common objects
-        objects = CM.COMMON_OBJECTS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['unit'] = forms.ChoiceField(choices=choices)
+        self.fields['unit'] = ProviderChoiceField(POCKETABLE_OBJECT_CHOICES)
 
         localize_form_fields(self)
         
@@ -462,14 +400,10 @@ class NPCShopsForm(forms.ModelForm):
         super(NPCShopsForm, self).__init__(*args, **kwargs)
 
         # All NPCs.
-        objects = CM.WORLD_NPCS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['npc'] = forms.ChoiceField(choices=choices)
+        self.fields['npc'] = ProviderChoiceField(NPC_CHOICES)
         
         # All shops.
-        objects = CM.SHOPS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['shop'] = forms.ChoiceField(choices=choices)
+        self.fields['shop'] = ProviderChoiceField(SHOP_CHOICES)
 
         localize_form_fields(self)
         
@@ -484,11 +418,8 @@ class SkillsForm(ObjectsForm):
         
         self.fields['icon'] = ImageField(image_type="icon", required=False)
         
-        choices = [("", "---------")]
-        objects = CM.SKILL_TYPES.objects.all()
-        choices.extend([(obj.key, obj.name + " (" + obj.key + ")") for obj in objects])
-        self.fields['main_type'] = forms.ChoiceField(choices=choices, required=False)
-        self.fields['sub_type'] = forms.ChoiceField(choices=choices, required=False)
+        self.fields['main_type'] = ProviderChoiceField(SKILL_TYPE_CHOICES, empty=True, required=False)
+        self.fields['sub_type'] = ProviderChoiceField(SKILL_TYPE_CHOICES, empty=True, required=False)
 
         localize_form_fields(self)
 
@@ -512,13 +443,9 @@ class DefaultSkillsForm(forms.ModelForm):
         super(DefaultSkillsForm, self).__init__(*args, **kwargs)
 
         # all character's models
-        objects = CM.CHARACTERS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['character'] = forms.ChoiceField(choices=choices)
+        self.fields['character'] = ProviderChoiceField(CHARACTER_CHOICES)
 
-        objects = CM.SKILLS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['skill'] = forms.ChoiceField(choices=choices)
+        self.fields['skill'] = ProviderChoiceField(SKILL_CHOICES)
 
         localize_form_fields(self)
         
@@ -532,13 +459,9 @@ class NPCDialoguesForm(forms.ModelForm):
         super(NPCDialoguesForm, self).__init__(*args, **kwargs)
 
         # All NPCs.
-        objects = CM.WORLD_NPCS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['npc'] = forms.ChoiceField(choices=choices)
+        self.fields['npc'] = ProviderChoiceField(NPC_CHOICES)
         
-        objects = CM.DIALOGUES.objects.all()
-        choices = [(obj.key, obj.name + " (" + obj.key + ")") for obj in objects]
-        self.fields['dialogue'] = forms.ChoiceField(choices=choices)
+        self.fields['dialogue'] = ProviderChoiceField(DIALOGUE_CHOICES)
 
         localize_form_fields(self)
 
@@ -562,9 +485,7 @@ class QuestObjectivesForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(QuestObjectivesForm, self).__init__(*args, **kwargs)
 
-        objects = CM.QUESTS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['quest'] = forms.ChoiceField(choices=choices)
+        self.fields['quest'] = ProviderChoiceField(QUEST_CHOICES)
 
         choices = QUEST_OBJECTIVE_SET.choice_all()
         self.fields['type'] = forms.ChoiceField(choices=choices)
@@ -580,10 +501,8 @@ class QuestDependenciesForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(QuestDependenciesForm, self).__init__(*args, **kwargs)
 
-        objects = CM.QUESTS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['quest'] = forms.ChoiceField(choices=choices)
-        self.fields['dependency'] = forms.ChoiceField(choices=choices)
+        self.fields['quest'] = ProviderChoiceField(QUEST_CHOICES)
+        self.fields['dependency'] = ProviderChoiceField(QUEST_CHOICES)
         
         choices = QUEST_STATUS_SET.choice_all()
         self.fields['type'] = forms.ChoiceField(choices=choices)
@@ -599,13 +518,9 @@ class DialogueQuestDependenciesForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(DialogueQuestDependenciesForm, self).__init__(*args, **kwargs)
 
-        objects = CM.DIALOGUES.objects.all()
-        choices = [(obj.key, obj.name + " (" + obj.key + ")") for obj in objects]
-        self.fields['dialogue'] = forms.ChoiceField(choices=choices)
+        self.fields['dialogue'] = ProviderChoiceField(DIALOGUE_CHOICES)
         
-        objects = CM.QUESTS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['dependency'] = forms.ChoiceField(choices=choices)
+        self.fields['dependency'] = ProviderChoiceField(QUEST_CHOICES)
         
         choices = QUEST_STATUS_SET.choice_all()
         self.fields['type'] = forms.ChoiceField(choices=choices)
@@ -621,13 +536,9 @@ class EquipmentsForm(ObjectsForm):
     def __init__(self, *args, **kwargs):
         super(EquipmentsForm, self).__init__(*args, **kwargs)
 
-        objects = CM.EQUIPMENT_POSITIONS.objects.all()
-        choices = [(obj.key, obj.name + " (" + obj.key + ")") for obj in objects]
-        self.fields['position'] = forms.ChoiceField(choices=choices)
+        self.fields['position'] = ProviderChoiceField(EQUIPMENT_POSITION_CHOICES)
         
-        objects = CM.EQUIPMENT_TYPES.objects.all()
-        choices = [(obj.key, obj.name + " (" + obj.key + ")") for obj in objects]
-        self.fields['type'] = forms.ChoiceField(choices=choices)
+        self.fields['type'] = ProviderChoiceField(EQUIPMENT_TYPE_CHOICES)
         
         localize_form_fields(self)
 
@@ -665,13 +576,9 @@ class ActionAttackForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(ActionAttackForm, self).__init__(*args, **kwargs)
 
-        objects = CM.EVENT_DATA.objects.filter(action="ACTION_ATTACK")
-        choices = [(obj.key, obj.key + " (" + obj.key + ")") for obj in objects]
-        self.fields['event_key'] = forms.ChoiceField(choices=choices)
+        self.fields['event_key'] = ProviderChoiceField(get_event_choices("ACTION_ATTACK"))
         
-        objects = CM.CHARACTERS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['mob'] = forms.ChoiceField(choices=choices)
+        self.fields['mob'] = ProviderChoiceField(CHARACTER_CHOICES)
 
         localize_form_fields(self)
 
@@ -684,19 +591,12 @@ class ActionDialogueForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(ActionDialogueForm, self).__init__(*args, **kwargs)
 
-        objects = CM.EVENT_DATA.objects.filter(action="ACTION_DIALOGUE")
-        choices = [(obj.key, obj.key + " (" + obj.key + ")") for obj in objects]
-        self.fields['event_key'] = forms.ChoiceField(choices=choices)
+        self.fields['event_key'] = ProviderChoiceField(get_event_choices("ACTION_DIALOGUE"))
 
-        objects = CM.DIALOGUES.objects.all()
-        choices = [(obj.key, obj.name + " (" + obj.key + ")") for obj in objects]
-        self.fields['dialogue'] = forms.ChoiceField(choices=choices)
+        self.fields['dialogue'] = ProviderChoiceField(DIALOGUE_CHOICES)
 
         # NPCs
-        choices = [("", "---------")]
-        objects = CM.WORLD_NPCS.all_with_base()
-        choices.extend([(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects])
-        self.fields['npc'] = forms.ChoiceField(choices=choices, required=False)
+        self.fields['npc'] = ProviderChoiceField(NPC_CHOICES, empty=True, required=False)
 
         localize_form_fields(self)
 
@@ -709,13 +609,9 @@ class ActionLearnSkillForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(ActionLearnSkillForm, self).__init__(*args, **kwargs)
 
-        objects = CM.EVENT_DATA.objects.filter(action="ACTION_LEARN_SKILL")
-        choices = [(obj.key, obj.key + " (" + obj.key + ")") for obj in objects]
-        self.fields['event_key'] = forms.ChoiceField(choices=choices)
+        self.fields['event_key'] = ProviderChoiceField(get_event_choices("ACTION_LEARN_SKILL"))
 
-        objects = CM.SKILLS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['skill'] = forms.ChoiceField(choices=choices)
+        self.fields['skill'] = ProviderChoiceField(SKILL_CHOICES)
 
         localize_form_fields(self)
 
@@ -728,13 +624,9 @@ class ActionAcceptQuestForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(ActionAcceptQuestForm, self).__init__(*args, **kwargs)
 
-        objects = CM.EVENT_DATA.objects.filter(action="ACTION_ACCEPT_QUEST")
-        choices = [(obj.key, obj.key + " (" + obj.key + ")") for obj in objects]
-        self.fields['event_key'] = forms.ChoiceField(choices=choices)
+        self.fields['event_key'] = ProviderChoiceField(get_event_choices("ACTION_ACCEPT_QUEST"))
 
-        objects = CM.QUESTS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['quest'] = forms.ChoiceField(choices=choices)
+        self.fields['quest'] = ProviderChoiceField(QUEST_CHOICES)
 
         localize_form_fields(self)
 
@@ -747,13 +639,9 @@ class ActionTurnInQuestForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(ActionTurnInQuestForm, self).__init__(*args, **kwargs)
 
-        objects = CM.EVENT_DATA.objects.filter(action="ACTION_TURN_IN_QUEST")
-        choices = [(obj.key, obj.key + " (" + obj.key + ")") for obj in objects]
-        self.fields['event_key'] = forms.ChoiceField(choices=choices)
+        self.fields['event_key'] = ProviderChoiceField(get_event_choices("ACTION_TURN_IN_QUEST"))
 
-        objects = CM.QUESTS.all_with_base()
-        choices = [(obj["key"], obj["name"] + " (" + obj["key"] + ")") for obj in objects]
-        self.fields['quest'] = forms.ChoiceField(choices=choices)
+        self.fields['quest'] = ProviderChoiceField(QUEST_CHOICES)
 
         localize_form_fields(self)
 
@@ -766,13 +654,9 @@ class ActionCloseEventForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(ActionCloseEventForm, self).__init__(*args, **kwargs)
 
-        objects = CM.EVENT_DATA.objects.filter(action="ACTION_CLOSE_EVENT")
-        choices = [(obj.key, obj.key + " (" + obj.key + ")") for obj in objects]
-        self.fields['event_key'] = forms.ChoiceField(choices=choices)
+        self.fields['event_key'] = ProviderChoiceField(get_event_choices("ACTION_CLOSE_EVENT"))
 
-        objects = CM.EVENT_DATA.objects.all()
-        choices = [(obj.key, obj.key) for obj in objects]
-        self.fields['event'] = forms.ChoiceField(choices=choices)
+        self.fields['event'] = ProviderChoiceField(EVENT_CHOICES)
 
         localize_form_fields(self)
 
@@ -810,8 +694,7 @@ class ActionGetObjectsForm(forms.ModelForm):
         super(ActionGetObjectsForm, self).__init__(*args, **kwargs)
 
         # available objects
-        choices = get_all_pocketable_objects()
-        self.fields['object'] = forms.ChoiceField(choices=choices)
+        self.fields['object'] = ProviderChoiceField(POCKETABLE_OBJECT_CHOICES)
 
         localize_form_fields(self)
 
@@ -842,10 +725,8 @@ class DialogueRelationsForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(DialogueRelationsForm, self).__init__(*args, **kwargs)
 
-        objects = CM.DIALOGUES.objects.all()
-        choices = [(obj.key, obj.name + " (" + obj.key + ")") for obj in objects]
-        self.fields['dialogue'] = forms.ChoiceField(choices=choices)
-        self.fields['next_dlg'] = forms.ChoiceField(choices=choices)
+        self.fields['dialogue'] = ProviderChoiceField(DIALOGUE_CHOICES)
+        self.fields['next_dlg'] = ProviderChoiceField(DIALOGUE_CHOICES)
 
         localize_form_fields(self)
 
@@ -858,9 +739,7 @@ class DialogueSentencesForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(DialogueSentencesForm, self).__init__(*args, **kwargs)
 
-        objects = CM.DIALOGUES.objects.all()
-        choices = [(obj.key, obj.name + " (" + obj.key + ")") for obj in objects]
-        self.fields['dialogue'] = forms.ChoiceField(choices=choices)
+        self.fields['dialogue'] = ProviderChoiceField(DIALOGUE_CHOICES)
 
         # dialogue's icon
         self.fields['icon'] = ImageField(image_type="icon", required=False)
@@ -884,8 +763,7 @@ class ConditionDescForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(ConditionDescForm, self).__init__(*args, **kwargs)
 
-        choices = get_all_objects()
-        self.fields['key'] = forms.ChoiceField(choices=choices)
+        self.fields['key'] = ProviderChoiceField(OBJECT_CHOICES)
 
         localize_form_fields(self)
 
@@ -1,12 +1,11 @@
-
 """
 World location's field. Group rooms by areas.
 """
 
-from django.contrib.admin.forms import forms
+from muddery.worldeditor.forms.provider_choice_field import ProviderChoiceField
 
 
-class LocationField(forms.ChoiceField):
+class LocationField(ProviderChoiceField):
     """
     World location's field.
     """
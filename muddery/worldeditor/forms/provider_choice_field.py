@@ -0,0 +1,30 @@
+"""
+A choice field whose choices come from a choice provider.
+"""
+
+from django.contrib.admin.forms import forms
+
+
+class ProviderChoiceField(forms.ChoiceField):
+    """
+    Choice field of a choice provider.
+    """
+    def __init__(self, provider, empty=False, *args, **kwargs):
+        """
+
+        Args:
+            provider: (ChoiceProvider) the provider of choices.
+            empty: (boolean) add an empty choice.
+        """
+        choices = provider.all()
+        if empty:
+            choices = (("", "---------"),) + choices
+
+        super(ProviderChoiceField, self).__init__(choices=choices, *args, **kwargs)
+        self.provider = provider
+
+    def valid_value(self, value):
+        """
+        Check if value is in the provider's choices.
+        """
+        return self.provider.has(str(value))
@@ -5,20 +5,28 @@ This decorator can add controllers to the controller dict for future usage.
 """
 
 import json
+import time
+import random
+from contextlib import contextmanager
 from django.conf import settings
+from django.db import transaction
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponse
 from evennia.utils import logger
 from muddery.server.utils.exception import MudderyError, ERR
 from muddery.worldeditor.mappings.request_set import REQUEST_SET
 import muddery.worldeditor.controllers
-from muddery.worldeditor.utils.response import error_response
+from muddery.worldeditor.utils.response import success_response, error_response
+from muddery.server.profiling.query_tracker import QUERY_TRACKER
 
 
 class Processer(object):
     """
     HTTP request processer.
     """
+    # The path of batch requests.
+    batch_path = "/batch"
+
     def __init__(self, path_prefix=None):
         if path_prefix:
             if path_prefix[0] != "/":
@@ -48,7 +56,6 @@ class Processer(object):
 
         if request.POST:
             data = request.POST.dict()
-            print("data: %s" % data)
             func = data.get("func", "")
             args_text = data.get("args", None)
             if args_text:
@@ -63,8 +70,54 @@ class Processer(object):
                 logger.log_errmsg("Parse request body error: %s" % e)
                 pass
 
-        print("request: '%s' '%s' '%s'" % (path, func, args))
+        begin_time = time.time()
+        if settings.DEBUG:
+            # count db queries of this request
+            with QUERY_TRACKER.scope(path) as scope:
+                response = self.dispatch(path, func, args, request)
+
+            # show the number of db queries of this request
+            response["X-Query-Count"] = scope.count
+            response["Access-Control-Expose-Headers"] = "X-Query-Count"
+
+            logger.log_infomsg("Request '%s' '%s': %.1fms, %d queries." %
+                               (path, func, (time.time() - begin_time) * 1000, scope.count))
+        else:
+            response = self.dispatch(path, func, args, request)
+
+            if random.random() < settings.EDITOR_REQUEST_LOG_RATE:
+                logger.log_infomsg("Request '%s' '%s': %.1fms." %
+                                   (path, func, (time.time() - begin_time) * 1000))
+
+        return response
+
+    def dispatch(self, path, func, args, request):
+        """
+        Call a request's processer, or process a batch of requests.
+
+        Args:
+            path: (string) request's path.
+            func: (string) request's func name.
+            args: (dict) request's args.
+            request: HTTP request.
+        """
+        if path == self.batch_path:
+            return self.process_batch(args, request)
+        else:
+            return self.call(path, func, args, request)
+
+    def call(self, path, func, args, request, atomic=False):
+        """
+        Call a request's processer.
 
+        Args:
+            path: (string) request's path.
+            func: (string) request's func name.
+            args: (dict) request's args.
+            request: HTTP request.
+            atomic: (boolean) call the processer in a savepoint, so its db
+                    errors do not break the outer transaction.
+        """
         processor = REQUEST_SET.get(path, func)
         if not processor:
             logger.log_errmsg("Can not find API: %s %s" % (path, func))
@@ -81,7 +134,8 @@ class Processer(object):
 
         # call function
         try:
-            response = processor.func(args, request)
+            with self.savepoint(atomic):
+                response = processor.func(args, request)
         except MudderyError as e:
             logger.log_errmsg("Error: %s, %s" % (e.code, e))
             response = error_response(e.code, msg=str(e), data=e.data)
@@ -91,6 +145,60 @@ class Processer(object):
 
         return response
 
+    @contextmanager
+    def savepoint(self, atomic):
+        """
+        Use a savepoint of the world data db if atomic is True.
+        """
+        if atomic:
+            with transaction.atomic(using=settings.WORLD_DATA_APP):
+                yield
+        else:
+            yield
+
+    def process_batch(self, args, request):
+        """
+        Process a batch of requests in one transaction, and respond all their
+        results at once.
+
+        Args:
+            args:
+                calls: (list) a list of requests.
+                    [{
+                        "path": (string) request's path.
+                        "func": (string, optional) request's func name.
+                        "args": (dict, optional) request's args.
+                    }]
+            request: HTTP request.
+        """
+        calls = args.get("calls")
+        if not calls or not isinstance(calls, list):
+            return error_response(ERR.missing_args, msg='Missing the argument: "calls".')
+
+        if len(calls) > settings.EDITOR_BATCH_SIZE_LIMIT:
+            return error_response(ERR.invalid_input, msg="Too many requests in a batch.")
+
+        results = []
+        with transaction.atomic(using=settings.WORLD_DATA_APP):
+            for call in calls:
+                path = call.get("path", "")
+                if path[:1] != "/":
+                    path = "/" + path
+
+                if path == self.batch_path:
+                    response = error_response(ERR.invalid_input, msg="Can not call batch requests in a batch.")
+                else:
+                    response = self.call(path, call.get("func", ""), call.get("args", {}), request, atomic=True)
+
+                if response.streaming:
+                    results.append({"code": ERR.invalid_input,
+                                    "msg": "Can not download files in a batch.",
+                                    "data": None})
+                else:
+                    results.append(json.loads(response.content))
+
+        return success_response(results)
+
 
 PROCESSER = Processer(settings.WORLD_EDITOR_API_PATH)
 
@@ -0,0 +1,183 @@
+"""
+Receive large files in chunks. Every chunk and the whole file are checked with
+CRC32 checksums. If an upload is broken, it can be resumed from its received
+size.
+"""
+
+import os, time, uuid, zlib, tempfile, threading
+from django.conf import settings
+from muddery.server.utils.exception import MudderyError, ERR
+
+
+class Upload(object):
+    """
+    A file being uploaded.
+    """
+    def __init__(self, name, size, checksum):
+        """
+        Args:
+            name: (string) file's name.
+            size: (number) file's size.
+            checksum: (number) file's CRC32 checksum.
+        """
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.size = size
+        self.checksum = checksum
+        self.received = 0
+        self.crc = 0
+        self.update_time = time.time()
+
+        fd, self.filename = tempfile.mkstemp(prefix="upload_")
+        os.close(fd)
+
+    def is_completed(self):
+        """
+        All data of the file has been received.
+        """
+        return self.received >= self.size
+
+    def write(self, offset, data, checksum):
+        """
+        Write a chunk of data.
+
+        Args:
+            offset: (number) chunk's position in the file.
+            data: (bytes) chunk's data.
+            checksum: (number) chunk's CRC32 checksum.
+        """
+        if offset != self.received:
+            raise MudderyError(ERR.upload_error, "Wrong chunk offset: %s." % offset, data=self.info())
+
+        if zlib.crc32(data) != checksum:
+            raise MudderyError(ERR.upload_error, "Wrong chunk checksum.", data=self.info())
+
+        if self.received + len(data) > self.size:
+            raise MudderyError(ERR.upload_error, "The file is larger than its size.", data=self.info())
+
+        crc = zlib.crc32(data, self.crc)
+        if self.received + len(data) == self.size and crc != self.checksum:
+            # upload the file again
+            self.received = 0
+            self.crc = 0
+            raise MudderyError(ERR.upload_error, "Wrong file checksum.", data=self.info())
+
+        with open(self.filename, "r+b") as fp:
+            fp.seek(offset)
+            fp.write(data)
+
+        self.received += len(data)
+        self.crc = crc
+        self.update_time = time.time()
+
+    def remove(self):
+        """
+        Remove the received file.
+        """
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+    def info(self):
+        """
+        Get the upload's state.
+        """
+        return {
+            "upload": self.id,
+            "name": self.name,
+            "size": self.size,
+            "received": self.received,
+            "chunk_size": settings.EDITOR_UPLOAD_CHUNK_SIZE,
+        }
+
+
+class ChunkedUploads(object):
+    """
+    Keep all uploads.
+    """
+    def __init__(self):
+        self.uploads = {}
+        self.lock = threading.Lock()
+
+    def begin(self, name, size, checksum):
+        """
+        Begin to upload a file. If the same file has been partly uploaded,
+        resume the upload.
+
+        Args:
+            name: (string) file's name.
+            size: (number) file's size.
+            checksum: (number) file's CRC32 checksum.
+
+        Returns:
+            (Upload) the upload.
+        """
+        with self.lock:
+            self.remove_expired()
+
+            for upload in self.uploads.values():
+                if upload.name == name and upload.size == size and upload.checksum == checksum \
+                        and not upload.is_completed():
+                    upload.update_time = time.time()
+                    return upload
+
+            upload = Upload(name, size, checksum)
+            self.uploads[upload.id] = upload
+            return upload
+
+    def write(self, upload_id, offset, data, checksum):
+        """
+        Write a chunk of a file.
+
+        Args:
+            upload_id: (string) upload's id.
+            offset: (number) chunk's position in the file.
+            data: (bytes) chunk's data.
+            checksum: (number) chunk's CRC32 checksum.
+
+        Returns:
+            (Upload) the upload.
+        """
+        with self.lock:
+            upload = self.get(upload_id)
+            upload.write(offset, data, checksum)
+            return upload
+
+    def get(self, upload_id):
+        """
+        Get an upload.
+
+        Args:
+            upload_id: (string) upload's id.
+        """
+        upload = self.uploads.get(upload_id)
+        if not upload:
+            raise MudderyError(ERR.no_data, "Can not find the upload: %s" % upload_id)
+        return upload
+
+    def pop(self, upload_id):
+        """
+        Take a completed upload away, the caller should remove its file after
+        using it.
+
+        Args:
+            upload_id: (string) upload's id.
+        """
+        with self.lock:
+            upload = self.get(upload_id)
+            if not upload.is_completed():
+                raise MudderyError(ERR.upload_error, "The upload has not completed.", data=upload.info())
+            del self.uploads[upload_id]
+            return upload
+
+    def remove_expired(self):
+        """
+        Remove uploads which have not been updated for a long time.
+        """
+        expire_time = time.time() - settings.EDITOR_UPLOAD_EXPIRE
+        for upload_id in [key for key, upload in self.uploads.items() if upload.update_time < expire_time]:
+            self.uploads.pop(upload_id).remove()
+
+
+CHUNKED_UPLOADS = ChunkedUploads()
@@ -2,11 +2,13 @@
 Battle commands. They only can be used when a character is in a combat.
 """
 
+from django.conf import settings
 from django.db import transaction
 from django.core.exceptions import ObjectDoesNotExist
 from muddery.server.utils.exception import MudderyError, ERR
-from muddery.worldeditor.dao import general_query_mapper
+from muddery.worldeditor.dao import general_query_mapper, model_mapper
 from muddery.worldeditor.dao.common_mappers import WORLD_AREAS, WORLD_ROOMS
+from muddery.worldeditor.dao.world_rooms_mapper import WORLD_ROOMS_MAPPER
 from muddery.worldeditor.dao.system_data_mapper import SYSTEM_DATA
 from muddery.worldeditor.dao.object_properties_mapper import OBJECT_PROPERTIES
 from muddery.worldeditor.mappings.form_set import FORM_SET
@@ -14,34 +16,81 @@ from muddery.server.mappings.typeclass_set import TYPECLASS, TYPECLASS_SET
 from muddery.server.mappings.event_action_set import EVENT_ACTION_SET
 from muddery.worldeditor.forms.location_field import LocationField
 from muddery.worldeditor.forms.image_field import ImageField
+from muddery.worldeditor.forms.provider_choice_field import ProviderChoiceField
+from muddery.worldeditor.utils.table_versions import TABLE_VERSIONS
+from muddery.server.profiling.query_tracker import QUERY_TRACKER
 
 
-def query_form(table_name, **kwargs):
+# Fields of forms without records' values.
+# {table_name: (versions of tables which the form reads, fields)}
+_form_fields = {}
+
+
+def get_form_fields(table_name):
     """
-    Query table's data.
+    Get fields of a table's form, with their labels and choices. Fields are
+    cached until tables which the form reads choices from are changed. Fields
+    with too many choices are sent as autocomplete fields without choices.
 
     Args:
         table_name: (string) data table's name.
-        kwargs: (dict) conditions.
     """
+    if table_name in _form_fields:
+        versions, fields = _form_fields[table_name]
+        if all(TABLE_VERSIONS.get(table) == version for table, version in versions):
+            return fields
+
     form_class = FORM_SET.get(table_name)
     if not form_class:
         raise MudderyError(ERR.no_table, "Can not find table: %s" % table_name)
 
-    form = None
-    record = None
-    if kwargs:
-        try:
-            # Query record's data.
-            record = general_query_mapper.get_record(table_name, **kwargs)
-            form = form_class(instance=record)
-        except Exception as e:
-            form = None
+    models = list(model_mapper.get_all_models())
+    versions = dict((model.__name__, TABLE_VERSIONS.get(model.__name__)) for model in models)
 
-    if not form:
-        # Get empty data.
+    tables = set()
+    with QUERY_TRACKER.scope("form fields: " + table_name) as scope:
         form = form_class()
 
+        fields = []
+        for key, field in form.fields.items():
+            info = {
+                "name": key,
+                "label": field.label,
+                "disabled": field.disabled,
+                "help_text": field.help_text,
+                "type": field.widget.__class__.__name__,
+            }
+
+            if isinstance(field, ProviderChoiceField):
+                # cached choices do not query the db
+                tables.update(field.provider.tables)
+
+            if isinstance(field, LocationField):
+                info["type"] = "Location"
+            elif isinstance(field, ImageField):
+                info["type"] = "Image"
+                info["image_type"] = field.get_type()
+            elif isinstance(field, ProviderChoiceField) and len(field.provider.all()) > settings.EDITOR_CHOICES_LIMIT:
+                info["type"] = "Autocomplete"
+                info["provider"] = field.provider.name
+            elif info["type"] == "Select":
+                info["choices"] = list(field.choices)
+
+            fields.append(info)
+
+    tables.update(scope.get_tables(models))
+    _form_fields[table_name] = (tuple((table, versions[table]) for table in tables), fields)
+    return fields
+
+
+def get_form_values(table_name, record):
+    """
+    Get a form's fields with the record's values.
+
+    Args:
+        table_name: (string) data table's name.
+        record: (model) the record, or None to get an empty form.
+    """
     fields = []
     fields.append({
         "name": "id",
@@ -52,30 +101,32 @@ def query_form(table_name, **kwargs):
         "value": record.id if record else "",
     })
 
-    for key, field in form.fields.items():
-        info = {
-            "name": key,
-            "label": field.label,
-            "disabled": field.disabled,
-            "help_text": field.help_text,
-            "type": field.widget.__class__.__name__,
-        }
-
+    for field in get_form_fields(table_name):
+        info = dict(field)
         if record:
-            info["value"] = str(record.serializable_value(key))
+            info["value"] = str(record.serializable_value(info["name"]))
+        fields.append(info)
 
-        if info["type"] == "Select":
-            info["choices"] = field.choices
+    return fields
 
-        if isinstance(field, LocationField):
-            info["type"] = "Location"
-        elif isinstance(field, ImageField):
-            info["type"] = "Image"
-            info["image_type"] = field.get_type()
 
-        fields.append(info)
+def query_form(table_name, **kwargs):
+    """
+    Query table's data.
 
-    return fields
+    Args:
+        table_name: (string) data table's name.
+        kwargs: (dict) conditions.
+    """
+    record = None
+    if kwargs:
+        try:
+            # Query record's data.
+            record = general_query_mapper.get_record(table_name, **kwargs)
+        except Exception as e:
+            record = None
+
+    return get_form_values(table_name, record)
 
 
 def save_form(values, table_name, record_id=None):
@@ -107,6 +158,7 @@ def save_form(values, table_name, record_id=None):
     # Save data
     if form.is_valid():
         instance = form.save()
+        TABLE_VERSIONS.update(table_name)
         return instance.pk
     else:
         raise MudderyError(ERR.invalid_form, "Invalid form.", data=form.errors)
@@ -155,15 +207,15 @@ def query_object_form(base_typeclass, obj_typeclass, obj_key):
         raise MudderyError(ERR.no_table, "Can not find typeclass: %s" % obj_typeclass)
     table_names = typeclass.get_models()
 
+    records = {}
+    if obj_key and table_names:
+        # Query the object's records in all tables at once.
+        records = general_query_mapper.get_records_from_tables(table_names, obj_key)
+
     forms = []
     for table_name in table_names:
-        if obj_key:
-            object_form = query_form(table_name, key=obj_key)
-        else:
-            object_form = query_form(table_name)
-
         forms.append({"table": table_name,
-                      "fields": object_form})
+                      "fields": get_form_values(table_name, records.get(table_name))})
 
     # add typeclasses
     if len(forms) > 0:
@@ -230,22 +282,21 @@ def save_object_form(tables, obj_typeclass, obj_key):
         for table in tables:
             table["values"]["key"] = new_key
 
+    records = {}
+    if obj_key:
+        # Query the current object's records in all tables at once.
+        records = general_query_mapper.get_records_from_tables([table["table"] for table in tables], obj_key)
+
     forms = []
     for table in tables:
         table_name = table["table"]
         form_values = table["values"]
 
         form_class = FORM_SET.get(table_name)
-        form = None
-        if obj_key:
-            try:
-                # Query the current object's data.
-                record = general_query_mapper.get_record_by_key(table_name, obj_key)
-                form = form_class(form_values, instance=record)
-            except ObjectDoesNotExist:
-                form = None
-
-        if not form:
+        record = records.get(table_name)
+        if record:
+            form = form_class(form_values, instance=record)
+        else:
             # Get empty data.
             form = form_class(form_values)
 
@@ -261,18 +312,32 @@ def save_object_form(tables, obj_typeclass, obj_key):
         for form in forms:
             form.save()
 
+    for table in tables:
+        TABLE_VERSIONS.update(table["table"])
+
     return new_key
 
 
 def save_map_positions(area, rooms):
     """
-    Save all data of an object.
+    Save an area's map data and its rooms' positions. All rooms' positions
+    are updated at once.
 
     Args:
         area: (dict) area's data.
         rooms: (dict) rooms' data.
     """
-    with transaction.atomic():
+    positions = {}
+    max_length = WORLD_ROOMS.model._meta.get_field("position").max_length
+    for room in rooms:
+        position = ""
+        if len(room["position"]) > 1:
+            position = "(%s,%s)" % (room["position"][0], room["position"][1])
+            if max_length and len(position) > max_length:
+                raise MudderyError(ERR.invalid_input, "Invalid position of room %s." % room["key"])
+        positions[room["key"]] = position
+
+    with transaction.atomic(using=settings.WORLD_DATA_APP):
         # area data
         record = WORLD_AREAS.get(key=area["key"])
         record.background = area["background"]
@@ -283,15 +348,14 @@ def save_map_positions(area, rooms):
         record.save()
 
         # rooms
-        for room in rooms:
-            position = ""
-            if len(room["position"]) > 1:
-                position = "(%s,%s)" % (room["position"][0], room["position"][1])
-            record = WORLD_ROOMS.get(key=room["key"])
-            record.position = position
+        if positions:
+            updated = WORLD_ROOMS_MAPPER.update_positions(positions)
+            if updated < len(positions):
+                raise MudderyError(ERR.no_data, "Can not find rooms.")
 
-            record.full_clean()
-            record.save()
+    TABLE_VERSIONS.update(WORLD_AREAS.model_name)
+    if positions:
+        TABLE_VERSIONS.update(WORLD_ROOMS.model_name)
 
 
 def delete_object(obj_key, base_typeclass=None):
@@ -335,9 +399,9 @@ def query_event_action_forms(action_type, event_key):
     records = general_query_mapper.filter_records(table_name, event_key=event_key)
     if records:
         for record in records:
-            forms.append(query_form(table_name, id=record.id))
+            forms.append(get_form_values(table_name, record))
     else:
-        forms.append(query_form(table_name))
+        forms.append(get_form_values(table_name, None))
 
     return {
         "forms": forms,
@@ -361,19 +425,23 @@ def update_object_key(typeclass_key, old_key, new_key):
         model_name = TYPECLASS("ROOM").model_name
         if model_name:
             general_query_mapper.filter_records(model_name, location=old_key).update(location=new_key)
+            TABLE_VERSIONS.update(model_name)
     elif issubclass(typeclass, TYPECLASS("ROOM")):
         # Update relative exit's location.
         model_name = TYPECLASS("EXIT").model_name
         if model_name:
             general_query_mapper.filter_records(model_name, location=old_key).update(location=new_key)
             general_query_mapper.filter_records(model_name, destination=old_key).update(destination=new_key)
+            TABLE_VERSIONS.update(model_name)
 
         # Update relative world object's location.
         model_name = TYPECLASS("WORLD_OBJECT").model_name
         if model_name:
             general_query_mapper.filter_records(model_name, location=old_key).update(location=new_key)
+            TABLE_VERSIONS.update(model_name)
 
         # Update relative world NPC's location.
         model_name = TYPECLASS("WORLD_NPC").model_name
         if model_name:
             general_query_mapper.filter_records(model_name, location=old_key).update(location=new_key)
+            TABLE_VERSIONS.update(model_name)
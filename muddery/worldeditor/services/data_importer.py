@@ -5,14 +5,59 @@ Import table data.
 import os, traceback
 from django.apps import apps
 from django.conf import settings
-from django.db import models
-from django.core.exceptions import ValidationError
+from django.db import models, router, transaction
+from django.core.exceptions import ValidationError, NON_FIELD_ERRORS
 from evennia.utils import logger
 from muddery.worldeditor.utils import readers
 from muddery.server.utils.exception import MudderyError, ERR
+from muddery.worldeditor.utils.table_versions import TABLE_VERSIONS
 
 
-def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs):
+class ImportCancelled(Exception):
+    """
+    The import has been cancelled.
+    """
+    pass
+
+
+class ImportProgress(object):
+    """
+    Receive the progress of imports. Its methods are called while importing,
+    and can raise ImportCancelled to stop the import.
+    """
+    def begin_file(self, table_name, file_name):
+        """
+        Begin to import a data file.
+
+        Args:
+            table_name: (string) table's name.
+            file_name: (string) data file's name.
+        """
+        logger.log_infomsg("Importing %s" % file_name)
+
+    def update(self, table_name, lines):
+        """
+        Lines of a data file have been imported.
+
+        Args:
+            table_name: (string) table's name.
+            lines: (number) number of imported lines.
+        """
+        pass
+
+    def error(self, table_name, error):
+        """
+        Failed to import a data file.
+
+        Args:
+            table_name: (string) table's name.
+            error: (Exception) the error.
+        """
+        logger.log_errmsg("Import error: %s" % error)
+
+
+def import_file(fullname, file_type=None, table_name=None, clear=True, bulk=None, batch_size=None, data=None,
+                progress=None, **kwargs):
     """
     Import data from a data file to the db model
 
@@ -20,6 +65,12 @@ def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs)
         fullname: (string) file's full name
         table_name: (string) the type of the file. If it's None, the function will get
                    the file type from the extension name of the file.
+        bulk: (boolean) import in bulk mode, use settings.IMPORT_BULK_MODE if it is None.
+        batch_size: (number) number of records inserted in one statement in bulk mode,
+                    use settings.IMPORT_BATCH_SIZE if it is None.
+        data: (iterable) data lines already read from the file, the file will not
+              be read again if it is set.
+        progress: (ImportProgress) receive the import's progress.
     """
 
     def get_field_types(model_obj, field_names):
@@ -106,13 +157,172 @@ def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs)
 
         return record
 
-    def import_data(model_obj, data_iterator):
+    def get_field_parsers(field_names, field_types, typed=False):
+        """
+        Get parse functions of fields, so values can be parsed column by column.
+        Typed values are used as they are, empty values are kept.
+
+        Returns:
+            (list) a list of (field name, parse function, skip empty value) tuples
+        """
+        def parse_boolean(value):
+            if value == 'True':
+                return True
+            elif value == 'False':
+                return False
+            else:
+                return int(value) != 0
+
+        parsers = []
+        for field_name, field_type in zip(field_names, field_types):
+            # skip "id" field
+            if field_name == "id":
+                continue
+
+            if field_type == 0 or (typed and 1 <= field_type <= 3):
+                # default
+                parsers.append((field_name, None, False))
+            elif field_type == 1:
+                # boolean value
+                parsers.append((field_name, parse_boolean, True))
+            elif field_type == 2:
+                # interger value
+                parsers.append((field_name, int, True))
+            elif field_type == 3:
+                # float value
+                parsers.append((field_name, float, True))
+            else:
+                # not support this field
+                parsers.append((field_name, False, False))
+
+        return parsers
+
+    def parse_values(parsers, values):
+        """
+        Parse text values to field values with field parsers.
+        """
+        record = {}
+        for (field_name, parser, skip_empty), value in zip(parsers, values):
+            if parser is False:
+                continue
+
+            if skip_empty and not value:
+                continue
+
+            if parser is None:
+                record[field_name] = value
+                continue
+
+            try:
+                record[field_name] = parser(value)
+            except Exception as e:
+                raise ValidationError({field_name: "value error: '%s'" % value})
+
+        return record
+
+    def get_unique_checks(model_obj):
+        """
+        Get fields which should be unique.
+
+        Returns:
+            (list) a list of field name tuples.
+        """
+        unique_checks = [(field.name,) for field in model_obj._meta.fields if field.unique and field.name != "id"]
+        unique_checks.extend(tuple(fields) for fields in model_obj._meta.unique_together)
+        return unique_checks
+
+    def import_data_bulk(model_obj, data_iterator, clear, batch_size, typed):
+        """
+        Import data to a table in bulk mode. Records are validated without
+        querying the db and inserted in batches in one transaction.
+
+        Args:
+            model_obj: (model) model object.
+            data_iterator: (list) data list.
+            clear: (boolean) clear old data.
+            batch_size: (number) number of records inserted in one statement.
+            typed: (boolean) values are in their own types.
+
+        Returns:
+            None
+        """
+        line = 1
+        try:
+            with transaction.atomic(using=router.db_for_write(model_obj)):
+                if clear:
+                    clear_model_data(model_obj)
+
+                # values of unique fields, check them in memory
+                unique_checks = get_unique_checks(model_obj)
+                unique_values = {}
+                for check in unique_checks:
+                    if clear:
+                        unique_values[check] = set()
+                    else:
+                        unique_values[check] = set(model_obj.objects.values_list(*check))
+
+                # read title
+                try:
+                    titles = next(data_iterator)
+                except StopIteration:
+                    # empty file
+                    return
+                field_types = get_field_types(model_obj, titles)
+                parsers = get_field_parsers(titles, field_types, typed)
+                line += 1
+
+                # import values
+                batch = []
+                for values in data_iterator:
+                    # skip blank lines
+                    if not typed and not any(values):
+                        line += 1
+                        continue
+
+                    record = parse_values(parsers, values)
+                    data = model_obj(**record)
+                    data.clean_fields()
+                    data.clean()
+
+                    for check in unique_checks:
+                        value = tuple(getattr(data, field_name) for field_name in check)
+                        if None in value:
+                            continue
+
+                        if value in unique_values[check]:
+                            key = check[0] if len(check) == 1 else NON_FIELD_ERRORS
+                            raise ValidationError({key: [data.unique_error_message(model_obj, check)]})
+                        unique_values[check].add(value)
+
+                    batch.append(data)
+                    if len(batch) >= batch_size:
+                        model_obj.objects.bulk_create(batch, batch_size=batch_size)
+                        batch = []
+                        if progress:
+                            progress.update(model_obj.__name__, line)
+                    line += 1
+
+                if batch:
+                    model_obj.objects.bulk_create(batch, batch_size=batch_size)
+
+        except ImportCancelled:
+            raise
+        except ValidationError as e:
+            traceback.print_exc()
+            raise MudderyError(ERR.import_data_error, parse_error(e, model_obj.__name__, line))
+        except Exception as e:
+            traceback.print_exc()
+            raise MudderyError(ERR.import_data_error, "%s (model: %s, line: %s)" % (e, model_obj.__name__, line))
+
+    def import_data(model_obj, data_iterator, typed, batch_size):
         """
         Import data to a table.
 
         Args:
             model_obj: (model) model object.
             data_iterator: (list) data list.
+            typed: (boolean) values are in their own types.
+            batch_size: (number) report the progress after every batch of records.
 
         Returns:
             None
@@ -124,27 +334,39 @@ def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs)
             field_types = get_field_types(model_obj, titles)            
             line += 1
 
+            if typed:
+                parsers = get_field_parsers(titles, field_types, typed)
+
             # import values
             for values in data_iterator:
-                # skip blank lines
-                blank_line = True
-                for value in values:
-                    if value:
-                        blank_line = False
-                        break
-                if blank_line:
-                    line += 1
-                    continue
+                if typed:
+                    record = parse_values(parsers, values)
+                else:
+                    # skip blank lines
+                    blank_line = True
+                    for value in values:
+                        if value:
+                            blank_line = False
+                            break
+                    if blank_line:
+                        line += 1
+                        continue
+
+                    record = parse_record(titles, field_types, values)
 
-                record = parse_record(titles, field_types, values)
                 data = model_obj(**record)
                 data.full_clean()
                 data.save()
                 line += 1
 
+                if progress and line % batch_size == 0:
+                    progress.update(model_obj.__name__, line)
+
         except StopIteration:
             # reach the end of file, pass this exception
             pass
+        except ImportCancelled:
+            raise
         except ValidationError as e:
             traceback.print_exc()
             raise MudderyError(ERR.import_data_error, parse_error(e, model_obj.__name__, line))
@@ -209,19 +431,35 @@ def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs)
     # get model
     model_obj = apps.get_model(settings.WORLD_DATA_APP, table_name)
 
-    if clear:
-        clear_model_data(model_obj, **kwargs)
+    if bulk is None:
+        bulk = settings.IMPORT_BULK_MODE
 
     reader_class = readers.get_reader(file_type)
-    if not reader_class:
-        # Does support this file type.
-        raise(MudderyError(ERR.import_data_error, "Unknown file type."))
+    typed = reader_class.typed if reader_class else False
 
-    reader = reader_class(fullname)
-    if not reader:
-        # Does support this file type.
-        raise(MudderyError(ERR.import_data_error, "Does not support this file type."))
+    if data is not None:
+        reader = iter(data)
+    else:
+        if not reader_class:
+            # Does support this file type.
+            raise(MudderyError(ERR.import_data_error, "Unknown file type."))
+
+        reader = reader_class(fullname)
+        if not reader:
+            # Does support this file type.
+            raise(MudderyError(ERR.import_data_error, "Does not support this file type."))
 
     logger.log_infomsg("Importing %s" % table_name)
-    import_data(model_obj, reader)
+    try:
+        if bulk:
+            import_data_bulk(model_obj, reader, clear, batch_size or settings.IMPORT_BATCH_SIZE, typed)
+        else:
+            # Import the table in a savepoint, so a failed table does not break
+            # the transaction of other tables.
+            with transaction.atomic(using=router.db_for_write(model_obj)):
+                if clear:
+                    clear_model_data(model_obj, **kwargs)
+                import_data(model_obj, reader, typed, batch_size or settings.IMPORT_BATCH_SIZE)
+    finally:
+        TABLE_VERSIONS.update(table_name)
 
@@ -3,6 +3,7 @@ Battle commands. They only can be used when a character is in a combat.
 """
 
 import ast
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from evennia.utils import logger
 from muddery.server.utils.game_settings import GAME_SETTINGS
@@ -14,7 +15,9 @@ from muddery.worldeditor.dao import general_query_mapper, model_mapper
 from muddery.worldeditor.dao.dialogue_sentences_mapper import DIALOGUE_SENTENCES
 from muddery.worldeditor.dao.object_properties_mapper import OBJECT_PROPERTIES
 from muddery.worldeditor.dao.event_mapper import get_object_event
-from muddery.worldeditor.services.general_query import query_fields
+from muddery.worldeditor.services.general_query import query_fields, parse_page_args, count_records
+from muddery.worldeditor.forms.choice_providers import CHOICE_PROVIDERS
+from muddery.worldeditor.utils.table_versions import TABLE_VERSIONS
 from muddery.server.mappings.typeclass_set import TYPECLASS_SET, TYPECLASS
 from muddery.server.mappings.event_action_set import EVENT_ACTION_SET
 from muddery.server.utils.exception import MudderyError, ERR
@@ -28,6 +31,25 @@ def query_all_typeclasses():
     return TYPECLASS_SET.get_all_info()
 
 
+def query_choices(provider_name, text, limit=None):
+    """
+    Query choices whose values or labels contain the text.
+
+    Args:
+        provider_name: (string) choice provider's name.
+        text: (string) text to search.
+        limit: (number) max number of choices.
+    """
+    provider = CHOICE_PROVIDERS.get(provider_name)
+    if not provider:
+        raise MudderyError(ERR.invalid_input, "Can not find choices: %s" % provider_name)
+
+    if not limit or limit > settings.EDITOR_AUTOCOMPLETE_LIMIT:
+        limit = settings.EDITOR_AUTOCOMPLETE_LIMIT
+
+    return provider.search(text, limit)
+
+
 def query_areas():
     """
     Query all areas and rooms.
@@ -282,12 +304,14 @@ def query_dialogue_sentences(dialogue_key):
     return table
 
 
-def query_typeclass_table(typeclass_key):
+def query_typeclass_table(typeclass_key, page=None):
     """
     Query a table of objects of the same typeclass.
 
     Args:
         typeclass_key: (string) typeclass's key.
+        page: (dict, optional) page arguments, see general_query.parse_page_args().
+              Query all records if it is None.
     """
     typeclass_cls = TYPECLASS(typeclass_key)
     if not typeclass_cls:
@@ -302,31 +326,84 @@ def query_typeclass_table(typeclass_key):
     # add the first table
     table_fields = query_fields(tables[0])
     fields = [field for field in table_fields if field["name"] != "id"]
+    columns = {field["name"]: tables[0] for field in fields}
 
     # add other tables
     for table in tables[1:]:
         table_fields = query_fields(table)
-        fields.extend([field for field in table_fields if field["name"] != "id" and field["name"] != "key"])
+        table_fields = [field for field in table_fields if field["name"] != "id" and field["name"] != "key"]
+        fields.extend(table_fields)
+        columns.update((field["name"], table) for field in table_fields)
 
-    # get all tables' data
-    records = general_query_mapper.get_all_from_tables(tables)
+    if page is None:
+        # get all tables' data
+        records = general_query_mapper.get_all_from_tables(tables)
+
+        rows = []
+        for record in records:
+            line = [str(record[field["name"]]) for field in fields]
+            rows.append(line)
+
+        table = {
+            "fields": fields,
+            "records": rows,
+        }
+        return table
+
+    page = parse_page_args(page, columns)
+    total = count_records(tables, page["filters"], page["search"],
+                          lambda: general_query_mapper.count_from_tables(tables,
+                                                                         columns,
+                                                                         page["filters"],
+                                                                         page["search"]))
 
     rows = []
-    for record in records:
-        line = [str(record[field["name"]]) for field in fields]
-        rows.append(line)
+    if page["limit"] > 0:
+        records = general_query_mapper.get_page_from_tables(tables, columns, **page)
+        rows = [[str(record[field["name"]]) for field in fields] for record in records]
 
     table = {
         "fields": fields,
         "records": rows,
+        "total": total,
+        "offset": page["offset"],
     }
     return table
 
 
+# Cache of areas' maps, they are cleared when map tables are changed.
+# {area's key: map's data}
+_maps = {}
+_maps_versions = None
+
+
 def query_map(area_key):
     """
     Query the map of an area.
 
+    Args:
+        area_key: (string) area's key.
+    """
+    global _maps_versions
+
+    versions = tuple(TABLE_VERSIONS.get(table) for table in (CM.OBJECTS.model_name,
+                                                              WORLD_AREAS.model_name,
+                                                              WORLD_ROOMS_MAPPER.model_name,
+                                                              WORLD_EXITS_MAPPER.model_name))
+    if versions != _maps_versions:
+        _maps.clear()
+        _maps_versions = versions
+
+    if area_key not in _maps:
+        _maps[area_key] = load_map(area_key)
+
+    return _maps[area_key]
+
+
+def load_map(area_key):
+    """
+    Load the map of an area from the db.
+
     Args:
         area_key: (string) area's key.
     """
@@ -336,38 +413,19 @@ def query_map(area_key):
         raise MudderyError(ERR.no_data, "Can not find map: %s" % area_key)
     area_info = area_record
 
-    room_records = WORLD_ROOMS_MAPPER.rooms_in_area(area_key)
     room_info = []
-    room_keys = []
-    for record in room_records:
-        room_keys.append(record["key"])
-
-        try:
-            position = ast.literal_eval(record["position"])
-        except SyntaxError as e:
-            logger.log_errmsg("Parse map %s's position error: %s" % (record["key"], e))
-            position = ()
-
-        info = {
-            "key": record["key"],
-            "typeclass": record["typeclass"],
-            "name": record["name"],
-            "location": record["location"],
-            "position": position,
-            "icon": record["icon"]
-        }
-        room_info.append(info)
-
-    exit_records = WORLD_EXITS_MAPPER.exits_of_rooms(room_keys)
-    exit_info = []
-    for record in exit_records:
-        info = {
-            "key": record["key"],
-            "typeclass": record["typeclass"],
-            "location": record["location"],
-            "destination": record["destination"]
-        }
-        exit_info.append(info)
+    for record in WORLD_ROOMS_MAPPER.rooms_in_area(area_key):
+        position = ()
+        if record["position"]:
+            try:
+                position = ast.literal_eval(record["position"])
+            except (SyntaxError, ValueError) as e:
+                logger.log_errmsg("Parse map %s's position error: %s" % (record["key"], e))
+
+        record["position"] = position
+        room_info.append(record)
+
+    exit_info = list(WORLD_EXITS_MAPPER.exits_of_area(area_key))
 
     data = {
         "area": area_info,
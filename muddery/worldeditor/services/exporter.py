@@ -3,7 +3,6 @@ This module imports data from files to db.
 """
 
 import os
-import tempfile
 import zipfile
 from django.conf import settings
 from evennia.settings_default import GAME_DIR
@@ -13,9 +12,53 @@ from muddery.worldeditor.utils import writers
 from muddery.worldeditor.dao import general_query_mapper, model_mapper
 
 
+def get_writer_class(file_type):
+    """
+    Get the writer of a file type.
+
+    Args:
+        file_type: (string) file's type.
+    """
+    writer_class = writers.get_writer(file_type)
+    if not writer_class:
+        raise(MudderyError(ERR.export_data_error, "Unsupport file type %s" % file_type))
+
+    return writer_class
+
+
+def write_table(writer, table_name):
+    """
+    Write a table's records to a writer. Records are read from the db in
+    chunks, it yields after each chunk so the written data can be sent out.
+
+    Args:
+        writer: (DataWriter) data writer.
+        table_name: (string) table's name.
+    """
+    fields = general_query_mapper.get_all_fields(table_name)
+    header = [field.name for field in fields]
+    writer.writeln(header)
+
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    records = general_query_mapper.get_all_records(table_name)\
+        .values_list(*[field.get_attname() for field in fields])\
+        .iterator(chunk_size=chunk_size)
+    for count, record in enumerate(records, 1):
+        writer.writeln(record if writer.typed else [str(value) for value in record])
+        if count % chunk_size == 0:
+            yield
+
+    writer.save()
+
+
 def export_file(filename, table_name, file_type=None):
     """
     Export a table to a csv file.
+
+    Args:
+        filename: (string or file object) file's name or a writable binary stream.
+        table_name: (string) table's name.
+        file_type: (string) file's type.
     """
     if not file_type:
         # Get file's extension name.
@@ -23,61 +66,79 @@ def export_file(filename, table_name, file_type=None):
         if len(file_type) > 0:
             file_type = file_type[1:]
 
-    writer_class = writers.get_writer(file_type)
-    if not writer_class:
-        raise(MudderyError(ERR.export_data_error, "Unsupport file type %s" % file_type))
-
+    writer_class = get_writer_class(file_type)
     writer = writer_class(filename)
     if not writer:
         raise(MudderyError(ERR.export_data_error, "Can not export table %s" % table_name))
 
-    fields = general_query_mapper.get_all_fields(table_name)
-    header = [field.name for field in fields]
-    writer.writeln(header)
+    for _ in write_table(writer, table_name):
+        pass
 
-    records = general_query_mapper.get_all_records(table_name)
-    for record in records:
-        line = [str(record.serializable_value(field.get_attname())) for field in fields]
-        writer.writeln(line)
 
-    writer.save()
+def stream_file(table_name, file_type):
+    """
+    Export a table as a stream of file data.
+
+    Args:
+        table_name: (string) table's name.
+        file_type: (string) file's type.
+
+    Returns:
+        (iterator) an iterator of bytes.
+    """
+    writer_class = get_writer_class(file_type)
 
+    # check the table before streaming
+    general_query_mapper.get_all_fields(table_name)
 
-def export_zip_all(file_obj, file_type=None):
+    def iter_data():
+        stream = writers.StreamBuffer()
+        writer = writer_class(stream)
+        for _ in write_table(writer, table_name):
+            data = stream.pop()
+            if data:
+                yield data
+        yield stream.pop()
+
+    return iter_data()
+
+
+def stream_zip_all(file_type=None):
     """
-    Export all tables to a zip file which contains a group of csv files.
+    Export all tables as a stream of a zip file's data. Tables are written
+    one by one and sent out while they are being written.
+
+    Args:
+        file_type: (string) data file's type.
+
+    Returns:
+        (iterator) an iterator of bytes.
     """
     if not file_type:
         # Set default file type.
         file_type = "csv"
 
-    writer_class = writers.get_writer(file_type)
-    if not writer_class:
-        raise(MudderyError(ERR.export_data_error, "Unsupport file type %s" % file_type))
+    writer_class = get_writer_class(file_type)
+    model_names = [model._meta.object_name for model in model_mapper.get_all_models()]
+
+    def iter_data():
+        stream = writers.StreamBuffer()
+        with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for model_name in model_names:
+                with archive.open(model_name + "." + writer_class.file_ext, 'w') as data_file:
+                    writer = writer_class(data_file)
+                    for _ in write_table(writer, model_name):
+                        data = stream.pop()
+                        if data:
+                            yield data
+
+            # add version file
+            version_file = os.path.join(GAME_DIR, configs.CONFIG_FILE)
+            archive.write(version_file, configs.CONFIG_FILE)
+
+        yield stream.pop()
 
-    # Get tempfile's name.
-    temp_filename = tempfile.mktemp()
-    file_ext = writer_class.file_ext
-
-    try:
-        archive = zipfile.ZipFile(file_obj, 'w', zipfile.ZIP_DEFLATED)
-
-        # get model names
-        models = model_mapper.get_all_models()
-        for model in models:
-            model_name = model._meta.object_name
-            export_file(temp_filename, model_name, file_type)
-            filename = model_name + "." + file_ext
-            archive.write(temp_filename, filename)
-
-        # add version file
-        version_file = os.path.join(GAME_DIR, configs.CONFIG_FILE)
-        archive.write(version_file, configs.CONFIG_FILE)
-    finally:
-        try:
-            os.remove(temp_filename)
-        except PermissionError:
-            pass
+    return iter_data()
 
 
 def export_resources(file_obj):
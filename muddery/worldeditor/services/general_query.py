@@ -8,6 +8,12 @@ from muddery.worldeditor.dao import common_mappers as CM
 from muddery.worldeditor.dao import general_query_mapper, model_mapper
 from muddery.server.utils.exception import MudderyError, ERR
 from muddery.server.utils.localized_strings_handler import _
+from muddery.worldeditor.utils.table_versions import TABLE_VERSIONS
+
+
+# Cached numbers of records.
+# {(tables, filters, search): (tables' versions, count)}
+_records_count = {}
 
 
 def query_fields(table_name):
@@ -23,20 +29,116 @@ def query_fields(table_name):
              "type": field.__class__.__name__} for field in fields]
 
 
-def query_table(table_name):
+def parse_page_args(page, field_names):
+    """
+    Parse and check arguments of a page query.
+
+    Args:
+        page: (dict) page arguments
+            offset: (number) the position of the first record.
+            limit: (number) max number of records.
+            filters: (dict, optional) {field: value} records whose field contains the value.
+            search: (string, optional) records whose any field contains the value.
+            sort: (string, optional) the field to sort by.
+            order: (string, optional) "asc" or "desc".
+        field_names: (list) available fields.
+
+    Returns:
+        (dict) parsed arguments.
+    """
+    try:
+        offset = max(int(page.get("offset", 0)), 0)
+        limit = min(max(int(page["limit"]), 0), settings.EDITOR_PAGE_SIZE_LIMIT)
+    except (KeyError, TypeError, ValueError) as e:
+        raise MudderyError(ERR.invalid_input, "Invalid page arguments: %s" % e)
+
+    filters = page.get("filters") or {}
+    for field_name in filters:
+        if field_name not in field_names:
+            raise MudderyError(ERR.invalid_input, "Can not filter field %s." % field_name)
+    filters = {field_name: str(value) for field_name, value in filters.items() if value != ""}
+
+    sort = page.get("sort") or None
+    if sort and sort not in field_names:
+        raise MudderyError(ERR.invalid_input, "Can not sort field %s." % sort)
+
+    return {
+        "offset": offset,
+        "limit": limit,
+        "filters": filters,
+        "search": str(page.get("search") or ""),
+        "sort": sort,
+        "order": "desc" if page.get("order") == "desc" else "asc",
+    }
+
+
+def count_records(tables, filters, search, count_func):
+    """
+    Get the number of records. Numbers are cached until tables' data change.
+
+    Args:
+        tables: (list) tables' names.
+        filters: (dict) {field: value} records whose field contains the value.
+        search: (string) records whose any field contains the value.
+        count_func: (function) count records in the db.
+    """
+    cache_key = (tuple(tables), tuple(sorted(filters.items())), search)
+    versions = tuple(TABLE_VERSIONS.get(table) for table in tables)
+
+    cached = _records_count.get(cache_key)
+    if cached and cached[0] == versions:
+        return cached[1]
+
+    count = count_func()
+    if len(_records_count) >= settings.EDITOR_COUNT_CACHE_SIZE:
+        _records_count.clear()
+    _records_count[cache_key] = (versions, count)
+    return count
+
+
+def query_table(table_name, page=None):
     """
     Query table's data.
+
+    Args:
+        table_name: (string) table's name.
+        page: (dict, optional) page arguments, see parse_page_args(). Query all
+              records if it is None.
     """
     fields = query_fields(table_name)
-    records = general_query_mapper.get_all_records(table_name)
+
+    if page is None:
+        records = general_query_mapper.get_all_records(table_name)
+        rows = []
+        for record in records:
+            line = [str(record.serializable_value(field["name"])) for field in fields]
+            rows.append(line)
+
+        table = {
+            "fields": fields,
+            "records": rows,
+        }
+        return table
+
+    field_names = [field["name"] for field in fields]
+    page = parse_page_args(page, field_names)
+
+    total = count_records([table_name], page["filters"], page["search"],
+                          lambda: general_query_mapper.filter_records_by_text(table_name,
+                                                                              field_names,
+                                                                              page["filters"],
+                                                                              page["search"]).count())
+
     rows = []
-    for record in records:
-        line = [str(record.serializable_value(field["name"])) for field in fields]
-        rows.append(line)
+    if page["limit"] > 0:
+        records = general_query_mapper.get_records_page(table_name, field_names, **page)
+        rows = [[str(value) for value in record] for record in records]
 
     table = {
         "fields": fields,
         "records": rows,
+        "total": total,
+        "offset": page["offset"],
     }
     return table
 
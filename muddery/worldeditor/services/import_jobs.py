@@ -0,0 +1,217 @@
+"""
+Import uploaded world data in a background worker, so large imports do not
+block the editor's requests. A job imports all data in one transaction, if it
+fails or is cancelled, all changes are rolled back.
+"""
+
+import time, uuid, threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import transaction, connections
+from evennia.utils import logger
+from muddery.server.utils.exception import MudderyError, ERR
+from muddery.worldeditor.services import importer
+from muddery.worldeditor.services.data_importer import import_file, ImportProgress, ImportCancelled
+from muddery.worldeditor.utils.table_versions import TABLE_VERSIONS
+
+
+class ImportJob(ImportProgress):
+    """
+    A job to import an uploaded file.
+    """
+    WAITING = "waiting"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, upload, table_name=None, file_type=None):
+        """
+        Args:
+            upload: (Upload) the uploaded file.
+            table_name: (string) the table to import a single data file, import
+                        the file as a zip package of data if it is empty.
+            file_type: (string) single data file's type.
+        """
+        self.id = uuid.uuid4().hex
+        self.upload = upload
+        self.table_name = table_name
+        self.file_type = file_type
+
+        self.status = self.WAITING
+        self.cancelling = False
+        self.current_table = ""
+        self.files = 0
+        self.lines = 0
+        self.errors = []
+        self.failure = ""
+        self.begin_time = None
+        self.end_time = None
+
+    def run(self):
+        """
+        Import the file.
+        """
+        if self.cancelling:
+            self.status = self.CANCELLED
+            self.upload.remove()
+            return
+
+        self.status = self.RUNNING
+        self.begin_time = time.time()
+        try:
+            with transaction.atomic(using=settings.WORLD_DATA_APP):
+                if self.table_name:
+                    self.begin_file(self.table_name, self.upload.name)
+                    import_file(self.upload.filename, file_type=self.file_type, table_name=self.table_name,
+                                clear=True, progress=self)
+                else:
+                    # Import tables one by one in this transaction, worker
+                    # processes can not use it.
+                    with open(self.upload.filename, "rb") as fp:
+                        importer.unzip_data_all(fp, progress=self, workers=1)
+            self.status = self.FINISHED
+        except ImportCancelled:
+            self.status = self.CANCELLED
+        except MudderyError as e:
+            logger.log_errmsg("Import error: %s" % e)
+            self.failure = str(e)
+            self.status = self.FAILED
+        except Exception as e:
+            logger.log_tracemsg("Import error: %s" % e)
+            self.failure = str(e)
+            self.status = self.FAILED
+        finally:
+            self.end_time = time.time()
+            self.upload.remove()
+
+            # Data may be cached from other requests before the transaction ends.
+            TABLE_VERSIONS.update_all()
+
+            # Close the worker's db connections.
+            connections.close_all()
+
+    def cancel(self):
+        """
+        Cancel the job. A running job stops at its next progress report.
+        """
+        if self.status in (self.WAITING, self.RUNNING):
+            self.cancelling = True
+
+    def check_cancel(self):
+        """
+        Stop the import if the job has been cancelled.
+        """
+        if self.cancelling:
+            raise ImportCancelled()
+
+    def begin_file(self, table_name, file_name):
+        """
+        Begin to import a data file.
+        """
+        self.check_cancel()
+        self.current_table = table_name
+        self.files += 1
+        self.lines = 0
+
+    def update(self, table_name, lines):
+        """
+        Lines of a data file have been imported.
+        """
+        self.check_cancel()
+        self.lines = lines
+
+    def error(self, table_name, error):
+        """
+        Failed to import a data file.
+        """
+        logger.log_errmsg("Import %s error: %s" % (table_name, error))
+        self.errors.append({"table": table_name, "error": str(error)})
+
+    def is_done(self):
+        """
+        The job has stopped.
+        """
+        return self.status in (self.FINISHED, self.FAILED, self.CANCELLED)
+
+    def info(self):
+        """
+        Get the job's state.
+        """
+        return {
+            "job": self.id,
+            "name": self.upload.name,
+            "status": self.status,
+            "table": self.current_table,
+            "files": self.files,
+            "lines": self.lines,
+            "errors": self.errors,
+            "error": self.failure,
+            "time": (self.end_time or time.time()) - self.begin_time if self.begin_time else 0,
+        }
+
+
+class ImportJobs(object):
+    """
+    The queue of import jobs. Jobs are run one by one in a worker thread.
+    """
+    def __init__(self):
+        self.jobs = OrderedDict()
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def add(self, upload, table_name=None, file_type=None):
+        """
+        Add a job to import an uploaded file.
+
+        Args:
+            upload: (Upload) the uploaded file.
+            table_name: (string) the table to import a single data file, import
+                        the file as a zip package of data if it is empty.
+            file_type: (string) single data file's type.
+
+        Returns:
+            (ImportJob) the new job.
+        """
+        job = ImportJob(upload, table_name, file_type)
+
+        with self.lock:
+            if not self.executor:
+                self.executor = ThreadPoolExecutor(max_workers=1)
+
+            # remove old jobs
+            done_jobs = [key for key, item in self.jobs.items() if item.is_done()]
+            while done_jobs and len(done_jobs) >= settings.EDITOR_IMPORT_JOBS_KEEP:
+                del self.jobs[done_jobs.pop(0)]
+
+            self.jobs[job.id] = job
+            self.executor.submit(job.run)
+
+        return job
+
+    def get(self, job_id):
+        """
+        Get a job.
+
+        Args:
+            job_id: (string) job's id.
+        """
+        job = self.jobs.get(job_id)
+        if not job:
+            raise MudderyError(ERR.no_data, "Can not find the import job: %s" % job_id)
+        return job
+
+    def cancel(self, job_id):
+        """
+        Cancel a job.
+
+        Args:
+            job_id: (string) job's id.
+        """
+        job = self.get(job_id)
+        job.cancel()
+        return job
+
+
+IMPORT_JOBS = ImportJobs()
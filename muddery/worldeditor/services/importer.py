@@ -3,18 +3,30 @@ This module imports data from files to db.
 """
 
 import os, glob, tempfile, zipfile, shutil
+from concurrent.futures import ProcessPoolExecutor
 from django.conf import settings
 from muddery.launcher.upgrader.upgrade_handler import UPGRADE_HANDLER
 from muddery.launcher import configs
 from muddery.launcher.utils import copy_tree
-from muddery.worldeditor.services.data_importer import import_file
+from muddery.worldeditor.services.data_importer import import_file, ImportProgress, ImportCancelled
 from muddery.worldeditor.dao import model_mapper
+from muddery.worldeditor.utils import readers
+from muddery.worldeditor.utils.table_versions import TABLE_VERSIONS
 
 
-def unzip_data_all(fp):
+def unzip_data_all(fp, progress=None, workers=1):
     """
     Import all data files from a zip file.
+
+    Args:
+        fp: (file) the zip file.
+        progress: (ImportProgress) receive the import's progress.
+        workers: (number) number of worker processes which import tables in
+                 parallel, see import_data_path().
     """
+    if not progress:
+        progress = ImportProgress()
+
     temp_path = tempfile.mkdtemp()
 
     try:
@@ -33,7 +45,7 @@ def unzip_data_all(fp):
         UPGRADE_HANDLER.upgrade_data(source_path, None, configs.MUDDERY_LIB)
 
         # import data from path
-        import_data_path(source_path)
+        import_data_path(source_path, progress=progress, workers=workers)
 
         # load system localized strings
         # system data file's path
@@ -45,7 +57,7 @@ def unzip_data_all(fp):
                                                     settings.LANGUAGE_CODE)
 
         # load data
-        import_table_path(system_localized_string_path, settings.LOCALIZED_STRINGS_MODEL)
+        import_table_path(system_localized_string_path, settings.LOCALIZED_STRINGS_MODEL, progress=progress)
 
         # load custom localized strings
         # custom data file's path
@@ -53,11 +65,14 @@ def unzip_data_all(fp):
 
         file_names = glob.glob(custom_localized_string_path + ".*")
         if file_names:
-            print("Importing %s" % file_names[0])
+            progress.begin_file(settings.LOCALIZED_STRINGS_MODEL, file_names[0])
             try:
-                import_file(file_names[0], table_name=settings.LOCALIZED_STRINGS_MODEL, clear=False)
+                import_file(file_names[0], table_name=settings.LOCALIZED_STRINGS_MODEL, clear=False,
+                            progress=progress)
+            except ImportCancelled:
+                raise
             except Exception as e:
-                print("Import error: %s" % e)
+                progress.error(settings.LOCALIZED_STRINGS_MODEL, e)
 
     finally:
         shutil.rmtree(temp_path)
@@ -91,32 +106,86 @@ def unzip_resources_all(fp):
         shutil.rmtree(temp_path)
 
 
-def import_data_path(path, clear=True):
+def import_data_path(path, clear=True, progress=None, workers=1):
     """
-    Import data from path.
+    Import data from path. Tables are written to the db one by one in the
+    order of models.
 
     Args:
         path: (string) data path.
+        clear: (boolean) clear old data.
+        progress: (ImportProgress) receive the import's progress.
+        workers: (number) number of worker processes which parse data files
+                 in parallel. Only use it outside of the server, files are
+                 parsed while they are imported if it is 1.
     """
+    if not progress:
+        progress = ImportProgress()
 
-    # import tables one by one
+    # get data files of tables
+    data_files = []
     models = model_mapper.get_all_models()
     for model in models:
         table_name = model.__name__
         file_names = glob.glob(os.path.join(path, table_name) + ".*")
-
         if file_names:
-            print("Importing %s" % file_names[0])
+            data_files.append((table_name, file_names[0]))
+
+    if not workers or workers <= 1 or len(data_files) <= 1:
+        # import tables one by one
+        for table_name, file_name in data_files:
+            progress.begin_file(table_name, file_name)
             try:
-                import_file(file_names[0], table_name=table_name, clear=clear)
+                import_file(file_name, table_name=table_name, clear=clear, progress=progress)
+            except ImportCancelled:
+                raise
             except Exception as e:
-                print("Import error: %s" % e)
+                progress.error(table_name, e)
+        return
 
+    temp_path = tempfile.mkdtemp()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Parse files in parallel. Workers save parsed lines to temporary
+            # files, so lines are not sent between processes at once.
+            futures = []
+            for table_name, file_name in data_files:
+                file_type = os.path.splitext(file_name)[1][1:].lower()
+                lines_file = os.path.join(temp_path, table_name)
+                future = executor.submit(readers.save_lines_file, file_name, file_type, lines_file)
+                futures.append((table_name, file_name, lines_file, future))
+
+            # This process is the only writer of the db.
+            for table_name, file_name, lines_file, future in futures:
+                progress.begin_file(table_name, file_name)
+                try:
+                    future.result()
+                    import_file(file_name, table_name=table_name, clear=clear,
+                                data=readers.load_lines_file(lines_file), progress=progress)
+                except ImportCancelled:
+                    # do not parse other files
+                    for item in futures:
+                        item[3].cancel()
+                    raise
+                except Exception as e:
+                    progress.error(table_name, e)
+    finally:
+        shutil.rmtree(temp_path)
 
-def import_table_path(path, table_name, clear=True):
+
+def import_table_path(path, table_name, clear=True, progress=None):
     """
     Import a table's data from a path.
+
+    Args:
+        path: (string) data path.
+        table_name: (string) table's name.
+        clear: (boolean) clear old data.
+        progress: (ImportProgress) receive the import's progress.
     """
+    if not progress:
+        progress = ImportProgress()
+
     # clear old data
     model = model_mapper.get_model(table_name)
     if not model:
@@ -124,6 +193,7 @@ def import_table_path(path, table_name, clear=True):
 
     if clear:
         model.objects.all().delete()
+        TABLE_VERSIONS.update(table_name)
 
     if not os.path.isdir(path):
         return
@@ -134,8 +204,10 @@ def import_table_path(path, table_name, clear=True):
             # if it is a folder
             continue
 
-        print("Importing %s" % file_name)
+        progress.begin_file(table_name, file_name)
         try:
-            import_file(file_name, table_name=table_name, clear=False)
+            import_file(file_name, table_name=table_name, clear=False, progress=progress)
+        except ImportCancelled:
+            raise
         except Exception as e:
-            print("Import error: %s" % e)
+            progress.error(table_name, e)
@@ -1,7 +1,14 @@
+import os
+import shutil
+import tempfile
 from django.test import TestCase
 from django.test.client import Client
 from django.conf import settings
 from django.contrib import auth
+from muddery.worldeditor.dao import general_query_mapper, model_mapper
+from muddery.worldeditor.services import exporter
+from muddery.worldeditor.services.data_importer import import_file
+from muddery.worldeditor.utils import readers, writers
 
 class TestEditor(TestCase):
 
@@ -207,3 +214,53 @@ class TestEditor(TestCase):
         
         response = self.client.get('/worlddata/editor/localization/localized_strings/form.html')
         self.failUnlessEqual(response.status_code, 200)
+
+
+class TestColumnFormat(TestCase):
+
+    def setUp(self):
+        self.temp_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_path)
+
+    def get_records(self, table_name):
+        fields = [field.get_attname() for field in general_query_mapper.get_all_fields(table_name)
+                  if field.name != "id"]
+        return list(general_query_mapper.get_all_records(table_name).order_by("id").values_list(*fields))
+
+    def test_round_trip(self):
+        # Export all tables with example data to column files and import them again.
+        data_path = os.path.join(settings.MUDDERY_DIR, "game_templates", "example_cn", "worlddata", "data")
+        for model in model_mapper.get_all_models():
+            table_name = model.__name__
+            csv_file = os.path.join(data_path, table_name + ".csv")
+            if os.path.exists(csv_file):
+                import_file(csv_file, table_name=table_name)
+            records = self.get_records(table_name)
+
+            column_file = os.path.join(self.temp_path, table_name + ".mdt")
+            exporter.export_file(column_file, table_name, "column")
+            import_file(column_file, table_name=table_name)
+            self.assertEqual(self.get_records(table_name), records, table_name)
+
+    def test_size(self):
+        # Column files are smaller than csv files.
+        header = ["id", "key", "name", "value", "flag", "desc"]
+        lines = [[i, "key_%d" % i, "name %d" % i, i * 1.5, i % 2 == 0, ""] for i in range(20000)]
+
+        sizes = {}
+        for writer_type, reader_type in (("csv", "csv"), ("column", "mdt")):
+            file_name = os.path.join(self.temp_path, "data." + reader_type)
+            writer = writers.get_writer(writer_type)(file_name)
+            writer.writeln(header)
+            for line in lines:
+                writer.writeln(line if writer.typed else [str(value) for value in line])
+            writer.save()
+            sizes[reader_type] = os.path.getsize(file_name)
+
+            data = list(readers.get_reader(reader_type)(file_name))
+            self.assertEqual(len(data), len(lines) + 1)
+
+        self.assertEqual(list(data[1]), lines[0])
+        self.assertLess(sizes["mdt"], sizes["csv"])
@@ -2,8 +2,15 @@
 This module parse data files to lines.
 """
 
+import sys
 import csv
+import itertools
+import json
+import zlib
+import pickle
 import codecs
+import struct
+from array import array
 
 try:
     import xlrd
@@ -17,6 +24,9 @@ class DataReader(object):
     """
     types = None
 
+    # Read values in their own types instead of strings.
+    typed = False
+
     def __init__(self, filename = None):
         """
         Args:
@@ -144,7 +154,117 @@ class XLSReader(DataReader):
         return self.sheet.row_values(pos)
 
 
-all_readers = [CSVReader, XLSReader]
+class ColumnReader(DataReader):
+    """
+    Columnar data file's reader. Values are read in their own types.
+    """
+    types = ("mdt",)
+    typed = True
+
+    def __init__(self, filename=None):
+        """
+        Args:
+            filename: (String) data file's name.
+
+        Returns:
+            None
+        """
+        super(ColumnReader, self).__init__(filename)
+
+        self.lines = None
+        if filename:
+            header, columns = read_columns(filename)
+            self.lines = iter([header])
+            if columns:
+                self.lines = itertools.chain(self.lines, zip(*columns))
+
+    def __iter__(self):
+        return self.lines or iter(())
+
+    def readln(self):
+        """
+        Read data line.
+
+        Returns:
+            list: data line
+        """
+        if not self.lines:
+            raise StopIteration
+
+        # Read line.
+        return next(self.lines)
+
+
+COLUMN_FILE_MAGIC = b"MDT\x01"
+
+
+def read_columns(filename):
+    """
+    Read a columnar data file.
+
+    Args:
+        filename: (String) data file's name.
+
+    Returns:
+        (tuple) column names, a list of column values. Use zip(*columns) to
+        get records, they can be loaded to WorldData as a table's snapshot.
+    """
+    with open(filename, "rb") as fp:
+        if fp.read(len(COLUMN_FILE_MAGIC)) != COLUMN_FILE_MAGIC:
+            raise ValueError("%s is not a column data file." % filename)
+        data = memoryview(zlib.decompress(fp.read()))
+
+    header_size = struct.unpack_from("<I", data)[0]
+    pos = 4
+    header = json.loads(bytes(data[pos:pos + header_size]).decode("utf-8"))
+    pos += header_size
+
+    rows = header["rows"]
+    columns = []
+    for column_type, has_null in zip(header["types"], header["nulls"]):
+        nulls = None
+        if has_null:
+            nulls = data[pos:pos + rows]
+            pos += rows
+
+        if column_type == "bool":
+            values = [bool(value) for value in data[pos:pos + rows]]
+            pos += rows
+        elif column_type == "int":
+            values = unpack_array("q", data[pos:pos + rows * 8])
+            pos += rows * 8
+        elif column_type == "float":
+            values = unpack_array("d", data[pos:pos + rows * 8])
+            pos += rows * 8
+        else:
+            ends = list(itertools.accumulate(unpack_array("I", data[pos:pos + rows * 4])))
+            pos += rows * 4
+            text_size = struct.unpack_from("<Q", data, pos)[0]
+            pos += 8
+            text = str(data[pos:pos + text_size], "utf-8")
+            pos += text_size
+            values = [text[start:end] for start, end in zip([0] + ends, ends)]
+
+        if nulls:
+            values = [None if null else value for value, null in zip(values, nulls)]
+
+        columns.append(values)
+
+    return header["columns"], columns
+
+
+def unpack_array(typecode, data):
+    """
+    Read an array from little endian bytes.
+    """
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tolist()
+
+
+all_readers = [CSVReader, XLSReader, ColumnReader]
 def get_readers():
     """
     Get all available writers.
@@ -167,3 +287,70 @@ def get_reader(reader_type):
         reader
     """
     return reader_dict.get(reader_type, None)
+
+
+def read_lines(filename, reader_type):
+    """
+    Read all lines of a data file. It does not use the db, so it can run
+    in worker processes.
+
+    Args:
+        filename: (String) data file's name.
+        reader_type: (String) reader's type.
+
+    Returns:
+        list: data lines
+    """
+    reader_class = get_reader(reader_type)
+    if not reader_class:
+        return None
+
+    return list(reader_class(filename))
+
+
+def save_lines_file(filename, reader_type, lines_file):
+    """
+    Parse a data file and save its lines to a temporary lines file. Lines can
+    be loaded one by one with load_lines_file(). It does not use the db, so it
+    can run in worker processes.
+
+    Args:
+        filename: (String) data file's name.
+        reader_type: (String) reader's type.
+        lines_file: (String) the lines file's name.
+
+    Returns:
+        number: number of lines
+    """
+    reader_class = get_reader(reader_type)
+    if not reader_class:
+        raise ValueError("Unknown file type %s." % reader_type)
+
+    count = 0
+    with open(lines_file, "wb") as fp:
+        pickler = pickle.Pickler(fp, pickle.HIGHEST_PROTOCOL)
+        for line in reader_class(filename):
+            pickler.dump(list(line))
+            pickler.clear_memo()
+            count += 1
+
+    return count
+
+
+def load_lines_file(lines_file):
+    """
+    Load lines from a lines file saved by save_lines_file().
+
+    Args:
+        lines_file: (String) the lines file's name.
+
+    Returns:
+        iterator: data lines
+    """
+    with open(lines_file, "rb") as fp:
+        unpickler = pickle.Unpickler(fp)
+        while True:
+            try:
+                yield unpickler.load()
+            except EOFError:
+                return
@@ -65,3 +65,18 @@ def file_response(file_obj, filename):
     response['Content-Disposition'] = 'attachment;filename="%s"' % filename
     return response
 
+
+
+@cross_domain
+def stream_response(stream, filename):
+    """
+    Respond a file which is generated while sending.
+
+    Args:
+        stream: (iterator) an iterator of the file's data.
+        filename: (string) filename.
+    """
+    response = StreamingHttpResponse(stream)
+    response['Content-Type'] = 'application/octet-stream'
+    response['Content-Disposition'] = 'attachment;filename="%s"' % filename
+    return response
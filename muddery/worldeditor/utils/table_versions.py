@@ -0,0 +1,46 @@
+"""
+Version numbers of world data tables. A table's version changes when the
+world editor changes its data, so data cached from the table can be checked.
+"""
+
+import itertools
+
+
+class TableVersions(object):
+    """
+    Keep version numbers of tables.
+    """
+    def __init__(self):
+        # Versions are unique over all tables, so a table's version never
+        # goes back to an old value.
+        self.counter = itertools.count(1)
+        self.base_version = 0
+        self.versions = {}
+
+    def get(self, table_name):
+        """
+        Get a table's current version.
+
+        Args:
+            table_name: (string) table's name.
+        """
+        return self.versions.get(table_name, self.base_version)
+
+    def update(self, table_name):
+        """
+        Change a table's version after its data changed.
+
+        Args:
+            table_name: (string) table's name.
+        """
+        self.versions[table_name] = next(self.counter)
+
+    def update_all(self):
+        """
+        Change all tables' versions.
+        """
+        self.base_version = next(self.counter)
+        self.versions = {}
+
+
+TABLE_VERSIONS = TableVersions()
@@ -2,8 +2,15 @@
 This module parse data files to lines.
 """
 
+import io
 import csv
+import sys
+import json
+import zlib
 import codecs
+import struct
+from array import array
+from muddery.worldeditor.utils.readers import COLUMN_FILE_MAGIC
 
 try:
     import xlwt
@@ -16,6 +23,63 @@ except ImportError:
     xlsxwriter = None
 
 
+def is_stream(filename):
+    """
+    Check if the file name is a writable stream.
+    """
+    return hasattr(filename, "write")
+
+
+def open_text_file(filename, mode='w'):
+    """
+    Open a text file to write, or wrap a binary stream as a text file.
+    """
+    if is_stream(filename):
+        return io.TextIOWrapper(filename, encoding="utf-8", newline='')
+    else:
+        return open(filename, mode, encoding="utf-8", newline='')
+
+
+def close_text_file(data_file, filename):
+    """
+    Close a text file opened by open_text_file. Streams are only flushed and
+    kept open.
+    """
+    if is_stream(filename):
+        data_file.flush()
+        data_file.detach()
+    else:
+        data_file.close()
+
+
+class StreamBuffer(io.RawIOBase):
+    """
+    A writable stream which keeps written data until it is taken out, so
+    files can be sent while they are being written.
+    """
+    def __init__(self):
+        super(StreamBuffer, self).__init__()
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self):
+        """
+        Take out all data written since the last call.
+
+        Returns:
+            bytes: written data.
+        """
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
 class DataWriter(object):
     """
     Game data file writer.
@@ -24,10 +88,13 @@ class DataWriter(object):
     name = None
     file_ext = None
 
+    # Write values in their own types instead of strings.
+    typed = False
+
     def __init__(self, filename = None):
         """
         Args:
-            filename: (String) data file's name.
+            filename: (String or file object) data file's name, or a writable binary stream.
 
         Returns:
             None
@@ -68,7 +135,7 @@ class CSVWriter(DataWriter):
     def __init__(self, filename=None):
         """
         Args:
-            filename: (String) data file's name.
+            filename: (String or file object) data file's name, or a writable binary stream.
 
         Returns:
             None
@@ -78,7 +145,7 @@ class CSVWriter(DataWriter):
         self.data_file = None
         self.writer = None
         if filename:
-            self.data_file = open(filename, 'w', encoding="utf-8", newline='')
+            self.data_file = open_text_file(filename)
             self.writer = csv.writer(self.data_file, dialect='excel')
 
     def writeln(self, line):
@@ -108,7 +175,7 @@ class CSVWriter(DataWriter):
         if not self.data_file:
             return
 
-        self.data_file.close()
+        close_text_file(self.data_file, self.filename)
 
 
 class CSVWindowsWriter(DataWriter):
@@ -122,7 +189,7 @@ class CSVWindowsWriter(DataWriter):
     def __init__(self, filename=None):
         """
         Args:
-            filename: (String) data file's name.
+            filename: (String or file object) data file's name, or a writable binary stream.
 
         Returns:
             None
@@ -133,9 +200,12 @@ class CSVWindowsWriter(DataWriter):
         self.writer = None
         if filename:
             # Add BOM.
-            with open(filename, 'wb') as fp:
-                fp.write(codecs.BOM_UTF8)
-            self.data_file = open(filename, 'a', encoding="utf-8", newline='')
+            if is_stream(filename):
+                filename.write(codecs.BOM_UTF8)
+            else:
+                with open(filename, 'wb') as fp:
+                    fp.write(codecs.BOM_UTF8)
+            self.data_file = open_text_file(filename, 'a')
             self.writer = csv.writer(self.data_file, dialect='excel')
 
     def writeln(self, line):
@@ -165,7 +235,7 @@ class CSVWindowsWriter(DataWriter):
         if not self.data_file:
             return
 
-        self.data_file.close()
+        close_text_file(self.data_file, self.filename)
 
 
 class XLSWriter(DataWriter):
@@ -181,7 +251,7 @@ class XLSWriter(DataWriter):
     def __init__(self, filename=None):
         """
         Args:
-            filename: (String) data file's name.
+            filename: (String or file object) data file's name, or a writable binary stream.
 
         Returns:
             None
@@ -249,7 +319,7 @@ class XLSXWriter(DataWriter):
     def __init__(self, filename=None):
         """
         Args:
-            filename: (String) data file's name.
+            filename: (String or file object) data file's name, or a writable binary stream.
 
         Returns:
             None
@@ -304,7 +374,142 @@ class XLSXWriter(DataWriter):
         self.book.close()
 
 
-all_writers = [CSVWindowsWriter, CSVWriter, XLSWriter]
+class ColumnWriter(DataWriter):
+    """
+    Columnar data file's writer. Values are stored in their own types by
+    columns and compressed. The file is:
+
+        magic, header's length, header (json), columns
+
+    The header contains column names, column types and the number of rows.
+    A column has a null mask if it has empty values, then its values:
+    int64/float64/bool arrays, or string lengths (in characters) followed by
+    utf-8 data.
+    """
+    type = "column"
+    name = "column (binary)"
+    file_ext = "mdt"
+    typed = True
+
+    def __init__(self, filename=None):
+        """
+        Args:
+            filename: (String or file object) data file's name, or a writable binary stream.
+
+        Returns:
+            None
+        """
+        super(ColumnWriter, self).__init__(filename)
+
+        self.header = None
+        self.columns = None
+
+    def writeln(self, line):
+        """
+        Write data line. The first line is the header.
+
+        Args:
+            line: (List) Line data.
+
+        Returns:
+            boolean: Write success.
+        """
+        if not self.filename:
+            return False
+
+        if self.header is None:
+            self.header = [str(name) for name in line]
+            self.columns = [[] for name in self.header]
+        else:
+            for column, value in zip(self.columns, line):
+                column.append(value)
+
+        return True
+
+    def save(self):
+        """
+        Save the file
+
+        Returns:
+            None
+        """
+        if not self.filename or self.header is None:
+            return
+
+        column_types = []
+        column_nulls = []
+        blocks = []
+        for values in self.columns:
+            column_type, has_null, data = pack_column(values)
+            column_types.append(column_type)
+            column_nulls.append(has_null)
+            if has_null:
+                blocks.append(bytes(value is None for value in values))
+            blocks.append(data)
+
+        header = json.dumps({
+            "columns": self.header,
+            "types": column_types,
+            "nulls": column_nulls,
+            "rows": len(self.columns[0]) if self.columns else 0,
+        }).encode("utf-8")
+
+        if is_stream(self.filename):
+            data_file = self.filename
+        else:
+            data_file = open(self.filename, "wb")
+
+        try:
+            data_file.write(COLUMN_FILE_MAGIC)
+            compressor = zlib.compressobj()
+            data_file.write(compressor.compress(struct.pack("<I", len(header))))
+            data_file.write(compressor.compress(header))
+            for block in blocks:
+                data_file.write(compressor.compress(block))
+            data_file.write(compressor.flush())
+        finally:
+            if data_file is not self.filename:
+                data_file.close()
+
+
+
+def pack_column(values):
+    """
+    Pack a column's values to bytes. Columns of mixed types are stored as
+    strings.
+
+    Args:
+        values: (list) column's values.
+
+    Returns:
+        (tuple) column type, has empty values, packed data
+    """
+    value_types = set(type(value) for value in values if value is not None)
+    has_null = any(value is None for value in values)
+
+    if value_types == {bool}:
+        return "bool", has_null, bytes(bool(value) for value in values)
+    elif value_types == {int}:
+        return "int", has_null, to_little_endian(array("q", (value or 0 for value in values)))
+    elif value_types == {float} or value_types == {int, float}:
+        return "float", has_null, to_little_endian(array("d", (value or 0.0 for value in values)))
+
+    strings = ["" if value is None else str(value) for value in values]
+    text = "".join(strings).encode("utf-8")
+    sizes = to_little_endian(array("I", (len(value) for value in strings)))
+    return "str", has_null, sizes + struct.pack("<Q", len(text)) + text
+
+
+def to_little_endian(data):
+    """
+    Get an array's bytes in little endian.
+    """
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+all_writers = [CSVWindowsWriter, CSVWriter, XLSWriter, ColumnWriter]
 def get_writers():
     """
     Get all available writers.
@@ -327,3 +532,4 @@ def get_writer(writer_type):
         writer
     """
     return writer_dict.get(writer_type, None)
+
@@ -189,6 +189,9 @@ CommonEditor.prototype.createFieldController = function(field, readonly) {
     else if (type == "Select") {
         controller = field_creator.createSelect(name, label, value, help_text, field.choices, readonly);
     }
+    else if (type == "Autocomplete") {
+        controller = field_creator.createAutocomplete(name, label, value, help_text, field.provider, readonly);
+    }
 
     // Add controller name.
     controller.addClass("field-controller");
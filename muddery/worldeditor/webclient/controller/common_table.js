@@ -20,6 +20,7 @@ prototype = function(base, el) {
 CommonTable = function() {
     this.field_length = 20;
     this.fields = [];
+    this.sort_name = "id";
 }
 
 CommonTable.prototype.init = function() {
@@ -30,7 +31,13 @@ CommonTable.prototype.init = function() {
 
     this.bindEvents();
 
-    service.queryTable(this.table_name, this.queryTableSuccess, this.queryTableFailed);
+    // Query fields only, records are queried page by page.
+    this.queryPageData({limit: 0}, this.queryFieldsSuccess, this.queryTableFailed);
+}
+
+// Query a page of records.
+CommonTable.prototype.queryPageData = function(page, callback_success, callback_failed) {
+    service.queryTablePage(this.table_name, page, callback_success, callback_failed);
 }
 
 CommonTable.prototype.bindEvents = function() {
@@ -63,7 +70,7 @@ CommonTable.prototype.onDelete = function(e) {
 }
 
 CommonTable.prototype.refresh = function() {
-    service.queryTable(this.table_name, this.refreshTableSuccess);
+    $("#data-table").bootstrapTable("refresh");
 }
 
 CommonTable.prototype.queryTableSuccess = function(data) {
@@ -87,6 +94,51 @@ CommonTable.prototype.queryTableSuccess = function(data) {
     window.parent.controller.setFrameSize();
 }
 
+// Create a table whose records are queried page by page from the server.
+CommonTable.prototype.queryFieldsSuccess = function(data) {
+    controller.fields = data.fields;
+
+    $("#data-table").bootstrapTable({
+        cache: false,
+        striped: true,
+        pagination: true,
+        pageList: [20, 50, 100],
+        pageSize: 20,
+        sidePagination: "server",
+        ajax: controller.queryPage,
+        search: true,
+        columns: controller.parseFields(data.fields),
+        sortName: controller.sort_name,
+        sortOrder: "asc",
+        clickToSelect: true,
+        singleSelect: true,
+    });
+
+    window.parent.controller.setFrameSize();
+}
+
+// Query records of the table's current page, called by the table.
+CommonTable.prototype.queryPage = function(params) {
+    var page = {
+        offset: params.data.offset,
+        limit: params.data.limit,
+        search: params.data.search,
+        sort: params.data.sort,
+        order: params.data.order,
+    };
+
+    controller.queryPageData(page, function(data) {
+        params.success({
+            total: data.total,
+            rows: utils.parseRows(data.fields, data.records),
+        });
+        window.parent.controller.setFrameSize();
+    }, function(code, message) {
+        params.error();
+        controller.queryTableFailed(code, message);
+    });
+}
+
 // Parse fields data to table headers.
 CommonTable.prototype.parseFields = function(fields) {
     var cols = [{
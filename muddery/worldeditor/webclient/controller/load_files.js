@@ -1,5 +1,8 @@
 
 controller = {
+    // Interval of querying the import job's progress in milliseconds.
+    query_job_interval: 1000,
+
     init: function() {
         this.bindEvents();
 
@@ -38,14 +41,18 @@ controller = {
         }
 
         if (group.attr("id") == "upload-zip") {
-            service.uploadDataZip(file_obj, controller.uploadSuccess, controller.uploadFailed);
+            service.uploadFileChunks(file_obj, function(upload_id) {
+                service.importUpload(upload_id, "zip", "", controller.importJobSuccess, controller.uploadFailed);
+            }, controller.uploadFailed);
         }
         else if (group.attr("id") == "upload-resource") {
             service.uploadResourceZip(file_obj, controller.uploadSuccess, controller.uploadFailed);
         }
         else if (group.attr("id") == "upload-file") {
             var table_name = group.find(".table-select").val();
-            service.uploadSingleData(file_obj, table_name, controller.uploadSuccess, controller.uploadFailed);
+            service.uploadFileChunks(file_obj, function(upload_id) {
+                service.importUpload(upload_id, "table", table_name, controller.importJobSuccess, controller.uploadFailed);
+            }, controller.uploadFailed);
         }
 
         window.parent.controller.showWaiting("", "Uploading...");
@@ -73,6 +80,37 @@ controller = {
         window.parent.controller.notify("", "Upload success.");
     },
 
+    /*
+     * Query the import job's progress until it stops.
+     */
+    importJobSuccess: function(data) {
+        if (data.status == "waiting" || data.status == "running") {
+            if (data.table) {
+                window.parent.controller.updateWaiting("Importing " + data.table + " (" + data.lines + ")...");
+            }
+
+            setTimeout(function() {
+                service.queryImportJob(data.job, controller.importJobSuccess, controller.uploadFailed);
+            }, controller.query_job_interval);
+            return;
+        }
+
+        window.parent.controller.hideWaiting();
+        if (data.status == "finished") {
+            var message = "Upload success.";
+            for (var i = 0; i < data.errors.length; i++) {
+                message += " " + data.errors[i].table + ": " + data.errors[i].error;
+            }
+            window.parent.controller.notify("", message);
+        }
+        else if (data.status == "cancelled") {
+            window.parent.controller.notify("", "Import cancelled.");
+        }
+        else {
+            window.parent.controller.notify("ERROR", data.error);
+        }
+    },
+
     uploadFailed: function(code, message, data) {
         window.parent.controller.hideWaiting();
         window.parent.controller.notify("ERROR", code + ": " + message);
@@ -405,6 +405,10 @@ controller = {
             .modal();
     },
 
+    updateWaiting: function(content) {
+        $("#confirm-content").text(content);
+    },
+
     hideWaiting: function() {
         $("#confirm-dialog").modal("hide");
     },
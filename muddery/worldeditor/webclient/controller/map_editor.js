@@ -311,10 +311,20 @@ MapEditor.prototype.onGridSizeUnselect = function(event) {
  * Create a new room.
  */
 MapEditor.prototype.createRoom = function(info, x, y) {
+    // The position saved in the db.
+    var saved_x = null;
+    var saved_y = null;
+    if (info.position && info.position.length > 1) {
+        saved_x = info.position[0];
+        saved_y = info.position[1];
+    }
+
     this.rooms[info.key] = {
         info: info,
         x: x,
         y: y,
+        saved_x: saved_x,
+        saved_y: saved_y,
         paths: {}
     }
 
@@ -1762,16 +1772,33 @@ MapEditor.prototype.saveMapPositions = function(successCallback, context) {
         height: this.area_height
     }
 
+    // Only save moved rooms.
     var rooms = [];
     for (var key in controller.rooms) {
         var room_info = controller.rooms[key];
-        rooms.push({
-            key: key,
-            position: [room_info.x, room_info.y]
-        });
+        if (room_info.x != room_info.saved_x || room_info.y != room_info.saved_y) {
+            rooms.push({
+                key: key,
+                position: [room_info.x, room_info.y]
+            });
+        }
+    }
+
+    var callback = function(data, context) {
+        for (var i = 0; i < rooms.length; i++) {
+            var room_info = controller.rooms[rooms[i].key];
+            if (room_info) {
+                room_info.saved_x = rooms[i].position[0];
+                room_info.saved_y = rooms[i].position[1];
+            }
+        }
+
+        if (successCallback) {
+            successCallback.call(this, data, context);
+        }
     }
 
-    service.saveMapPositions(area, rooms, successCallback, this.failedCallback, context);
+    service.saveMapPositions(area, rooms, callback, this.failedCallback, context);
 }
 
 
@@ -4,6 +4,7 @@
  */
 MapTable = function() {
 	CommonTable.call(this);
+	this.sort_name = "key";
 }
 
 MapTable.prototype = prototype(CommonTable.prototype);
@@ -14,11 +15,12 @@ MapTable.prototype.init = function() {
 
     this.bindEvents();
 
-    service.queryTypeclassTable(this.typeclass, this.queryTableSuccess, this.queryTableFailed);
+    // Query fields only, records are queried page by page.
+    this.queryPageData({limit: 0}, this.queryFieldsSuccess, this.queryTableFailed);
 }
 
-MapTable.prototype.refresh = function() {
-    service.queryTypeclassTable(this.typeclass, this.refreshTableSuccess);
+MapTable.prototype.queryPageData = function(page, callback_success, callback_failed) {
+    service.queryTypeclassTablePage(this.typeclass, page, callback_success, callback_failed);
 }
 
 MapTable.prototype.onAdd = function(e) {
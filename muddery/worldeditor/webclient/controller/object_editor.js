@@ -271,27 +271,41 @@ ObjectEditor.prototype.queryFormSuccess = function(data) {
         }
     }
 
+    // Query areas, events and custom properties in one batch.
+    var calls = [];
     if (query_areas) {
-        service.queryAreas(controller.queryAreasSuccess, controller.queryAreasFailed);
+        calls.push({
+            path: "query_areas",
+            success: controller.queryAreasSuccess,
+            failed: controller.queryAreasFailed
+        });
     }
     else {
         controller.queryAreasSuccess({});
     }
 
-    // Query events.
-    service.queryEventTriggers(controller.obj_typeclass,
-                               controller.queryEventTriggersSuccess,
-                               controller.failedCallback);
+    calls.push({
+        path: "query_event_triggers",
+        args: {typeclass: controller.obj_typeclass},
+        success: controller.queryEventTriggersSuccess,
+        failed: controller.failedCallback
+    });
 
-    service.queryObjectEvents(controller.obj_key,
-                              controller.queryEventTableSuccess,
-                              controller.failedCallback);
+    calls.push({
+        path: "query_object_events",
+        args: {object: controller.obj_key},
+        success: controller.queryEventTableSuccess,
+        failed: controller.failedCallback
+    });
+
+    calls.push({
+        path: "query_object_properties",
+        args: {typeclass: controller.obj_typeclass, obj_key: controller.obj_key},
+        success: controller.queryObjectPropertiesSuccess,
+        failed: controller.failedCallback
+    });
 
-    // Query custom properties.
-    service.queryObjectProperties(controller.obj_typeclass,
-                                  controller.obj_key,
-                                  controller.queryObjectPropertiesSuccess,
-                                  controller.failedCallback);
+    service.sendBatch(calls, controller.failedCallback);
 }
 
 ObjectEditor.prototype.queryEventTriggersSuccess = function(data) {
@@ -4,6 +4,7 @@
  */
 ObjectTable = function() {
 	CommonTable.call(this);
+	this.sort_name = "key";
 }
 
 ObjectTable.prototype = prototype(CommonTable.prototype);
@@ -15,11 +16,12 @@ ObjectTable.prototype.init = function() {
     $("#table-name").text(this.typeclass);
     this.bindEvents();
 
-    service.queryTypeclassTable(this.typeclass, this.queryTableSuccess, this.queryTableFailed);
+    // Query fields only, records are queried page by page.
+    this.queryPageData({limit: 0}, this.queryFieldsSuccess, this.queryTableFailed);
 }
 
-ObjectTable.prototype.refresh = function() {
-    service.queryTypeclassTable(this.typeclass, this.refreshTableSuccess);
+ObjectTable.prototype.queryPageData = function(page, callback_success, callback_failed) {
+    service.queryTypeclassTablePage(this.typeclass, page, callback_success, callback_failed);
 }
 
 ObjectTable.prototype.onAdd = function(e) {
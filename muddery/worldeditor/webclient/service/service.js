@@ -65,6 +65,31 @@ service = {
 	    });
     },
 
+    /*  Send several requests at once, they are processed in one transaction.
+     *  Args:
+     *      calls: (list) requests, [{path, func, args, success, failed, context}].
+     *      callback_failed: called if the whole batch fails.
+     */
+    sendBatch: function(calls, callback_failed, context) {
+        var requests = [];
+        for (var i = 0; i < calls.length; i++) {
+            requests.push({
+                path: calls[i].path,
+                func: calls[i].func || "",
+                args: calls[i].args || {}
+            });
+        }
+
+        var callback_success = function(results) {
+            for (var i = 0; i < calls.length && i < results.length; i++) {
+                var call = calls[i];
+                service.onSuccess(call.success, call.failed).call(call.context, results[i]);
+            }
+        }
+
+        this.sendRequest("batch", "", {calls: requests}, callback_success, callback_failed, context);
+    },
+
     sendFile: function(path, func_no, file_obj, args, callback_success, callback_failed, context) {
 	    var url = CONFIG.api_url + path;
 
@@ -134,6 +159,14 @@ service = {
         this.sendRequest("query_table", "", args, callback_success, callback_failed, context);
     },
 
+    queryTablePage: function(table_name, page, callback_success, callback_failed, context) {
+        var args = {
+            table: table_name,
+            page: page
+        };
+        this.sendRequest("query_table", "", args, callback_success, callback_failed, context);
+    },
+
     queryRecord: function(table_name, record_id, callback_success, callback_failed, context) {
         var args = {
             table: table_name,
@@ -149,6 +182,14 @@ service = {
         this.sendRequest("query_typeclass_table", "", args, callback_success, callback_failed, context);
     },
 
+    queryTypeclassTablePage: function(typeclass, page, callback_success, callback_failed, context) {
+        var args = {
+            typeclass: typeclass,
+            page: page
+        };
+        this.sendRequest("query_typeclass_table", "", args, callback_success, callback_failed, context);
+    },
+
     queryForm: function(table_name, record_id, callback_success, callback_failed, context) {
         var args = {
             table: table_name,
@@ -173,6 +214,19 @@ service = {
         this.sendRequest("query_object_form", "", args, callback_success, callback_failed, context);
     },
 
+    /*  Query choices of a field by text.
+     *  Args:
+     *      provider: (string) choice provider's name.
+     *      text: (string) text to search.
+     */
+    queryChoices: function(provider, text, callback_success, callback_failed, context) {
+        var args = {
+            provider: provider,
+            text: text
+        };
+        this.sendRequest("query_choices", "", args, callback_success, callback_failed, context);
+    },
+
     queryAreas: function(callback_success, callback_failed, context) {
         this.sendRequest("query_areas", "", {}, callback_success, callback_failed, context);
     },
@@ -356,6 +410,97 @@ service = {
         this.sendFile("upload_single_data", "", file_obj, args, callback_success, callback_failed, context);
     },
 
+    beginUpload: function(name, size, checksum, callback_success, callback_failed, context) {
+        var args = {
+            name: name,
+            size: size,
+            checksum: checksum
+        };
+        this.sendRequest("begin_upload", "", args, callback_success, callback_failed, context);
+    },
+
+    uploadChunk: function(upload_id, offset, chunk, checksum, callback_success, callback_failed, context) {
+        var args = {
+            upload: upload_id,
+            offset: offset,
+            checksum: checksum
+        };
+        this.sendFile("upload_chunk", "", new Blob([chunk]), args, callback_success, callback_failed, context);
+    },
+
+    /*  Upload a file in chunks. If the file has been partly uploaded, the
+     *  upload resumes from the received size.
+     *  Args:
+     *      callback_success: function(upload_id, context)
+     */
+    uploadFileChunks: function(file_obj, callback_success, callback_failed, context) {
+        var read_size = 1024 * 1024;
+        var checksum = 0;
+
+        var sendChunks = function(data) {
+            var upload_id = data.upload;
+            var chunk_size = data.chunk_size;
+
+            var sendChunk = function(offset) {
+                if (offset >= file_obj.size) {
+                    callback_success.call(context, upload_id, context);
+                    return;
+                }
+
+                utils.readFileSlice(file_obj, offset, offset + chunk_size, function(chunk) {
+                    service.uploadChunk(upload_id, offset, chunk, utils.crc32(chunk), function(data) {
+                        sendChunk(data.received);
+                    }, callback_failed, context);
+                });
+            }
+
+            sendChunk(data.received);
+        }
+
+        // Calculate the file's checksum before uploading.
+        var readChecksum = function(offset) {
+            if (offset >= file_obj.size) {
+                service.beginUpload(file_obj.name, file_obj.size, checksum, sendChunks, callback_failed, context);
+                return;
+            }
+
+            utils.readFileSlice(file_obj, offset, offset + read_size, function(data) {
+                checksum = utils.crc32(data, checksum);
+                readChecksum(offset + data.length);
+            });
+        }
+
+        readChecksum(0);
+    },
+
+    /*  Import an uploaded file in the background.
+     *  Args:
+     *      kind: (string) "zip": a zip package of data, "table": a table's data file.
+     *      table_name: (string) the table of the data file.
+     */
+    importUpload: function(upload_id, kind, table_name, callback_success, callback_failed, context) {
+        var args = {
+            upload: upload_id,
+            kind: kind,
+            table: table_name
+        };
+        this.sendRequest("import_upload", "", args, callback_success, callback_failed, context);
+    },
+
+    queryImportJob: function(job_id, callback_success, callback_failed, context) {
+        var args = {
+            job: job_id
+        };
+        this.sendRequest("query_import_job", "", args, callback_success, callback_failed, context);
+    },
+
+    cancelImportJob: function(job_id, callback_success, callback_failed, context) {
+        var args = {
+            job: job_id
+        };
+        this.sendRequest("cancel_import_job", "", args, callback_success, callback_failed, context);
+    },
+
     uploadImage: function(file_obj, field_name, file_type, callback_success, callback_failed, context) {
         var args = {
             field: field_name,
@@ -111,6 +111,42 @@ field_creator = {
         return this.createControlGroup(name, controller, label, help_text);
     },
 
+    createAutocomplete: function(name, label, value, help_text, provider, readonly) {
+        var list_id = "choices-" + name;
+        var controller = $("<div>");
+
+        var input = $("<input>")
+            .addClass("form-control editor-control text-input-control")
+            .attr("type", "text")
+            .attr("list", list_id)
+            .val(value)
+            .appendTo(controller);
+
+        var datalist = $("<datalist>")
+            .attr("id", list_id)
+            .appendTo(controller);
+
+        if (readonly) {
+            input.attr("readonly", "readonly");
+        }
+        else {
+            input.on("input", function(e) {
+                var text = $(this).val();
+                service.queryChoices(provider, text, function(data) {
+                    datalist.children().remove();
+                    for (var i = 0; i < data.length; i++) {
+                        $("<option>")
+                            .attr("value", data[i][0])
+                            .text(data[i][1])
+                            .appendTo(datalist);
+                    }
+                });
+            });
+        }
+
+        return this.createControlGroup(name, controller, label, help_text);
+    },
+
     createCheckBox: function(name, label, value, help_text, check, readonly) {
         var group = $("<div>")
             .addClass("control-group")
@@ -26,5 +26,37 @@ utils = {
             rows.push(row);
         }
         return rows;
+    },
+
+    // CRC32 lookup table.
+    crc32_table: null,
+
+    // Calculate the CRC32 checksum of a Uint8Array, continue from the given crc.
+    crc32: function(data, crc) {
+        if (!this.crc32_table) {
+            this.crc32_table = [];
+            for (var n = 0; n < 256; n++) {
+                var c = n;
+                for (var k = 0; k < 8; k++) {
+                    c = (c & 1) ? (0xEDB88320 ^ (c >>> 1)) : (c >>> 1);
+                }
+                this.crc32_table.push(c >>> 0);
+            }
+        }
+
+        crc = (crc || 0) ^ 0xFFFFFFFF;
+        for (var i = 0; i < data.length; i++) {
+            crc = this.crc32_table[(crc ^ data[i]) & 0xFF] ^ (crc >>> 8);
+        }
+        return (crc ^ 0xFFFFFFFF) >>> 0;
+    },
+
+    // Read a part of a file as a Uint8Array.
+    readFileSlice: function(file_obj, begin, end, callback) {
+        var reader = new FileReader();
+        reader.onload = function(e) {
+            callback(new Uint8Array(e.target.result));
+        }
+        reader.readAsArrayBuffer(file_obj.slice(begin, end));
     }
 }